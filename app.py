@@ -1,14 +1,61 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g, has_app_context
 import pymysql
+from pymysql.constants import SERVER_STATUS
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+import base64
 import hashlib
+import io
+import json
+import mimetypes
 import secrets
 import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+import click
+import atexit
+import heapq
+import queue
+import re
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from functools import wraps
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup, escape
+from werkzeug.security import safe_join
+
+try:
+    import numpy as np
+except ImportError:  # herd analytics endpoints report 503 without it
+    np = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # uploads are stored as-is and pages serve the originals
+    Image = None
+
+try:
+    import brotli
+except ImportError:  # optional (pip install Brotli); responses are gzip-compressed only
+    brotli = None
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-production-secret-key-change-this')
 
+# Template compilation settings
+TEMPLATE_CONFIG = {
+    'bytecode_cache': os.environ.get('JINJA_BYTECODE_CACHE', '1') == '1',  # Share compiled templates across processes
+    'bytecode_cache_dir': os.environ.get('JINJA_BYTECODE_CACHE_DIR') or None,  # Default: a per-user directory in /tmp
+    'warmup': os.environ.get('TEMPLATE_WARMUP', '1') == '1'  # Load every template when a worker boots
+}
+
+if TEMPLATE_CONFIG['bytecode_cache']:
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CONFIG['bytecode_cache_dir'])
+
 # Database configuration
 # Auto-detect environment and use appropriate database settings
 def is_localhost():
@@ -68,7 +115,16 @@ else:
     print("Running in PRODUCTION mode")
     print("   Database: cPanel (kwetufar_farm user)")
 
-def get_db_connection():
+# Connection pool settings (per worker process)
+DB_POOL_CONFIG = {
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 8)),  # Max open connections per worker
+    'idle_timeout': int(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300)),  # Close connections idle longer than this (seconds)
+    'ping_after': int(os.environ.get('DB_POOL_PING_AFTER', 30)),  # Ping connections idle longer than this on checkout (seconds)
+    'checkout_timeout': int(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT', 30))  # Wait this long for a free connection (seconds)
+}
+
+def open_db_connection():
+    """Open a new, unpooled connection to the application database"""
     try:
         # Add timeout and connection settings to prevent lock issues
         connection_config = DB_CONFIG.copy()
@@ -85,6 +141,271 @@ def get_db_connection():
         print(f"Connection details: host={DB_CONFIG['host']}, user={DB_CONFIG['user']}, database={DB_CONFIG['database']}")
         raise e
 
+class PooledConnection:
+    """Pool checkout that behaves like a PyMySQL connection.
+
+    close() hands the underlying connection back to the pool instead of
+    closing the socket, so existing `conn.close()` calls keep working.
+    Can also be used as a context manager: `with get_db_connection() as conn:`.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise pymysql.err.InterfaceError(0, 'Connection already returned to the pool')
+        return getattr(raw, name)
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # Safety net for code paths that return early without closing
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """Bounded pool of PyMySQL connections with health checks and idle eviction"""
+
+    def __init__(self, connect, max_size, idle_timeout, ping_after, checkout_timeout):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.checkout_timeout = checkout_timeout
+        self._lock = threading.Condition(threading.RLock())
+        self._idle = []  # (connection, returned_at), most recently used last
+        self._in_use = 0
+        self.stats = {
+            'checkouts': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'connections_evicted': 0,
+            'failed_health_checks': 0,
+            'checkout_waits': 0
+        }
+
+    def _evict_idle(self, now):
+        """Close connections that have been idle longer than idle_timeout (lock held)"""
+        stale = [item for item in self._idle if now - item[1] > self.idle_timeout]
+        if stale:
+            self._idle = [item for item in self._idle if now - item[1] <= self.idle_timeout]
+            for raw, _ in stale:
+                self._close_quietly(raw)
+            self.stats['connections_evicted'] += len(stale)
+
+    def _close_quietly(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._lock:
+            self.stats['checkouts'] += 1
+            while True:
+                now = time.monotonic()
+                self._evict_idle(now)
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    raw, returned_at = None, None
+                    self._in_use += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise pymysql.err.OperationalError(
+                        2013, f'Database connection pool exhausted ({self.max_size} connections in use)')
+                self.stats['checkout_waits'] += 1
+                self._lock.wait(remaining)
+
+        # Connect and health-check outside the lock
+        try:
+            if raw is not None and time.monotonic() - returned_at > self.ping_after:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    with self._lock:
+                        self.stats['failed_health_checks'] += 1
+                    self._close_quietly(raw)
+                    raw = None
+            if raw is None:
+                raw = self._connect()
+                with self._lock:
+                    self.stats['connections_opened'] += 1
+            else:
+                with self._lock:
+                    self.stats['connections_reused'] += 1
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        reusable = raw.open
+        if reusable:
+            try:
+                # Never hand out a connection with a half-finished transaction
+                if raw.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS or not raw.get_autocommit():
+                    raw.rollback()
+                    raw.autocommit(True)
+            except Exception:
+                reusable = False
+        with self._lock:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((raw, time.monotonic()))
+                self._evict_idle(time.monotonic())
+            self._lock.notify()
+        if not reusable:
+            self._close_quietly(raw)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle)
+            })
+        return stats
+
+_db_pool = None
+_db_pool_pid = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """Return this worker's connection pool, creating it after fork if needed"""
+    global _db_pool, _db_pool_pid
+    pid = os.getpid()
+    if _db_pool is None or _db_pool_pid != pid:
+        with _db_pool_lock:
+            if _db_pool is None or _db_pool_pid != pid:
+                # Connections inherited from a parent process must not be shared
+                _db_pool = ConnectionPool(
+                    open_db_connection,
+                    max_size=DB_POOL_CONFIG['max_size'],
+                    idle_timeout=DB_POOL_CONFIG['idle_timeout'],
+                    ping_after=DB_POOL_CONFIG['ping_after'],
+                    checkout_timeout=DB_POOL_CONFIG['checkout_timeout']
+                )
+                _db_pool_pid = pid
+    return _db_pool
+
+class RequestConnection:
+    """Borrowed view of the request-scoped connection held in flask.g.
+
+    close() is a no-op (the connection is released in teardown). commit()
+    and rollback() defer to the outermost db_transaction() when one is open:
+    a helper's commit joins the caller's transaction and its rollback marks
+    the whole transaction to be rolled back when the outermost block ends,
+    so helpers can join the caller's transaction without knowing about it.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_conn'], name)
+
+    def close(self):
+        pass
+
+    def commit(self):
+        if not g.get('db_tx_depth'):
+            self._conn.commit()
+
+    def rollback(self):
+        if g.get('db_tx_depth'):
+            g.db_tx_rollback_only = True
+        else:
+            self._conn.rollback()
+    
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def get_db():
+    """Return the request-scoped connection, checking one out on first use"""
+    if 'db' not in g:
+        g.db = get_db_pool().acquire()
+        g.db_tx_depth = 0
+    return g.db
+
+@app.teardown_appcontext
+def close_db(exception):
+    """Hand the request-scoped connection back to the pool"""
+    db = g.pop('db', None)
+    if db is not None:
+        if g.pop('db_tx_depth', 0):
+            try:
+                db.rollback()
+            except Exception as e:
+                print(f"Error rolling back unfinished transaction: {e}")
+        db.close()
+
+@contextmanager
+def db_transaction():
+    """Run a block in one transaction on the request-scoped connection.
+
+    Nested blocks (and helpers calling commit() or rollback()) join the
+    outermost transaction, which commits on success and rolls back on error
+    or when anything inside asked for a rollback.
+    """
+    conn = get_db()
+    outermost = g.db_tx_depth == 0
+    if outermost:
+        conn.begin()
+        g.db_tx_rollback_only = False
+    g.db_tx_depth += 1
+    try:
+        yield RequestConnection(conn)
+        g.db_tx_depth -= 1
+        if outermost:
+            # A helper that rolled back inside the block dooms the transaction
+            if g.pop('db_tx_rollback_only', False):
+                conn.rollback()
+            else:
+                conn.commit()
+    except Exception:
+        g.db_tx_depth -= 1
+        if outermost:
+            g.pop('db_tx_rollback_only', None)
+            conn.rollback()
+        raise
+
+def get_db_connection():
+    """Get a database connection.
+
+    Inside a request (or app context) this is the shared request-scoped
+    connection, so nested helpers reuse it instead of dialing MySQL again.
+    Elsewhere (startup, CLI) a connection is checked out of the pool and
+    close() returns it.
+    """
+    if has_app_context():
+        return RequestConnection(get_db())
+    return get_db_pool().acquire()
+
 def get_db_connection_no_db():
     try:
         # Add timeout and connection settings to prevent lock issues
@@ -110,1099 +431,1656 @@ def generate_employee_code():
     """Generate a unique 6-digit employee code"""
     return str(secrets.randbelow(900000) + 100000)
 
+# Human-readable ID series: name -> (prefix, table, column). Each series has a
+# row in id_sequences holding the last number handed out.
+ID_SEQUENCES = {
+    'pig_grown_pig': ('P', 'pigs', 'tag_id'),
+    'pig_piglet': ('S', 'pigs', 'tag_id'),
+    'pig_litter': ('L', 'pigs', 'tag_id'),
+    'pig_batch': ('B', 'pigs', 'tag_id'),
+    'litter': ('L', 'litters', 'litter_id'),
+    'cow': ('C', 'cows', 'ear_tag'),
+    'cow_edit': ('EC', 'cows', 'ear_tag')
+}
+
+def format_sequence_id(name, number):
+    """Format a series number as prefix + at least 3 digits (e.g. P001, EC012)"""
+    return f"{ID_SEQUENCES[name][0]}{number:03d}"
+
+def seed_id_sequence(cursor, name):
+    """Create a series' counter row from the highest ID already in use (one scan, once)"""
+    prefix, table, column = ID_SEQUENCES[name]
+    cursor.execute(f"""
+        INSERT IGNORE INTO id_sequences (sequence_name, last_value)
+        SELECT %s, COALESCE(MAX(CAST(SUBSTRING({column}, %s) AS UNSIGNED)), 0)
+        FROM {table}
+        WHERE {column} REGEXP %s
+    """, (name, len(prefix) + 1, f'^{prefix}[0-9]+$'))
+
+def allocate_sequence_numbers(cursor, name, count=1):
+    """Reserve a block of count consecutive numbers of a series.
+    
+    LAST_INSERT_ID(expr) makes the increment and the read of the new value one
+    atomic statement per connection, so concurrent callers never share a
+    number. Inside a transaction the counter row stays locked until commit and
+    a rollback hands the block back.
+    """
+    increment_sql = """
+        UPDATE id_sequences SET last_value = LAST_INSERT_ID(last_value + %s)
+        WHERE sequence_name = %s
+    """
+    cursor.execute(increment_sql, (count, name))
+    if not cursor.rowcount:
+        seed_id_sequence(cursor, name)
+        cursor.execute(increment_sql, (count, name))
+    cursor.execute("SELECT LAST_INSERT_ID() AS last_value")
+    last_value = cursor.fetchone()['last_value']
+    return range(last_value - count + 1, last_value + 1)
+
+def allocate_ids(cursor, name, count=1):
+    """Reserve count IDs of a series in one statement and format them"""
+    return [format_sequence_id(name, number) for number in allocate_sequence_numbers(cursor, name, count)]
+
+def peek_next_id(cursor, name):
+    """Return the ID the next allocation will hand out, without reserving it (form previews)"""
+    cursor.execute("SELECT last_value FROM id_sequences WHERE sequence_name = %s", (name,))
+    row = cursor.fetchone()
+    if not row:
+        seed_id_sequence(cursor, name)
+        cursor.execute("SELECT last_value FROM id_sequences WHERE sequence_name = %s", (name,))
+        row = cursor.fetchone()
+    return format_sequence_id(name, row['last_value'] + 1)
+
+def claim_id(cursor, name, value):
+    """Move a series past an ID that was entered by hand or taken from a preview"""
+    prefix = ID_SEQUENCES[name][0]
+    number = value[len(prefix):] if value and value.startswith(prefix) else ''
+    if not number.isdigit():
+        return
+    peek_next_id(cursor, name)  # make sure the counter row exists
+    cursor.execute("""
+        UPDATE id_sequences SET last_value = GREATEST(last_value, %s)
+        WHERE sequence_name = %s
+    """, (int(number), name))
+
+def resolve_submitted_id(cursor, name, submitted, previewed=None):
+    """Return the ID to store for a form field prefilled by a preview route.
+    
+    A blank field or an untouched preview is allocated here, inside the
+    caller's insert transaction, so two clerks holding the same preview never
+    get the same ID. Only an ID typed in by hand is kept (and claimed).
+    """
+    if not submitted or submitted == previewed:
+        return allocate_ids(cursor, name)[0]
+    claim_id(cursor, name, submitted)
+    return submitted
+
 def generate_pig_tag_id(pig_type):
-    """Generate a unique tag ID for pigs based on type"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get the prefix based on pig type
-        prefix_map = {
-            'grown_pig': 'P',
-            'piglet': 'S', 
-            'litter': 'L',
-            'batch': 'B'
-        }
-        prefix = prefix_map.get(pig_type, 'P')
-        
-        # Get the next available number for this type
-        cursor.execute("""
-            SELECT MAX(CAST(SUBSTRING(tag_id, 2) AS UNSIGNED)) as max_num 
-            FROM pigs 
-            WHERE tag_id LIKE %s
-        """, (f"{prefix}%",))
-        
-        result = cursor.fetchone()
-        next_num = (result['max_num'] or 0) + 1
-        
-        # Format as prefix + 3 digits (e.g., P001, S001, etc.)
-        tag_id = f"{prefix}{next_num:03d}"
-        
-        cursor.close()
-        conn.close()
-        
-        return tag_id
-        
-    except Exception as e:
-        print(f"Error generating tag ID: {e}")
-        import traceback
-        traceback.print_exc()
-        # Fallback: start from 001 if database query fails
-        return f"{prefix}001"
+    """Allocate the next tag ID for a pig type (P grown pig, S piglet, L litter, B batch).
+    
+    Call it inside the caller's db_transaction() so a failed insert hands the
+    number back.
+    """
+    if pig_type not in ('grown_pig', 'piglet', 'litter', 'batch'):
+        pig_type = 'grown_pig'
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    tag_id = allocate_ids(cursor, f'pig_{pig_type}')[0]
+    cursor.close()
+    conn.close()
+    
+    return tag_id
 
 def generate_litter_id():
-    """Generate a unique sequential litter ID (L001, L002, etc.)"""
-    try:
-        conn = get_db_connection()
+    """Allocate the next sequential litter ID (L001, L002, etc.)"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    litter_id = allocate_ids(cursor, 'litter')[0]
+    cursor.close()
+    conn.close()
+    
+    print(f"Generated litter ID: {litter_id}")
+    return litter_id
+
+@app.cli.command('check-id-allocator')
+@click.option('--threads', default=8, show_default=True, help='Concurrent connections allocating at once.')
+@click.option('--allocations', default=250, show_default=True, help='Allocations per thread.')
+@click.option('--block-size', default=1, show_default=True, help='Numbers reserved per allocation.')
+def check_id_allocator_command(threads, allocations, block_size):
+    """Stress the ID allocator from concurrent connections and check for duplicates."""
+    sequence_name = 'allocator_stress_test'
+    with get_db_pool().acquire() as conn:
         cursor = conn.cursor()
-        
-        # Get the next available litter number
         cursor.execute("""
-            SELECT MAX(CAST(SUBSTRING(litter_id, 2) AS UNSIGNED)) as max_num 
-            FROM litters 
-            WHERE litter_id LIKE 'L%'
+            INSERT INTO id_sequences (sequence_name, last_value) VALUES (%s, 0)
+            ON DUPLICATE KEY UPDATE last_value = 0
+        """, (sequence_name,))
+    
+    numbers = []
+    errors = []
+    lock = threading.Lock()
+    
+    def worker():
+        try:
+            with get_db_pool().acquire() as conn:
+                cursor = conn.cursor()
+                for _ in range(allocations):
+                    block = allocate_sequence_numbers(cursor, sequence_name, block_size)
+                    with lock:
+                        numbers.extend(block)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+    
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    
+    with get_db_pool().acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM id_sequences WHERE sequence_name = %s", (sequence_name,))
+    
+    expected = threads * allocations * block_size
+    duplicates = len(numbers) - len(set(numbers))
+    contiguous = sorted(numbers) == list(range(1, len(numbers) + 1))
+    print(f"{len(numbers)}/{expected} numbers allocated in {duration_ms} ms by {threads} threads")
+    print(f"duplicates: {duplicates}, contiguous: {contiguous}, errors: {len(errors)}")
+    for error in errors[:5]:
+        print(f"  {error}")
+    if duplicates or errors or len(numbers) != expected or not contiguous:
+        raise SystemExit(1)
+
+IN_LIST_CHUNK_SIZE = 1000
+
+def in_list_chunks(values):
+    """Split values for an IN (...) query, yielding (chunk, placeholders).
+    
+    Chunking keeps very large id lists from producing oversized statements.
+    """
+    values = list(values)
+    for start in range(0, len(values), IN_LIST_CHUNK_SIZE):
+        chunk = values[start:start + IN_LIST_CHUNK_SIZE]
+        yield chunk, ', '.join(['%s'] * len(chunk))
+
+def flatten_age_ranges(ranges, start_key, end_key):
+    """Flatten possibly overlapping age ranges into disjoint segments.
+    
+    ranges must be ordered by start. Returns (starts, owners): the first
+    age of each segment and the earliest-starting range covering it, or
+    None for a gap, so an age resolves with a bisect over starts.
+    """
+    boundaries = sorted({item[start_key] for item in ranges} |
+                        {item[end_key] + 1 for item in ranges})
+    starts = []
+    owners = []
+    for segment_start in boundaries:
+        owner = next((item for item in ranges
+                      if item[start_key] <= segment_start <= item[end_key]), None)
+        if owners and owners[-1] is owner:
+            continue
+        starts.append(segment_start)
+        owners.append(owner)
+    return starts, owners
+
+def migrate_core_schema(cursor):
+    """Migration 1: core employee, pig, cow, weight and vaccination schema"""
+    # Create employees table with updated structure
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS employees (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            full_name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            phone VARCHAR(20),
+            employee_code VARCHAR(6) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            profile_image VARCHAR(255),
+            role ENUM('administrator', 'manager', 'employee', 'vet', 'it') DEFAULT 'employee',
+            status ENUM('waiting_approval', 'active', 'suspended') DEFAULT 'waiting_approval',
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+    print("Employees table checked/created successfully")
+    
+    # Create activity_log table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id INT NOT NULL,
+            action VARCHAR(100) NOT NULL,
+            description TEXT,
+            table_name VARCHAR(50),
+            record_id INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES employees(id)
+        )
+    """)
+    print("Activity log table checked/created successfully")
+    
+    # Create farms table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS farms (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            farm_name VARCHAR(100) UNIQUE NOT NULL,
+            farm_location VARCHAR(255) NOT NULL,
+            created_by INT NOT NULL,
+            status ENUM('active', 'inactive', 'suspended') DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Farms table checked/created successfully")
+    
+    # Create pigs table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pigs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            tag_id VARCHAR(10) UNIQUE NOT NULL,
+            farm_id INT NOT NULL,
+            pig_type ENUM('grown_pig', 'piglet', 'litter', 'batch') NOT NULL,
+            pig_source ENUM('born', 'purchased') NOT NULL,
+            breed VARCHAR(100),
+            gender ENUM('male', 'female'),
+            purpose ENUM('breeding', 'meat'),
+            breeding_status ENUM('young', 'available', 'served', 'pregnant') DEFAULT 'young',
+            birth_date DATE,
+            purchase_date DATE,
+            age_days INT,
+            registered_by INT NOT NULL,
+            status ENUM('active', 'sold', 'deceased', 'transferred', 'dead', 'slaughtered') DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (farm_id) REFERENCES farms(id),
+            FOREIGN KEY (registered_by) REFERENCES employees(id)
+        )
+    """)
+    print("Pigs table checked/created successfully")
+    
+    # Update pigs table status ENUM to include 'dead' and 'slaughtered'
+    try:
+        cursor.execute("""
+            ALTER TABLE pigs 
+            MODIFY COLUMN status ENUM('active', 'sold', 'deceased', 'transferred', 'dead', 'slaughtered') DEFAULT 'active'
         """)
-        
-        result = cursor.fetchone()
-        next_num = (result['max_num'] or 0) + 1
-        
-        # Format as L + 3 digits (e.g., L001, L002, etc.)
-        litter_id = f"L{next_num:03d}"
-        
-        # Double-check that this ID doesn't already exist
-        cursor.execute("SELECT id FROM litters WHERE litter_id = %s", (litter_id,))
+        print("Pigs table status ENUM updated successfully")
+    except Exception as e:
+        print(f"Note: Pigs table status ENUM may already be updated: {e}")
+    
+    # Create weight_records table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS weight_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            animal_id INT NULL,
+            litter_id INT NULL,
+            weight DECIMAL(8,2) NOT NULL,
+            expected_weight DECIMAL(8,2) NULL,
+            weight_type ENUM('actual', 'expected') DEFAULT 'actual',
+            weighing_date DATE NOT NULL,
+            weighing_time TIME,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (animal_id) REFERENCES pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
+            CHECK (animal_id IS NOT NULL OR litter_id IS NOT NULL)
+        )
+    """)
+    print("Weight records table checked/created successfully")
+    
+    # Create slaughter_records table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS slaughter_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            pig_id INT NULL,
+            litter_id INT NULL,
+            pig_type ENUM('grown_pig', 'litter') NOT NULL,
+            slaughter_date DATE NOT NULL,
+            live_weight DECIMAL(8,2) NOT NULL,
+            carcass_weight DECIMAL(8,2) NOT NULL,
+            dressing_percentage DECIMAL(5,2) NOT NULL,
+            meat_grade ENUM('premium', 'grade_a', 'grade_b', 'grade_c', 'standard') NOT NULL,
+            price_per_kg DECIMAL(8,2) NOT NULL,
+            total_revenue DECIMAL(10,2) NOT NULL,
+            buyer_name VARCHAR(255) NOT NULL,
+            pigs_count INT DEFAULT 1,
+            notes TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES employees(id),
+            CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
+        )
+    """)
+    print("Slaughter records table checked/created successfully")
+    
+    # Create dead_pigs table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dead_pigs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            pig_id INT NULL,
+            litter_id INT NULL,
+            pig_type ENUM('grown_pig', 'litter') NOT NULL,
+            death_date DATE NOT NULL,
+            cause_of_death ENUM('disease', 'injury', 'old_age', 'predator_attack', 'accident', 'birth_complications', 'unknown') NOT NULL,
+            weight_at_death DECIMAL(8,2) NOT NULL,
+            age_at_death INT NULL,
+            additional_details TEXT,
+            pigs_count INT DEFAULT 1,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES employees(id),
+            CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
+        )
+    """)
+    print("Dead pigs table checked/created successfully")
+    
+    # Create sale_records table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sale_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            pig_id INT NULL,
+            litter_id INT NULL,
+            pig_type ENUM('grown_pig', 'litter') NOT NULL,
+            sale_date DATE NOT NULL,
+            buyer_name VARCHAR(255) NOT NULL,
+            buyer_contact VARCHAR(50),
+            sale_price DECIMAL(8,2) NOT NULL,
+            total_revenue DECIMAL(10,2) NOT NULL,
+            notes TEXT,
+            pigs_count INT DEFAULT 1,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
+            FOREIGN KEY (created_by) REFERENCES employees(id),
+            CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
+        )
+    """)
+    print("Sale records table checked/created successfully")
+    
+    # Remove payment_method column from sale_records table if it exists
+    try:
+        cursor.execute("SHOW COLUMNS FROM sale_records LIKE 'payment_method'")
         if cursor.fetchone():
-            # If it exists, try the next number
-            next_num += 1
-            litter_id = f"L{next_num:03d}"
-        
-        cursor.close()
-        conn.close()
-        
-        print(f"Generated litter ID: {litter_id}")
-        return litter_id
-        
+            cursor.execute("ALTER TABLE sale_records DROP COLUMN payment_method")
+            print("Payment method column removed from sale_records table")
     except Exception as e:
-        print(f"Error generating litter ID: {e}")
-        import traceback
-        traceback.print_exc()
-        # Fallback: start from L001 if database query fails
-        return f"L001"
-
-def calculate_expected_weight(animal_id=None, litter_id=None, weighing_date=None):
-    """Calculate expected weight based on age and weight categories"""
+        print(f"Note: Payment method column may not exist: {e}")
+    
+    # Update weight_records table to support litters if needed
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get weight categories
-        cursor.execute("""
-            SELECT start_age, end_age, category_name, min_weight, max_weight, daily_gain
-            FROM weight_categories
-            ORDER BY start_age
-        """)
-        categories = cursor.fetchall()
+        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'litter_id'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE weight_records ADD COLUMN litter_id INT NULL AFTER animal_id")
+            cursor.execute("ALTER TABLE weight_records ADD FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE")
+            print("Added litter_id column to weight_records table")
         
-        if not categories:
-            return None
+        # Make animal_id nullable to support litter-only records
+        cursor.execute("ALTER TABLE weight_records MODIFY COLUMN animal_id INT NULL")
+        print("Made animal_id nullable in weight_records table")
         
-        # Get animal age
-        age_days = None
-        if animal_id:
-            cursor.execute("SELECT birth_date FROM pigs WHERE id = %s", (animal_id,))
-            result = cursor.fetchone()
-            if result and result['birth_date']:
-                age_days = (weighing_date - result['birth_date']).days
-        elif litter_id:
-            cursor.execute("SELECT farrowing_date FROM litters WHERE id = %s", (litter_id,))
-            result = cursor.fetchone()
-            if result and result['farrowing_date']:
-                age_days = (weighing_date - result['farrowing_date']).days
+        # Add expected weight and weight type columns
+        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'expected_weight'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE weight_records ADD COLUMN expected_weight DECIMAL(8,2) NULL AFTER weight")
+            print("Added expected_weight column to weight_records table")
         
-        if not age_days or age_days < 0:
-            return None
+        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'weight_type'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE weight_records ADD COLUMN weight_type ENUM('actual', 'expected') DEFAULT 'actual' AFTER expected_weight")
+            print("Added weight_type column to weight_records table")
         
-        # Find appropriate category
-        for category in categories:
-            if age_days >= category['start_age'] and age_days <= category['end_age']:
-                # Calculate expected weight based on daily gain
-                days_in_category = age_days - category['start_age']
-                expected_weight = category['min_weight'] + (days_in_category * category['daily_gain'])
-                cursor.close()
-                conn.close()
-                return round(expected_weight, 2)
+    except Exception as e:
+        print(f"Error updating weight_records table: {str(e)}")
+    
+    # Check if pig_source column exists, if not add it
+    try:
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'pig_source'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE pigs ADD COLUMN pig_source ENUM('born', 'purchased') NOT NULL DEFAULT 'born' AFTER pig_type")
+            print("Added pig_source column to pigs table")
+    except Exception as e:
+        print(f"Error adding pig_source column: {str(e)}")
+    
+    # Add missing columns to pigs table
+    try:
+        # Add name column
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'name'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE pigs ADD COLUMN name VARCHAR(100) AFTER tag_id")
+            print("Added name column to pigs table")
         
-        cursor.close()
-        conn.close()
-        return None
+        # Add gender column (rename from sex if exists)
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'gender'")
+        if not cursor.fetchone():
+            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'sex'")
+            if cursor.fetchone():
+                cursor.execute("ALTER TABLE pigs CHANGE sex gender ENUM('male', 'female')")
+                print("Renamed sex column to gender in pigs table")
+            else:
+                cursor.execute("ALTER TABLE pigs ADD COLUMN gender ENUM('male', 'female') AFTER name")
+                print("Added gender column to pigs table")
         
+        # Add birth_date column
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'birth_date'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE pigs ADD COLUMN birth_date DATE AFTER gender")
+            print("Added birth_date column to pigs table")
+            
     except Exception as e:
-        print(f"Error calculating expected weight: {str(e)}")
-        return None
+        print(f"Error adding columns to pigs table: {str(e)}")
+    
+    # Check if breeding_status column exists, if not add it
+    try:
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'breeding_status'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE pigs ADD COLUMN breeding_status ENUM('young', 'available', 'served', 'pregnant') DEFAULT 'young' AFTER purpose")
+            print("Added breeding_status column to pigs table")
+        else:
+            # Check if we need to update the enum values
+            cursor.execute("SHOW COLUMNS FROM pigs WHERE Field = 'breeding_status'")
+            column_info = cursor.fetchone()
+            if column_info and 'farrowed' not in column_info['Type']:
+                # Update the enum to include new values
+                cursor.execute("ALTER TABLE pigs MODIFY COLUMN breeding_status ENUM('young', 'available', 'served', 'pregnant', 'farrowed') DEFAULT 'young'")
+                print("Updated breeding_status enum to include new values")
+    except Exception as e:
+                        print(f"Warning: Could not check/add breeding_status column: {e}")
+    
+    # Check if is_edited column exists, if not add it
+    try:
+        cursor.execute("SHOW COLUMNS FROM pigs LIKE 'is_edited'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE pigs ADD COLUMN is_edited BOOLEAN DEFAULT FALSE AFTER updated_at")
+            print("Added is_edited column to pigs table")
+    except Exception as e:
+                        print(f"Warning: Could not check/add is_edited column: {e}")
+    
+    # Create breeding_records table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS breeding_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            sow_id INT NOT NULL,
+            boar_id INT NOT NULL,
+            mating_date DATE NOT NULL,
+            expected_due_date DATE,
+            status ENUM('served', 'pregnant', 'cancelled', 'completed') DEFAULT 'served',
+            notes TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (sow_id) REFERENCES pigs(id),
+            FOREIGN KEY (boar_id) REFERENCES pigs(id),
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Breeding records table checked/created successfully")
+    
+    # Check and update breeding_records status enum if needed
+    try:
+        cursor.execute("SHOW COLUMNS FROM breeding_records WHERE Field = 'status'")
+        column_info = cursor.fetchone()
+        if column_info and 'completed' not in column_info['Type']:
+            # Update the enum to include new values
+            cursor.execute("ALTER TABLE breeding_records MODIFY COLUMN status ENUM('served', 'pregnant', 'cancelled', 'completed') DEFAULT 'served'")
+            print("Updated breeding_records status enum to include 'completed'")
+    except Exception as e:
+                        print(f"Warning: Could not check/update breeding_records status enum: {e}")
 
-def create_database_and_tables():
-    """Create database and tables if they don't exist"""
+    # Check and add weaning fields to farrowing_activities table if needed
     try:
-        # First, connect without specifying database
-        conn = get_db_connection_no_db()
-        cursor = conn.cursor()
-        
-        # Create database if it doesn't exist
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-        print(f"Database '{DB_CONFIG['database']}' checked/created successfully")
-        
-        # Use the database
-        cursor.execute(f"USE {DB_CONFIG['database']}")
-        
-        # Create employees table with updated structure
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS employees (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                full_name VARCHAR(100) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                phone VARCHAR(20),
-                employee_code VARCHAR(6) UNIQUE NOT NULL,
-                password VARCHAR(255) NOT NULL,
-                profile_image VARCHAR(255),
-                role ENUM('administrator', 'manager', 'employee', 'vet', 'it') DEFAULT 'employee',
-                status ENUM('waiting_approval', 'active', 'suspended') DEFAULT 'waiting_approval',
-                is_active BOOLEAN DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-            )
-        """)
-        print("Employees table checked/created successfully")
+        cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'weaning_weight'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN weaning_weight DECIMAL(5,2) NULL COMMENT 'Weight at weaning (for weaning activity)'")
+            print("Added weaning_weight column to farrowing_activities table")
         
-        # Create activity_log table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS activity_log (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id INT NOT NULL,
-                action VARCHAR(100) NOT NULL,
-                description TEXT,
-                table_name VARCHAR(50),
-                record_id INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (employee_id) REFERENCES employees(id)
-            )
-        """)
-        print("Activity log table checked/created successfully")
+        cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'weaning_date'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN weaning_date DATETIME NULL COMMENT 'Date and time of weaning (for weaning activity)'")
+            print("Added weaning_date column to farrowing_activities table")
         
-        # Create farms table
+        cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'completed_by'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN completed_by INT NULL COMMENT 'Employee who completed the activity'")
+            print("Added completed_by column to farrowing_activities table")
+            
+            # Add foreign key constraint for completed_by
+            try:
+                cursor.execute("ALTER TABLE farrowing_activities ADD CONSTRAINT fk_farrowing_activities_completed_by FOREIGN KEY (completed_by) REFERENCES employees(id)")
+                print("Added foreign key constraint for completed_by column")
+            except Exception as fk_error:
+                print(f"Warning: Could not add foreign key constraint for completed_by: {fk_error}")
+    except Exception as e:
+                        print(f"Warning: Could not check/add weaning fields to farrowing_activities table: {e}")
+
+    # Check and update litters status enum if needed
+    try:
+        cursor.execute("SHOW COLUMNS FROM litters WHERE Field = 'status'")
+        column_info = cursor.fetchone()
+        if column_info and 'unweaned' not in column_info['Type']:
+            # First update existing 'active' records to 'unweaned'
+            cursor.execute("UPDATE litters SET status = 'unweaned' WHERE status = 'active'")
+            print("Updated existing 'active' litter records to 'unweaned'")
+            
+            # Then update the enum to include 'unweaned' and remove 'active'
+            cursor.execute("ALTER TABLE litters MODIFY COLUMN status ENUM('unweaned', 'weaned', 'sold', 'deceased') DEFAULT 'unweaned'")
+            print("Updated litters status enum to use 'unweaned' instead of 'active'")
+    except Exception as e:
+                        print(f"Warning: Could not check/update litters status enum: {e}")
+    
+    # Create failed_conceptions table to track failed breeding attempts
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS failed_conceptions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            sow_id INT NOT NULL,
+            boar_id INT NOT NULL,
+            mating_date DATE NOT NULL,
+            failure_date DATE NOT NULL,
+            failure_reason TEXT,
+            notes TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (sow_id) REFERENCES pigs(id),
+            FOREIGN KEY (boar_id) REFERENCES pigs(id),
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Failed conceptions table checked/created successfully")
+    
+    # Create farrowing_records table to track successful farrowings
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS farrowing_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            breeding_id INT NOT NULL,
+            farrowing_date DATE NOT NULL,
+            alive_piglets INT NOT NULL,
+            still_births INT NOT NULL,
+            dead_piglets INT DEFAULT 0,
+            weak_piglets INT DEFAULT 0,
+            avg_weight DECIMAL(5,2) NOT NULL,
+            health_notes TEXT,
+            notes TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (breeding_id) REFERENCES breeding_records(id),
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Farrowing records table checked/created successfully")
+    
+    # Add missing columns to farrowing_records table if they don't exist
+    try:
+        cursor.execute("ALTER TABLE farrowing_records ADD COLUMN dead_piglets INT DEFAULT 0")
+        print("Added dead_piglets column to farrowing_records")
+    except Exception as e:
+        if "Duplicate column name" not in str(e):
+            print(f"Error adding dead_piglets column: {str(e)}")
+    
+    try:
+        cursor.execute("ALTER TABLE farrowing_records ADD COLUMN weak_piglets INT DEFAULT 0")
+        print("Added weak_piglets column to farrowing_records")
+    except Exception as e:
+        if "Duplicate column name" not in str(e):
+            print(f"Error adding weak_piglets column: {str(e)}")
+    
+    try:
+        cursor.execute("ALTER TABLE farrowing_records ADD COLUMN notes TEXT")
+        print("Added notes column to farrowing_records")
+    except Exception as e:
+        if "Duplicate column name" not in str(e):
+            print(f"Error adding notes column: {str(e)}")
+    
+    try:
+        cursor.execute("ALTER TABLE farrowing_records ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
+        print("Added updated_at column to farrowing_records")
+    except Exception as e:
+        if "Duplicate column name" not in str(e):
+            print(f"Error adding updated_at column: {str(e)}")
+    
+    # Create farrowing_activities table to track farrowing activities
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS farrowing_activities (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            farrowing_record_id INT NOT NULL,
+            activity_name VARCHAR(100) NOT NULL,
+            due_day INT NOT NULL,
+            due_date DATE NOT NULL,
+            completed BOOLEAN DEFAULT FALSE,
+            completed_date DATETIME NULL,
+            weaning_weight DECIMAL(5,2) NULL,
+            weaning_date DATETIME NULL,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (farrowing_record_id) REFERENCES farrowing_records(id)
+        )
+    """)
+    print("Farrowing activities table checked/created successfully")
+    
+    # Add updated_at column to farrowing_activities if it doesn't exist
+    try:
+        cursor.execute("SHOW COLUMNS FROM farrowing_activities LIKE 'updated_at'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at")
+            print("Added updated_at column to farrowing_activities table")
+    except Exception as e:
+        print(f"Error adding updated_at column to farrowing_activities: {str(e)}")
+    
+    # Create litters table to track litter information
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS litters (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            litter_id VARCHAR(20) UNIQUE NOT NULL,
+            farrowing_record_id INT NOT NULL,
+            sow_id INT NOT NULL,
+            boar_id INT,
+            farrowing_date DATE NOT NULL,
+            total_piglets INT NOT NULL,
+            alive_piglets INT NOT NULL,
+            still_births INT DEFAULT 0,
+            avg_weight DECIMAL(5,2),
+            weaning_weight DECIMAL(5,2),
+            weaning_date DATE,
+            status ENUM('unweaned', 'weaned', 'sold', 'deceased', 'dead', 'slaughtered') DEFAULT 'unweaned',
+            notes TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (farrowing_record_id) REFERENCES farrowing_records(id),
+            FOREIGN KEY (sow_id) REFERENCES pigs(id),
+            FOREIGN KEY (boar_id) REFERENCES pigs(id),
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Litters table checked/created successfully")
+    
+    # Update litters table status ENUM to include 'dead' and 'slaughtered'
+    try:
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS farms (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                farm_name VARCHAR(100) UNIQUE NOT NULL,
-                farm_location VARCHAR(255) NOT NULL,
-                created_by INT NOT NULL,
-                status ENUM('active', 'inactive', 'suspended') DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
+            ALTER TABLE litters 
+            MODIFY COLUMN status ENUM('unweaned', 'weaned', 'sold', 'deceased', 'dead', 'slaughtered') DEFAULT 'unweaned'
         """)
-        print("Farms table checked/created successfully")
-        
-        # Create pigs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pigs (
+        print("Litters table status ENUM updated successfully")
+    except Exception as e:
+        print(f"Note: Litters table status ENUM may already be updated: {e}")
+    
+    # Create cows table
+    cursor.execute("""
+            CREATE TABLE IF NOT EXISTS cows (
                 id INT AUTO_INCREMENT PRIMARY KEY,
-                tag_id VARCHAR(10) UNIQUE NOT NULL,
-                farm_id INT NOT NULL,
-                pig_type ENUM('grown_pig', 'piglet', 'litter', 'batch') NOT NULL,
-                pig_source ENUM('born', 'purchased') NOT NULL,
+                ear_tag VARCHAR(20) UNIQUE NOT NULL,
+                name VARCHAR(100),
                 breed VARCHAR(100),
-                gender ENUM('male', 'female'),
-                purpose ENUM('breeding', 'meat'),
-                breeding_status ENUM('young', 'available', 'served', 'pregnant') DEFAULT 'young',
+                color_markings TEXT,
+                gender ENUM('male', 'female') NOT NULL,
                 birth_date DATE,
-                purchase_date DATE,
                 age_days INT,
+                source ENUM('born', 'purchased') NOT NULL,
+                purchase_date DATE,
+                purchase_place VARCHAR(255),
+                sire_ear_tag VARCHAR(20),
+                sire_details TEXT,
+                dam_ear_tag VARCHAR(20),
+                dam_details TEXT,
+                status ENUM('active', 'sold', 'deceased', 'transferred') DEFAULT 'active',
                 registered_by INT NOT NULL,
-                status ENUM('active', 'sold', 'deceased', 'transferred', 'dead', 'slaughtered') DEFAULT 'active',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (farm_id) REFERENCES farms(id),
                 FOREIGN KEY (registered_by) REFERENCES employees(id)
             )
         """)
-        print("Pigs table checked/created successfully")
-        
-        # Update pigs table status ENUM to include 'dead' and 'slaughtered'
-        try:
-            cursor.execute("""
-                ALTER TABLE pigs 
-                MODIFY COLUMN status ENUM('active', 'sold', 'deceased', 'transferred', 'dead', 'slaughtered') DEFAULT 'active'
-            """)
-            print("Pigs table status ENUM updated successfully")
-        except Exception as e:
-            print(f"Note: Pigs table status ENUM may already be updated: {e}")
-        
-        # Create weight_records table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS weight_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                animal_id INT NULL,
-                litter_id INT NULL,
-                weight DECIMAL(8,2) NOT NULL,
-                expected_weight DECIMAL(8,2) NULL,
-                weight_type ENUM('actual', 'expected') DEFAULT 'actual',
-                weighing_date DATE NOT NULL,
-                weighing_time TIME,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (animal_id) REFERENCES pigs(id) ON DELETE CASCADE,
-                FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
-                CHECK (animal_id IS NOT NULL OR litter_id IS NOT NULL)
-            )
-        """)
-        print("Weight records table checked/created successfully")
-        
-        # Create slaughter_records table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS slaughter_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                pig_id INT NULL,
-                litter_id INT NULL,
-                pig_type ENUM('grown_pig', 'litter') NOT NULL,
-                slaughter_date DATE NOT NULL,
-                live_weight DECIMAL(8,2) NOT NULL,
-                carcass_weight DECIMAL(8,2) NOT NULL,
-                dressing_percentage DECIMAL(5,2) NOT NULL,
-                meat_grade ENUM('premium', 'grade_a', 'grade_b', 'grade_c', 'standard') NOT NULL,
-                price_per_kg DECIMAL(8,2) NOT NULL,
-                total_revenue DECIMAL(10,2) NOT NULL,
-                buyer_name VARCHAR(255) NOT NULL,
-                pigs_count INT DEFAULT 1,
-                notes TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
-                FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
-            )
-        """)
-        print("Slaughter records table checked/created successfully")
-        
-        # Create dead_pigs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS dead_pigs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                pig_id INT NULL,
-                litter_id INT NULL,
-                pig_type ENUM('grown_pig', 'litter') NOT NULL,
-                death_date DATE NOT NULL,
-                cause_of_death ENUM('disease', 'injury', 'old_age', 'predator_attack', 'accident', 'birth_complications', 'unknown') NOT NULL,
-                weight_at_death DECIMAL(8,2) NOT NULL,
-                age_at_death INT NULL,
-                additional_details TEXT,
-                pigs_count INT DEFAULT 1,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
-                FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
-            )
-        """)
-        print("Dead pigs table checked/created successfully")
-        
-        # Create sale_records table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sale_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                pig_id INT NULL,
-                litter_id INT NULL,
-                pig_type ENUM('grown_pig', 'litter') NOT NULL,
-                sale_date DATE NOT NULL,
-                buyer_name VARCHAR(255) NOT NULL,
-                buyer_contact VARCHAR(50),
-                sale_price DECIMAL(8,2) NOT NULL,
-                total_revenue DECIMAL(10,2) NOT NULL,
-                notes TEXT,
-                pigs_count INT DEFAULT 1,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (pig_id) REFERENCES pigs(id) ON DELETE CASCADE,
-                FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE,
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                CHECK (pig_id IS NOT NULL OR litter_id IS NOT NULL)
-            )
-        """)
-        print("Sale records table checked/created successfully")
-        
-        # Remove payment_method column from sale_records table if it exists
-        try:
-            cursor.execute("SHOW COLUMNS FROM sale_records LIKE 'payment_method'")
-            if cursor.fetchone():
-                cursor.execute("ALTER TABLE sale_records DROP COLUMN payment_method")
-                print("Payment method column removed from sale_records table")
-        except Exception as e:
-            print(f"Note: Payment method column may not exist: {e}")
-        
-        # Update weight_records table to support litters if needed
-        try:
-            cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'litter_id'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE weight_records ADD COLUMN litter_id INT NULL AFTER animal_id")
-                cursor.execute("ALTER TABLE weight_records ADD FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE")
-                print("Added litter_id column to weight_records table")
-            
-            # Make animal_id nullable to support litter-only records
-            cursor.execute("ALTER TABLE weight_records MODIFY COLUMN animal_id INT NULL")
-            print("Made animal_id nullable in weight_records table")
-            
-            # Add expected weight and weight type columns
-            cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'expected_weight'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE weight_records ADD COLUMN expected_weight DECIMAL(8,2) NULL AFTER weight")
-                print("Added expected_weight column to weight_records table")
-            
-            cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'weight_type'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE weight_records ADD COLUMN weight_type ENUM('actual', 'expected') DEFAULT 'actual' AFTER expected_weight")
-                print("Added weight_type column to weight_records table")
-            
-        except Exception as e:
-            print(f"Error updating weight_records table: {str(e)}")
-        
-        # Check if pig_source column exists, if not add it
-        try:
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'pig_source'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE pigs ADD COLUMN pig_source ENUM('born', 'purchased') NOT NULL DEFAULT 'born' AFTER pig_type")
-                print("Added pig_source column to pigs table")
-        except Exception as e:
-            print(f"Error adding pig_source column: {str(e)}")
-        
-        # Add missing columns to pigs table
-        try:
-            # Add name column
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'name'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE pigs ADD COLUMN name VARCHAR(100) AFTER tag_id")
-                print("Added name column to pigs table")
-            
-            # Add gender column (rename from sex if exists)
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'gender'")
-            if not cursor.fetchone():
-                cursor.execute("SHOW COLUMNS FROM pigs LIKE 'sex'")
-                if cursor.fetchone():
-                    cursor.execute("ALTER TABLE pigs CHANGE sex gender ENUM('male', 'female')")
-                    print("Renamed sex column to gender in pigs table")
-                else:
-                    cursor.execute("ALTER TABLE pigs ADD COLUMN gender ENUM('male', 'female') AFTER name")
-                    print("Added gender column to pigs table")
-            
-            # Add birth_date column
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'birth_date'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE pigs ADD COLUMN birth_date DATE AFTER gender")
-                print("Added birth_date column to pigs table")
-                
-        except Exception as e:
-            print(f"Error adding columns to pigs table: {str(e)}")
-        
-        # Check if breeding_status column exists, if not add it
-        try:
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'breeding_status'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE pigs ADD COLUMN breeding_status ENUM('young', 'available', 'served', 'pregnant') DEFAULT 'young' AFTER purpose")
-                print("Added breeding_status column to pigs table")
-            else:
-                # Check if we need to update the enum values
-                cursor.execute("SHOW COLUMNS FROM pigs WHERE Field = 'breeding_status'")
-                column_info = cursor.fetchone()
-                if column_info and 'farrowed' not in column_info['Type']:
-                    # Update the enum to include new values
-                    cursor.execute("ALTER TABLE pigs MODIFY COLUMN breeding_status ENUM('young', 'available', 'served', 'pregnant', 'farrowed') DEFAULT 'young'")
-                    print("Updated breeding_status enum to include new values")
-        except Exception as e:
-                            print(f"Warning: Could not check/add breeding_status column: {e}")
-        
-        # Check if is_edited column exists, if not add it
-        try:
-            cursor.execute("SHOW COLUMNS FROM pigs LIKE 'is_edited'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE pigs ADD COLUMN is_edited BOOLEAN DEFAULT FALSE AFTER updated_at")
-                print("Added is_edited column to pigs table")
-        except Exception as e:
-                            print(f"Warning: Could not check/add is_edited column: {e}")
-        
-        # Create breeding_records table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS breeding_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                sow_id INT NOT NULL,
-                boar_id INT NOT NULL,
-                mating_date DATE NOT NULL,
-                expected_due_date DATE,
-                status ENUM('served', 'pregnant', 'cancelled', 'completed') DEFAULT 'served',
-                notes TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (sow_id) REFERENCES pigs(id),
-                FOREIGN KEY (boar_id) REFERENCES pigs(id),
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
-        """)
-        print("Breeding records table checked/created successfully")
-        
-        # Check and update breeding_records status enum if needed
-        try:
-            cursor.execute("SHOW COLUMNS FROM breeding_records WHERE Field = 'status'")
-            column_info = cursor.fetchone()
-            if column_info and 'completed' not in column_info['Type']:
-                # Update the enum to include new values
-                cursor.execute("ALTER TABLE breeding_records MODIFY COLUMN status ENUM('served', 'pregnant', 'cancelled', 'completed') DEFAULT 'served'")
-                print("Updated breeding_records status enum to include 'completed'")
-        except Exception as e:
-                            print(f"Warning: Could not check/update breeding_records status enum: {e}")
-
-        # Check and add weaning fields to farrowing_activities table if needed
-        try:
-            cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'weaning_weight'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN weaning_weight DECIMAL(5,2) NULL COMMENT 'Weight at weaning (for weaning activity)'")
-                print("Added weaning_weight column to farrowing_activities table")
-            
-            cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'weaning_date'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN weaning_date DATETIME NULL COMMENT 'Date and time of weaning (for weaning activity)'")
-                print("Added weaning_date column to farrowing_activities table")
-            
-            cursor.execute("SHOW COLUMNS FROM farrowing_activities WHERE Field = 'completed_by'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN completed_by INT NULL COMMENT 'Employee who completed the activity'")
-                print("Added completed_by column to farrowing_activities table")
-                
-                # Add foreign key constraint for completed_by
-                try:
-                    cursor.execute("ALTER TABLE farrowing_activities ADD CONSTRAINT fk_farrowing_activities_completed_by FOREIGN KEY (completed_by) REFERENCES employees(id)")
-                    print("Added foreign key constraint for completed_by column")
-                except Exception as fk_error:
-                    print(f"Warning: Could not add foreign key constraint for completed_by: {fk_error}")
-        except Exception as e:
-                            print(f"Warning: Could not check/add weaning fields to farrowing_activities table: {e}")
-
-        # Check and update litters status enum if needed
-        try:
-            cursor.execute("SHOW COLUMNS FROM litters WHERE Field = 'status'")
-            column_info = cursor.fetchone()
-            if column_info and 'unweaned' not in column_info['Type']:
-                # First update existing 'active' records to 'unweaned'
-                cursor.execute("UPDATE litters SET status = 'unweaned' WHERE status = 'active'")
-                print("Updated existing 'active' litter records to 'unweaned'")
-                
-                # Then update the enum to include 'unweaned' and remove 'active'
-                cursor.execute("ALTER TABLE litters MODIFY COLUMN status ENUM('unweaned', 'weaned', 'sold', 'deceased') DEFAULT 'unweaned'")
-                print("Updated litters status enum to use 'unweaned' instead of 'active'")
-        except Exception as e:
-                            print(f"Warning: Could not check/update litters status enum: {e}")
-        
-        # Create failed_conceptions table to track failed breeding attempts
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS failed_conceptions (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                sow_id INT NOT NULL,
-                boar_id INT NOT NULL,
-                mating_date DATE NOT NULL,
-                failure_date DATE NOT NULL,
-                failure_reason TEXT,
-                notes TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (sow_id) REFERENCES pigs(id),
-                FOREIGN KEY (boar_id) REFERENCES pigs(id),
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
-        """)
-        print("Failed conceptions table checked/created successfully")
-        
-        # Create farrowing_records table to track successful farrowings
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS farrowing_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                breeding_id INT NOT NULL,
-                farrowing_date DATE NOT NULL,
-                alive_piglets INT NOT NULL,
-                still_births INT NOT NULL,
-                dead_piglets INT DEFAULT 0,
-                weak_piglets INT DEFAULT 0,
-                avg_weight DECIMAL(5,2) NOT NULL,
-                health_notes TEXT,
-                notes TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (breeding_id) REFERENCES breeding_records(id),
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
-        """)
-        print("Farrowing records table checked/created successfully")
-        
-        # Add missing columns to farrowing_records table if they don't exist
-        try:
-            cursor.execute("ALTER TABLE farrowing_records ADD COLUMN dead_piglets INT DEFAULT 0")
-            print("Added dead_piglets column to farrowing_records")
-        except Exception as e:
-            if "Duplicate column name" not in str(e):
-                print(f"Error adding dead_piglets column: {str(e)}")
-        
-        try:
-            cursor.execute("ALTER TABLE farrowing_records ADD COLUMN weak_piglets INT DEFAULT 0")
-            print("Added weak_piglets column to farrowing_records")
-        except Exception as e:
-            if "Duplicate column name" not in str(e):
-                print(f"Error adding weak_piglets column: {str(e)}")
-        
-        try:
-            cursor.execute("ALTER TABLE farrowing_records ADD COLUMN notes TEXT")
-            print("Added notes column to farrowing_records")
-        except Exception as e:
-            if "Duplicate column name" not in str(e):
-                print(f"Error adding notes column: {str(e)}")
-        
-        try:
-            cursor.execute("ALTER TABLE farrowing_records ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
-            print("Added updated_at column to farrowing_records")
-        except Exception as e:
-            if "Duplicate column name" not in str(e):
-                print(f"Error adding updated_at column: {str(e)}")
-        
-        # Create farrowing_activities table to track farrowing activities
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS farrowing_activities (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                farrowing_record_id INT NOT NULL,
-                activity_name VARCHAR(100) NOT NULL,
-                due_day INT NOT NULL,
-                due_date DATE NOT NULL,
-                completed BOOLEAN DEFAULT FALSE,
-                completed_date DATETIME NULL,
-                weaning_weight DECIMAL(5,2) NULL,
-                weaning_date DATETIME NULL,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (farrowing_record_id) REFERENCES farrowing_records(id)
-            )
-        """)
-        print("Farrowing activities table checked/created successfully")
-        
-        # Add updated_at column to farrowing_activities if it doesn't exist
-        try:
-            cursor.execute("SHOW COLUMNS FROM farrowing_activities LIKE 'updated_at'")
-            if not cursor.fetchone():
-                cursor.execute("ALTER TABLE farrowing_activities ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at")
-                print("Added updated_at column to farrowing_activities table")
-        except Exception as e:
-            print(f"Error adding updated_at column to farrowing_activities: {str(e)}")
-        
-        # Create litters table to track litter information
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS litters (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                litter_id VARCHAR(20) UNIQUE NOT NULL,
-                farrowing_record_id INT NOT NULL,
-                sow_id INT NOT NULL,
-                boar_id INT,
-                farrowing_date DATE NOT NULL,
-                total_piglets INT NOT NULL,
-                alive_piglets INT NOT NULL,
-                still_births INT DEFAULT 0,
-                avg_weight DECIMAL(5,2),
-                weaning_weight DECIMAL(5,2),
-                weaning_date DATE,
-                status ENUM('unweaned', 'weaned', 'sold', 'deceased', 'dead', 'slaughtered') DEFAULT 'unweaned',
-                notes TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (farrowing_record_id) REFERENCES farrowing_records(id),
-                FOREIGN KEY (sow_id) REFERENCES pigs(id),
-                FOREIGN KEY (boar_id) REFERENCES pigs(id),
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
-        """)
-        print("Litters table checked/created successfully")
-        
-        # Update litters table status ENUM to include 'dead' and 'slaughtered'
-        try:
-            cursor.execute("""
-                ALTER TABLE litters 
-                MODIFY COLUMN status ENUM('unweaned', 'weaned', 'sold', 'deceased', 'dead', 'slaughtered') DEFAULT 'unweaned'
-            """)
-            print("Litters table status ENUM updated successfully")
-        except Exception as e:
-            print(f"Note: Litters table status ENUM may already be updated: {e}")
-        
-        # Create cows table
-        cursor.execute("""
-                CREATE TABLE IF NOT EXISTS cows (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    ear_tag VARCHAR(20) UNIQUE NOT NULL,
-                    name VARCHAR(100),
-                    breed VARCHAR(100),
-                    color_markings TEXT,
-                    gender ENUM('male', 'female') NOT NULL,
-                    birth_date DATE,
-                    age_days INT,
-                    source ENUM('born', 'purchased') NOT NULL,
-                    purchase_date DATE,
-                    purchase_place VARCHAR(255),
-                    sire_ear_tag VARCHAR(20),
-                    sire_details TEXT,
-                    dam_ear_tag VARCHAR(20),
-                    dam_details TEXT,
-                    status ENUM('active', 'sold', 'deceased', 'transferred') DEFAULT 'active',
-                    registered_by INT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (registered_by) REFERENCES employees(id)
-                )
-            """)
-        print("Cows table checked/created successfully")
-
-        # Create cow_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cow_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                cow_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (cow_id) REFERENCES cows(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Cow edit history table checked/created successfully")
-
-        # Create milk_production table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS milk_production (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                cow_id INT NOT NULL,
-                production_date DATE NOT NULL,
-                milking_session ENUM('morning', 'afternoon', 'evening') NOT NULL,
-                milk_quantity DECIMAL(10,2) NOT NULL,
-                fat_percentage DECIMAL(5,2),
-                protein_percentage DECIMAL(5,2),
-                milk_grade VARCHAR(50),
-                milk_quality_assessment ENUM('good_quality', 'moderate_quality', 'poor_quality') DEFAULT 'moderate_quality',
-                additional_notes TEXT,
-                recorded_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (cow_id) REFERENCES cows(id),
-                FOREIGN KEY (recorded_by) REFERENCES employees(id)
-            )
-        """)
-        print("Milk production table checked/created successfully")
-
-        # Create milk_production_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS milk_production_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                production_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (production_id) REFERENCES milk_production(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Milk production edit history table checked/created successfully")
-
-        # Create milk_sales_usage table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS milk_sales_usage (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                transaction_type ENUM('sale', 'usage') NOT NULL,
-                transaction_date DATE NOT NULL,
-                buyer VARCHAR(255),
-                quantity_sold DECIMAL(10,2),
-                price_per_liter DECIMAL(10,2),
-                total_amount DECIMAL(10,2),
-                quantity_used DECIMAL(10,2),
-                purpose_of_use ENUM('calf_feeding', 'home_consumption', 'processing', 'wastage_spoiled'),
-                recorded_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (recorded_by) REFERENCES employees(id)
-            )
-        """)
-        print("Milk sales usage table checked/created successfully")
-
-        # Create slaughter_records_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS slaughter_records_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                record_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (record_id) REFERENCES slaughter_records(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Slaughter records edit history table checked/created successfully")
-
-        # Create death_records_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS death_records_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                record_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (record_id) REFERENCES dead_pigs(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Death records edit history table checked/created successfully")
-
-        # Create sale_records_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sale_records_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                record_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (record_id) REFERENCES sale_records(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Sale records edit history table checked/created successfully")
-
-        # Create farrowing_records_edit_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS farrowing_records_edit_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                record_id INT NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (record_id) REFERENCES farrowing_records(id) ON DELETE CASCADE,
-                FOREIGN KEY (edited_by) REFERENCES employees(id)
-            )
-        """)
-        print("Farrowing records edit history table checked/created successfully")
-
-        # Create cow_breeding table
+    print("Cows table checked/created successfully")
+
+    # Create cow_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cow_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cow_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cow_id) REFERENCES cows(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Cow edit history table checked/created successfully")
+
+    # Create milk_production table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_production (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cow_id INT NOT NULL,
+            production_date DATE NOT NULL,
+            milking_session ENUM('morning', 'afternoon', 'evening') NOT NULL,
+            milk_quantity DECIMAL(10,2) NOT NULL,
+            fat_percentage DECIMAL(5,2),
+            protein_percentage DECIMAL(5,2),
+            milk_grade VARCHAR(50),
+            milk_quality_assessment ENUM('good_quality', 'moderate_quality', 'poor_quality') DEFAULT 'moderate_quality',
+            additional_notes TEXT,
+            recorded_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cow_id) REFERENCES cows(id),
+            FOREIGN KEY (recorded_by) REFERENCES employees(id)
+        )
+    """)
+    print("Milk production table checked/created successfully")
+
+    # Create milk_production_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_production_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            production_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (production_id) REFERENCES milk_production(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Milk production edit history table checked/created successfully")
+
+    # Create milk_sales_usage table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_sales_usage (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            transaction_type ENUM('sale', 'usage') NOT NULL,
+            transaction_date DATE NOT NULL,
+            buyer VARCHAR(255),
+            quantity_sold DECIMAL(10,2),
+            price_per_liter DECIMAL(10,2),
+            total_amount DECIMAL(10,2),
+            quantity_used DECIMAL(10,2),
+            purpose_of_use ENUM('calf_feeding', 'home_consumption', 'processing', 'wastage_spoiled'),
+            recorded_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (recorded_by) REFERENCES employees(id)
+        )
+    """)
+    print("Milk sales usage table checked/created successfully")
+
+    # Create slaughter_records_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS slaughter_records_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            record_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (record_id) REFERENCES slaughter_records(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Slaughter records edit history table checked/created successfully")
+
+    # Create death_records_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS death_records_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            record_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (record_id) REFERENCES dead_pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Death records edit history table checked/created successfully")
+
+    # Create sale_records_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sale_records_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            record_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (record_id) REFERENCES sale_records(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Sale records edit history table checked/created successfully")
+
+    # Create farrowing_records_edit_history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS farrowing_records_edit_history (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            record_id INT NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (record_id) REFERENCES farrowing_records(id) ON DELETE CASCADE,
+            FOREIGN KEY (edited_by) REFERENCES employees(id)
+        )
+    """)
+    print("Farrowing records edit history table checked/created successfully")
+
+    # Create cow_breeding table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cow_breeding (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            dam_id INT NOT NULL,
+            sire_id INT NOT NULL,
+            breeding_date DATE NOT NULL,
+            expected_calving_date DATE NOT NULL,
+            pregnancy_status ENUM('served', 'conceived', 'lactating', 'available') DEFAULT 'served',
+            conception_cancelled BOOLEAN DEFAULT FALSE,
+            cancellation_reason TEXT,
+            cancellation_date DATE,
+            birth_date DATE,
+            lactation_start_date DATE,
+            lactation_end_date DATE,
+            recorded_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (dam_id) REFERENCES cows(id),
+            FOREIGN KEY (sire_id) REFERENCES cows(id),
+            FOREIGN KEY (recorded_by) REFERENCES employees(id)
+        )
+    """)
+    print("Cow breeding table checked/created successfully")
+
+    # Check if calving_date column exists and rename it to birth_date
+    cursor.execute("""
+        SELECT COLUMN_NAME 
+        FROM INFORMATION_SCHEMA.COLUMNS 
+        WHERE TABLE_SCHEMA = DATABASE() 
+        AND TABLE_NAME = 'cow_breeding' 
+        AND COLUMN_NAME = 'calving_date'
+    """)
+    
+    if cursor.fetchone():
+        print("Renaming calving_date column to birth_date...")
+        cursor.execute("ALTER TABLE cow_breeding CHANGE COLUMN calving_date birth_date DATE")
+        print("Column renamed successfully")
+
+    # Create calves table
+    try:
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cow_breeding (
+            CREATE TABLE IF NOT EXISTS calves (
                 id INT AUTO_INCREMENT PRIMARY KEY,
+                calf_id VARCHAR(50) NOT NULL UNIQUE,
+                name VARCHAR(100),
+                breed VARCHAR(100) NOT NULL,
+                color_markings TEXT,
+                gender ENUM('male', 'female') NOT NULL,
+                birth_date DATE NOT NULL,
                 dam_id INT NOT NULL,
                 sire_id INT NOT NULL,
-                breeding_date DATE NOT NULL,
-                expected_calving_date DATE NOT NULL,
-                pregnancy_status ENUM('served', 'conceived', 'lactating', 'available') DEFAULT 'served',
-                conception_cancelled BOOLEAN DEFAULT FALSE,
-                cancellation_reason TEXT,
-                cancellation_date DATE,
-                birth_date DATE,
-                lactation_start_date DATE,
-                lactation_end_date DATE,
+                status ENUM('active', 'sold', 'deceased') DEFAULT 'active',
                 recorded_by INT NOT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 FOREIGN KEY (dam_id) REFERENCES cows(id),
                 FOREIGN KEY (sire_id) REFERENCES cows(id),
                 FOREIGN KEY (recorded_by) REFERENCES employees(id)
             )
         """)
-        print("Cow breeding table checked/created successfully")
-
-        # Check if calving_date column exists and rename it to birth_date
-        cursor.execute("""
-            SELECT COLUMN_NAME 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_SCHEMA = DATABASE() 
-            AND TABLE_NAME = 'cow_breeding' 
-            AND COLUMN_NAME = 'calving_date'
-        """)
+        print("Calves table checked/created successfully")
+    except Exception as e:
+        print(f"Error creating calves table: {e}")
+        raise e
+    
+    # Create weight_settings table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS weight_settings (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            setting_name VARCHAR(100) NOT NULL,
+            setting_value TEXT,
+            setting_type ENUM('text', 'number', 'boolean', 'json') DEFAULT 'text',
+            description TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES employees(id),
+            UNIQUE KEY unique_setting (setting_name)
+        )
+    """)
+    print("Weight settings table checked/created successfully")
+    
+    # Create weight_categories table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS weight_categories (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            start_age INT NOT NULL,
+            end_age INT NOT NULL,
+            category_name VARCHAR(100) NOT NULL,
+            min_weight DECIMAL(5,2) NOT NULL,
+            max_weight DECIMAL(5,2) NOT NULL,
+            daily_gain DECIMAL(4,2) NOT NULL,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES employees(id)
+        )
+    """)
+    print("Weight categories table checked/created successfully")
+    
+    # Create vaccination_schedule table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vaccination_schedule (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            day_number INT NOT NULL,
+            day_description VARCHAR(100),
+            reason TEXT NOT NULL,
+            medicine_activity TEXT NOT NULL,
+            dosage_amount VARCHAR(100),
+            interval_duration VARCHAR(100),
+            additional_notes TEXT,
+            medicine_image VARCHAR(255),
+            animal_image VARCHAR(255),
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES employees(id),
+            UNIQUE KEY unique_day (day_number)
+        )
+    """)
+    print("Vaccination schedule table checked/created successfully")
+    
+    # Create vaccination_records table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vaccination_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            animal_id INT NOT NULL,
+            animal_type ENUM('pig', 'litter', 'batch') NOT NULL,
+            schedule_id INT NOT NULL,
+            completed_date DATE NOT NULL,
+            completion_notes TEXT,
+            completed_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (schedule_id) REFERENCES vaccination_schedule(id),
+            FOREIGN KEY (completed_by) REFERENCES employees(id),
+            UNIQUE KEY unique_animal_schedule (animal_id, animal_type, schedule_id)
+        )
+    """)
+    print("Vaccination records table checked/created successfully")
+    
+    # Check if sample data exists, if not insert it
+    cursor.execute("SELECT COUNT(*) as count FROM employees")
+    employee_count = cursor.fetchone()['count']
+    
+    # Check if weight categories exist, if not insert sample data
+    cursor.execute("SELECT COUNT(*) as count FROM weight_categories")
+    category_count = cursor.fetchone()['count']
+    
+    if category_count == 0:
+        # Insert sample weight categories
+        sample_categories = [
+            (0, 30, 'Piglet', 1.0, 8.0, 0.2, 1),  # 0-30 days, 1-8kg, 0.2kg/day gain
+            (31, 60, 'Weaner', 8.0, 20.0, 0.3, 1),  # 31-60 days, 8-20kg, 0.3kg/day gain
+            (61, 120, 'Grower', 20.0, 50.0, 0.4, 1),  # 61-120 days, 20-50kg, 0.4kg/day gain
+            (121, 180, 'Finisher', 50.0, 90.0, 0.5, 1),  # 121-180 days, 50-90kg, 0.5kg/day gain
+            (181, 365, 'Breeder', 90.0, 150.0, 0.2, 1)  # 181-365 days, 90-150kg, 0.2kg/day gain
+        ]
         
-        if cursor.fetchone():
-            print("Renaming calving_date column to birth_date...")
-            cursor.execute("ALTER TABLE cow_breeding CHANGE COLUMN calving_date birth_date DATE")
-            print("Column renamed successfully")
-
-        # Create calves table
-        try:
+        for category in sample_categories:
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS calves (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    calf_id VARCHAR(50) NOT NULL UNIQUE,
-                    name VARCHAR(100),
-                    breed VARCHAR(100) NOT NULL,
-                    color_markings TEXT,
-                    gender ENUM('male', 'female') NOT NULL,
-                    birth_date DATE NOT NULL,
-                    dam_id INT NOT NULL,
-                    sire_id INT NOT NULL,
-                    status ENUM('active', 'sold', 'deceased') DEFAULT 'active',
-                    recorded_by INT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (dam_id) REFERENCES cows(id),
-                    FOREIGN KEY (sire_id) REFERENCES cows(id),
-                    FOREIGN KEY (recorded_by) REFERENCES employees(id)
-                )
-            """)
-            print("Calves table checked/created successfully")
-        except Exception as e:
-            print(f"Error creating calves table: {e}")
-            raise e
-        
-        # Create weight_settings table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS weight_settings (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                setting_name VARCHAR(100) NOT NULL,
-                setting_value TEXT,
-                setting_type ENUM('text', 'number', 'boolean', 'json') DEFAULT 'text',
-                description TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                UNIQUE KEY unique_setting (setting_name)
-            )
-        """)
-        print("Weight settings table checked/created successfully")
-        
-        # Create weight_categories table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS weight_categories (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                start_age INT NOT NULL,
-                end_age INT NOT NULL,
-                category_name VARCHAR(100) NOT NULL,
-                min_weight DECIMAL(5,2) NOT NULL,
-                max_weight DECIMAL(5,2) NOT NULL,
-                daily_gain DECIMAL(4,2) NOT NULL,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES employees(id)
-            )
-        """)
-        print("Weight categories table checked/created successfully")
-        
-        # Create vaccination_schedule table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vaccination_schedule (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                day_number INT NOT NULL,
-                day_description VARCHAR(100),
-                reason TEXT NOT NULL,
-                medicine_activity TEXT NOT NULL,
-                dosage_amount VARCHAR(100),
-                interval_duration VARCHAR(100),
-                additional_notes TEXT,
-                medicine_image VARCHAR(255),
-                animal_image VARCHAR(255),
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                UNIQUE KEY unique_day (day_number)
-            )
-        """)
-        print("Vaccination schedule table checked/created successfully")
-        
-        # Create vaccination_records table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vaccination_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                animal_id INT NOT NULL,
-                animal_type ENUM('pig', 'litter', 'batch') NOT NULL,
-                schedule_id INT NOT NULL,
-                completed_date DATE NOT NULL,
-                completion_notes TEXT,
-                completed_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (schedule_id) REFERENCES vaccination_schedule(id),
-                FOREIGN KEY (completed_by) REFERENCES employees(id),
-                UNIQUE KEY unique_animal_schedule (animal_id, animal_type, schedule_id)
-            )
-        """)
-        print("Vaccination records table checked/created successfully")
-        
-        # Check if sample data exists, if not insert it
-        cursor.execute("SELECT COUNT(*) as count FROM employees")
-        employee_count = cursor.fetchone()['count']
-        
-        # Check if weight categories exist, if not insert sample data
-        cursor.execute("SELECT COUNT(*) as count FROM weight_categories")
-        category_count = cursor.fetchone()['count']
-        
-        if category_count == 0:
-            # Insert sample weight categories
-            sample_categories = [
-                (0, 30, 'Piglet', 1.0, 8.0, 0.2, 1),  # 0-30 days, 1-8kg, 0.2kg/day gain
-                (31, 60, 'Weaner', 8.0, 20.0, 0.3, 1),  # 31-60 days, 8-20kg, 0.3kg/day gain
-                (61, 120, 'Grower', 20.0, 50.0, 0.4, 1),  # 61-120 days, 20-50kg, 0.4kg/day gain
-                (121, 180, 'Finisher', 50.0, 90.0, 0.5, 1),  # 121-180 days, 50-90kg, 0.5kg/day gain
-                (181, 365, 'Breeder', 90.0, 150.0, 0.2, 1)  # 181-365 days, 90-150kg, 0.2kg/day gain
-            ]
+                INSERT INTO weight_categories (start_age, end_age, category_name, min_weight, max_weight, daily_gain, created_by)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, category)
+        
+        print("Sample weight categories inserted successfully")
+    
+    if employee_count == 0:
+        try:
+            # Insert sample employee data with hashed passwords
+            admin_password = hash_password('admin123')
+            manager_password = hash_password('manager123')
+            employee_password = hash_password('employee123')
+            vet_password = hash_password('vet123')
+            it_password = hash_password('it123')
             
-            for category in sample_categories:
-                cursor.execute("""
-                    INSERT INTO weight_categories (start_age, end_age, category_name, min_weight, max_weight, daily_gain, created_by)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, category)
+            cursor.execute("""
+                INSERT INTO employees (full_name, email, phone, employee_code, password, role, status) VALUES
+                ('John Doe', 'john.doe@farm.com', '+254700000001', '123456', %s, 'administrator', 'active'),
+                ('Jane Smith', 'jane.smith@farm.com', '+254700000002', '234567', %s, 'manager', 'active'),
+                ('Bob Wilson', 'bob.wilson@farm.com', '+254700000003', '345678', %s, 'employee', 'active'),
+                ('Dr. Sarah Johnson', 'sarah.johnson@farm.com', '+254700000004', '456789', %s, 'vet', 'active'),
+                ('Mike Tech', 'mike.tech@farm.com', '+254700000005', '567890', %s, 'it', 'active')
+            """, (admin_password, manager_password, employee_password, vet_password, it_password))
+            print("Sample employee data inserted successfully")
+        except Exception as e:
+            print(f"Error inserting employees: {e}")
+            # Continue with the rest of the setup even if employees fail
+    
+    # Insert default weight categories if they don't exist
+    cursor.execute("SELECT COUNT(*) as count FROM weight_categories")
+    category_count = cursor.fetchone()['count']
+    
+    if category_count == 0:
+        try:
+            # First check if we have any employees, if not create a default one
+            cursor.execute("SELECT COUNT(*) as count FROM employees")
+            emp_count = cursor.fetchone()['count']
             
-            print("Sample weight categories inserted successfully")
-        
-        if employee_count == 0:
-            try:
-                # Insert sample employee data with hashed passwords
+            if emp_count == 0:
+                # Create a default admin user
                 admin_password = hash_password('admin123')
-                manager_password = hash_password('manager123')
-                employee_password = hash_password('employee123')
-                vet_password = hash_password('vet123')
-                it_password = hash_password('it123')
-                
                 cursor.execute("""
                     INSERT INTO employees (full_name, email, phone, employee_code, password, role, status) VALUES
-                    ('John Doe', 'john.doe@farm.com', '+254700000001', '123456', %s, 'administrator', 'active'),
-                    ('Jane Smith', 'jane.smith@farm.com', '+254700000002', '234567', %s, 'manager', 'active'),
-                    ('Bob Wilson', 'bob.wilson@farm.com', '+254700000003', '345678', %s, 'employee', 'active'),
-                    ('Dr. Sarah Johnson', 'sarah.johnson@farm.com', '+254700000004', '456789', %s, 'vet', 'active'),
-                    ('Mike Tech', 'mike.tech@farm.com', '+254700000005', '567890', %s, 'it', 'active')
-                """, (admin_password, manager_password, employee_password, vet_password, it_password))
-                print("Sample employee data inserted successfully")
-            except Exception as e:
-                print(f"Error inserting employees: {e}")
-                # Continue with the rest of the setup even if employees fail
-        
-        # Insert default weight categories if they don't exist
-        cursor.execute("SELECT COUNT(*) as count FROM weight_categories")
-        category_count = cursor.fetchone()['count']
-        
-        if category_count == 0:
-            try:
-                # First check if we have any employees, if not create a default one
-                cursor.execute("SELECT COUNT(*) as count FROM employees")
-                emp_count = cursor.fetchone()['count']
+                    ('System Admin', 'admin@farm.com', '+254700000000', '000000', %s, 'administrator', 'active')
+                """, (admin_password,))
+                print("Default admin user created")
+            
+            # Insert default weight categories
+            cursor.execute("""
+                INSERT INTO weight_categories (start_age, end_age, category_name, min_weight, max_weight, daily_gain, created_by) VALUES
+                (1, 7, 'Neonatal', 1.5, 2.0, 0.09, 1),
+                (8, 28, 'Pre-weaning', 2.2, 8.5, 0.31, 1),
+                (29, 56, 'Nursery', 9.1, 25.0, 0.59, 1),
+                (57, 84, 'Grower', 25.7, 45.0, 0.71, 1),
+                (85, 140, 'Finisher', 45.7, 85.0, 0.71, 1),
+                (141, 180, 'Late Finisher', 85.5, 110.0, 0.63, 1)
+            """)
+            print("Default weight categories inserted successfully")
+        except Exception as e:
+            print(f"Error inserting weight categories: {e}")
+            # Continue with the rest of the setup
+    
+    # Insert default weight settings if they don't exist
+    cursor.execute("SELECT COUNT(*) as count FROM weight_settings")
+    settings_count = cursor.fetchone()['count']
+    
+    if settings_count == 0:
+        try:
+            # Insert default weight settings
+            cursor.execute("""
+                INSERT INTO weight_settings (setting_name, setting_value, setting_type, description, created_by) VALUES
+                ('weight_unit', 'kg', 'text', 'Default weight unit for tracking', 1),
+                ('weighing_frequency', 'weekly', 'text', 'How often pigs should be weighed', 1),
+                ('alert_threshold', '10', 'number', 'Weight change threshold for alerts (%)', 1),
+                ('auto_calculate', 'true', 'boolean', 'Automatically calculate growth rates', 1),
+                ('weight_loss_alerts', 'true', 'boolean', 'Send alerts for weight loss', 1),
+                ('data_export', 'false', 'boolean', 'Enable automatic data export', 1)
+            """)
+            print("Default weight settings inserted successfully")
+        except Exception as e:
+            print(f"Error inserting weight settings: {e}")
+            # Continue with the rest of the setup
+    
+    # Insert vaccination schedule sample data if it doesn't exist
+    cursor.execute("SELECT COUNT(*) as count FROM vaccination_schedule")
+    vaccination_count = cursor.fetchone()['count']
+    
+    if vaccination_count == 0:
+        try:
+            # Get the first employee ID to use as created_by
+            cursor.execute("SELECT id FROM employees ORDER BY id ASC LIMIT 1")
+            employee = cursor.fetchone()
+            if employee:
+                created_by_id = employee['id']
+                
+                # Insert sample vaccination schedule data
+                sample_vaccinations = [
+                    (0, 'Birth', 'Prevent anemia, boost immunity. Iron deficiency is common in piglets and can lead to poor growth and development.', 'Iron injection; ensure colostrum intake. Administer 200mg iron dextran injection intramuscularly.', '200mg', 'Single dose', 'Critical for piglet survival. Monitor for injection site reactions.', created_by_id),
+                    (3, 'Early development', 'Early disease protection. Young piglets are highly susceptible to respiratory diseases.', 'Mycoplasma hyopneumoniae (optional), PCV2 (some products). Administer according to farm-specific protocols.', '2ml', 'Single dose or as per protocol', 'Optional based on farm disease history and veterinary recommendation.', created_by_id),
+                    (14, '2 weeks', 'Build early immunity. This is the optimal time to establish immunity against common pig diseases.', 'PCV2 (circovirus) - 1st dose; Mycoplasma - 1st dose. Administer 2ml intramuscularly in the neck region.', '2ml', 'First of two doses', 'Ensure piglets are healthy before vaccination. Monitor for any adverse reactions.', created_by_id),
+                    (21, '3 weeks', 'Boost immunity at weaning. Weaning is a stressful period that can compromise immunity.', 'PRRS (if farm affected), Erysipelas (optional start). Administer according to farm PRRS status.', '2ml', 'As per farm protocol', 'PRRS vaccination depends on farm status. Consult with veterinarian for specific recommendations.', created_by_id),
+                    (28, '4 weeks', 'Reinforce protection. Booster vaccinations ensure adequate immunity levels are maintained.', 'Booster: PCV2, Mycoplasma. Second dose of PCV2 and Mycoplasma vaccines to ensure complete immunity.', '2ml', 'Booster dose', 'Complete the vaccination series started at 2 weeks of age.', created_by_id),
+                    (35, '5 weeks', 'Respiratory & gut disease prevention. Growing pigs are susceptible to respiratory and gastrointestinal diseases.', 'Swine influenza, Salmonella, Glässer\'s disease (risk-based). Administer based on farm disease history.', '2ml', 'Single dose or as needed', 'Risk-based vaccination. Consider farm history and seasonal disease patterns.', created_by_id),
+                    (56, '8 weeks', 'Maintain health as pigs grow. Continued protection against diseases that can affect growing pigs.', 'Erysipelas booster, influenza booster (if needed). Administer 2ml intramuscularly in the neck region.', '2ml', 'Booster doses', 'Monitor for any signs of disease before vaccination.', created_by_id),
+                    (90, '12 weeks', 'Grower stage - finishers. Protection during the finishing phase to ensure optimal growth.', 'Optional boosters (farm dependent). Administer based on farm-specific protocols and disease pressure.', '2ml', 'As needed', 'Farm-dependent vaccination. Consult with veterinarian for specific recommendations.', created_by_id),
+                    (150, '5 months', 'Slaughter age - keep pigs healthy. Final protection before slaughter to ensure food safety.', 'Optional: Erysipelas / Salmonella booster (if outbreaks). Administer only if disease outbreaks occur.', '2ml', 'Emergency vaccination', 'Only if disease outbreaks occur. Consult with veterinarian immediately.', created_by_id),
+                    (180, '6 months (Breeding)', 'Protect fertility & reproduction. Breeding animals require specific vaccinations.', 'Parvovirus, Leptospira, Erysipelas (before mating). Administer 2-4 weeks before breeding.', '2ml', 'Pre-breeding vaccination', 'Critical for reproductive health. Ensure vaccination before first breeding.', created_by_id),
+                    (240, 'Pregnancy (3-5 weeks before farrowing)', 'Protect piglets via colostrum. Maternal vaccination provides passive immunity to piglets.', 'Vaccinate against E. coli, Clostridium perfringens, Rotavirus. Administer 3-5 weeks before expected farrowing.', '2ml', 'Pre-farrowing vaccination', 'Critical for piglet survival. Ensure adequate time for immunity development before farrowing.', created_by_id)
+                ]
                 
-                if emp_count == 0:
-                    # Create a default admin user
-                    admin_password = hash_password('admin123')
+                for vaccination in sample_vaccinations:
                     cursor.execute("""
-                        INSERT INTO employees (full_name, email, phone, employee_code, password, role, status) VALUES
-                        ('System Admin', 'admin@farm.com', '+254700000000', '000000', %s, 'administrator', 'active')
-                    """, (admin_password,))
-                    print("Default admin user created")
+                        INSERT INTO vaccination_schedule (day_number, day_description, reason, medicine_activity, dosage_amount, interval_duration, additional_notes, created_by)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """, vaccination)
                 
-                # Insert default weight categories
-                cursor.execute("""
-                    INSERT INTO weight_categories (start_age, end_age, category_name, min_weight, max_weight, daily_gain, created_by) VALUES
-                    (1, 7, 'Neonatal', 1.5, 2.0, 0.09, 1),
-                    (8, 28, 'Pre-weaning', 2.2, 8.5, 0.31, 1),
-                    (29, 56, 'Nursery', 9.1, 25.0, 0.59, 1),
-                    (57, 84, 'Grower', 25.7, 45.0, 0.71, 1),
-                    (85, 140, 'Finisher', 45.7, 85.0, 0.71, 1),
-                    (141, 180, 'Late Finisher', 85.5, 110.0, 0.63, 1)
-                """)
-                print("Default weight categories inserted successfully")
-            except Exception as e:
-                print(f"Error inserting weight categories: {e}")
-                # Continue with the rest of the setup
-        
-        # Insert default weight settings if they don't exist
-        cursor.execute("SELECT COUNT(*) as count FROM weight_settings")
-        settings_count = cursor.fetchone()['count']
-        
-        if settings_count == 0:
-            try:
-                # Insert default weight settings
-                cursor.execute("""
-                    INSERT INTO weight_settings (setting_name, setting_value, setting_type, description, created_by) VALUES
-                    ('weight_unit', 'kg', 'text', 'Default weight unit for tracking', 1),
-                    ('weighing_frequency', 'weekly', 'text', 'How often pigs should be weighed', 1),
-                    ('alert_threshold', '10', 'number', 'Weight change threshold for alerts (%)', 1),
-                    ('auto_calculate', 'true', 'boolean', 'Automatically calculate growth rates', 1),
-                    ('weight_loss_alerts', 'true', 'boolean', 'Send alerts for weight loss', 1),
-                    ('data_export', 'false', 'boolean', 'Enable automatic data export', 1)
-                """)
-                print("Default weight settings inserted successfully")
-            except Exception as e:
-                print(f"Error inserting weight settings: {e}")
-                # Continue with the rest of the setup
+                print("Sample vaccination schedule data inserted successfully")
+            else:
+                print("No employees found, skipping vaccination schedule sample data")
+        except Exception as e:
+            print(f"Error inserting vaccination schedule: {e}")
+            # Continue with the rest of the setup
+    
+    # Create indexes for better performance
+    try:
+        cursor.execute("CREATE INDEX idx_employees_code ON employees(employee_code)")
+        cursor.execute("CREATE INDEX idx_employees_email ON employees(email)")
+        cursor.execute("CREATE INDEX idx_employees_status ON employees(status)")
+        cursor.execute("CREATE INDEX idx_employees_role ON employees(role)")
+        cursor.execute("CREATE INDEX idx_activity_log_date ON activity_log(created_at)")
+        print("Database indexes created successfully")
+    except Exception as e:
+        # Indexes might already exist, that's okay
+        pass
+
+def migrate_chicken_and_production_tables(cursor):
+    """Migration 2: chicken module and cow milk tables (previously created inside request handlers)"""
+    # Create chickens table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chickens (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            chicken_id VARCHAR(20) UNIQUE NOT NULL,
+            batch_name VARCHAR(100) NOT NULL,
+            chicken_type ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
+            breed_name VARCHAR(100) NOT NULL,
+            gender ENUM('male', 'female') NOT NULL,
+            hatch_date DATE NOT NULL,
+            age_days INT NOT NULL,
+            source VARCHAR(100) NOT NULL,
+            coop_number INT NOT NULL,
+            quantity INT NOT NULL DEFAULT 1,
+            current_status ENUM('active', 'sold', 'dead', 'culled') DEFAULT 'active',
+            registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_by INT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_chicken_id (chicken_id),
+            INDEX idx_chicken_type (chicken_type),
+            INDEX idx_batch_name (batch_name),
+            INDEX idx_coop_number (coop_number),
+            INDEX idx_current_status (current_status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chickens table checked/created successfully")
+    
+    # Create chicken_stages table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_stages (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
+            stage_name VARCHAR(100) NOT NULL,
+            start_day INT NOT NULL,
+            end_day INT NOT NULL,
+            description TEXT,
+            created_by INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_category (category),
+            INDEX idx_stage_name (stage_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken stages table checked/created successfully")
+    
+    # Create chicken_medications table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_medications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
+            medication_name VARCHAR(200) NOT NULL,
+            start_day INT NOT NULL,
+            end_day INT NOT NULL,
+            purpose TEXT,
+            image_filename VARCHAR(255),
+            created_by INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_category (category),
+            INDEX idx_medication_name (medication_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken medications table checked/created successfully")
+    
+    # Create chicken_weight_standards table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_weight_standards (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
+            age_days INT NOT NULL,
+            expected_weight DECIMAL(6,3) NOT NULL COMMENT 'Weight in kilograms',
+            description TEXT,
+            created_by INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_category (category),
+            INDEX idx_age_days (age_days),
+            UNIQUE KEY unique_category_age (category, age_days)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken weight standards table checked/created successfully")
+    
+    # Create chicken_medication_tracking table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_medication_tracking (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            chicken_id VARCHAR(20) NOT NULL,
+            medication_id INT NOT NULL,
+            scheduled_date DATE NOT NULL,
+            completed_date DATE NULL,
+            status ENUM('pending', 'completed', 'missed') DEFAULT 'pending',
+            notes TEXT,
+            administered_by INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_chicken_id (chicken_id),
+            INDEX idx_medication_id (medication_id),
+            INDEX idx_status (status),
+            INDEX idx_scheduled_date (scheduled_date),
+            FOREIGN KEY (medication_id) REFERENCES chicken_medications(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken medication tracking table checked/created successfully")
+    
+    # Create chicken_weight_tracking table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_weight_tracking (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            chicken_id VARCHAR(50) NOT NULL,
+            weight_standard_id INT NOT NULL,
+            actual_weight DECIMAL(6,3) NOT NULL,
+            expected_weight DECIMAL(6,3) NOT NULL,
+            weight_percentage DECIMAL(5,2) NOT NULL,
+            weight_category ENUM('healthy', 'underweight', 'overweight') NOT NULL,
+            checked_by INT NOT NULL,
+            checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_chicken_id (chicken_id),
+            INDEX idx_weight_standard_id (weight_standard_id),
+            INDEX idx_checked_at (checked_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken weight tracking table checked/created successfully")
+    
+    # Create chicken_production table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_production (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            production_type ENUM('eggs', 'meat') NOT NULL,
+            chicken_id VARCHAR(50) NOT NULL,
+            chicken_category VARCHAR(20) NOT NULL,
+            production_date DATE NOT NULL,
+            production_time TIME NOT NULL,
+            quantity INT NOT NULL,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_by INT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_chicken_id (chicken_id),
+            INDEX idx_production_date (production_date),
+            INDEX idx_production_type (production_type)
+        )
+    """)
+    print("Chicken production table checked/created successfully")
+    
+    # Older installs created chicken_production without these columns
+    for column_name, column_definition in [
+        ('created_by', 'INT'),
+        ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    ]:
+        cursor.execute("SHOW COLUMNS FROM chicken_production LIKE %s", (column_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"ALTER TABLE chicken_production ADD COLUMN {column_name} {column_definition}")
+            print(f"Added {column_name} column to chicken_production table")
+    
+    # Create chicken_meat_production table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_meat_production (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            production_id INT NOT NULL,
+            chicken_number INT NOT NULL,
+            alive_weight DECIMAL(10,3) NOT NULL,
+            dead_weight DECIMAL(10,3) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (production_id) REFERENCES chicken_production(id) ON DELETE CASCADE,
+            INDEX idx_production_id (production_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Chicken meat production table checked/created successfully")
+    
+    # Create chicken_production_audit table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chicken_production_audit (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            production_id INT NOT NULL,
+            chicken_id VARCHAR(50) NOT NULL,
+            production_type ENUM('eggs', 'meat') NOT NULL,
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            edited_by INT NOT NULL,
+            edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_production_id (production_id),
+            INDEX idx_chicken_id (chicken_id),
+            INDEX idx_edited_at (edited_at)
+        )
+    """)
+    print("Chicken production audit table checked/created successfully")
+    
+    # Create cow_milk_production table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cow_milk_production (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cow_id INT NOT NULL,
+            production_date DATE NOT NULL,
+            milking_session ENUM('morning', 'afternoon', 'evening') NOT NULL,
+            milk_quantity DECIMAL(5,2) NOT NULL,
+            notes TEXT,
+            recorded_by INT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (cow_id) REFERENCES cows(id),
+            FOREIGN KEY (recorded_by) REFERENCES employees(id),
+            INDEX idx_cow_id (cow_id),
+            INDEX idx_production_date (production_date),
+            INDEX idx_milking_session (milking_session)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Cow milk production table checked/created successfully")
+
+def migrate_scheduled_job_runs(cursor):
+    """Migration 3: bookkeeping table for background scheduled jobs"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scheduled_job_runs (
+            job_name VARCHAR(50) PRIMARY KEY,
+            last_run_at DATETIME NULL,
+            last_duration_ms INT NULL,
+            last_rows_affected INT NULL,
+            last_error TEXT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Scheduled job runs table checked/created successfully")
+
+def migrate_table_versions(cursor):
+    """Migration 4: change counters used to invalidate in-process caches"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name VARCHAR(64) PRIMARY KEY,
+            version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Table versions table checked/created successfully")
+
+def migrate_milk_daily_rollups(cursor):
+    """Migration 5: daily milk rollups read by the milk analytics endpoints"""
+    # Per cow per day production summary
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_daily_cow_rollup (
+            cow_id INT NOT NULL,
+            production_date DATE NOT NULL,
+            record_count INT NOT NULL DEFAULT 0,
+            total_quantity DECIMAL(12,2) NOT NULL DEFAULT 0,
+            max_quantity DECIMAL(10,2) NOT NULL DEFAULT 0,
+            fat_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            fat_count INT NOT NULL DEFAULT 0,
+            protein_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            protein_count INT NOT NULL DEFAULT 0,
+            composition_count INT NOT NULL DEFAULT 0,
+            composition_fat_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            composition_protein_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            good_quality_count INT NOT NULL DEFAULT 0,
+            moderate_quality_count INT NOT NULL DEFAULT 0,
+            poor_quality_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (cow_id, production_date),
+            INDEX idx_production_date (production_date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Milk daily cow rollup table checked/created successfully")
+    
+    # Farm-wide per day production, usage and sales summary
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_daily_rollup (
+            rollup_date DATE PRIMARY KEY,
+            record_count INT NOT NULL DEFAULT 0,
+            total_quantity DECIMAL(12,2) NOT NULL DEFAULT 0,
+            max_quantity DECIMAL(10,2) NOT NULL DEFAULT 0,
+            composition_count INT NOT NULL DEFAULT 0,
+            composition_fat_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            composition_protein_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+            good_quality_count INT NOT NULL DEFAULT 0,
+            moderate_quality_count INT NOT NULL DEFAULT 0,
+            poor_quality_count INT NOT NULL DEFAULT 0,
+            sales_count INT NOT NULL DEFAULT 0,
+            quantity_sold DECIMAL(12,2) NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            price_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+            price_count INT NOT NULL DEFAULT 0,
+            calf_feeding_used DECIMAL(12,2) NOT NULL DEFAULT 0,
+            home_consumption_used DECIMAL(12,2) NOT NULL DEFAULT 0,
+            processing_used DECIMAL(12,2) NOT NULL DEFAULT 0,
+            wastage_spoiled_used DECIMAL(12,2) NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Milk daily rollup table checked/created successfully")
+    
+    # Per buyer per day sales summary ('' stands for sales without a buyer)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS milk_daily_buyer_rollup (
+            transaction_date DATE NOT NULL,
+            buyer VARCHAR(255) NOT NULL DEFAULT '',
+            sales_count INT NOT NULL DEFAULT 0,
+            quantity_sold DECIMAL(12,2) NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (transaction_date, buyer)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Milk daily buyer rollup table checked/created successfully")
+    
+    # Rollup refreshes look raw rows up by cow and day / by day
+    for table_name, index_name, columns in [
+        ('milk_production', 'idx_cow_production_date', 'cow_id, production_date'),
+        ('milk_production', 'idx_production_date', 'production_date'),
+        ('milk_sales_usage', 'idx_transaction_date', 'transaction_date')
+    ]:
+        cursor.execute(f"SHOW INDEX FROM {table_name} WHERE Key_name = %s", (index_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"CREATE INDEX {index_name} ON {table_name} ({columns})")
+    
+    rebuild_milk_rollups(cursor)
+
+def migrate_pig_list_indexes(cursor):
+    """Migration 6: composite indexes behind the keyset-paginated pig list"""
+    # InnoDB appends the primary key to secondary indexes, so (..., created_at)
+    # also serves the (created_at, id) keyset order
+    for index_name, columns in [
+        ('idx_pigs_status_created', 'status, created_at'),
+        ('idx_pigs_status_farm_created', 'status, farm_id, created_at'),
+        ('idx_pigs_status_type_created', 'status, pig_type, created_at'),
+        ('idx_pigs_status_breeding_created', 'status, breeding_status, created_at')
+    ]:
+        cursor.execute("SHOW INDEX FROM pigs WHERE Key_name = %s", (index_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"CREATE INDEX {index_name} ON pigs ({columns})")
+    print("Pig list indexes checked/created successfully")
+
+def migrate_activity_log_entities(cursor):
+    """Migration 7: typed entity references on activity_log for index-backed audit trails"""
+    for column_name, definition in [
+        ('entity_type', 'VARCHAR(30) NULL'),
+        ('entity_id', 'VARCHAR(50) NULL')
+    ]:
+        cursor.execute("SHOW COLUMNS FROM activity_log LIKE %s", (column_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"ALTER TABLE activity_log ADD COLUMN {column_name} {definition}")
+    
+    # Audit trails read one entity's rows newest first; existing rows are
+    # attributed later by the activity_log_entities job
+    cursor.execute("SHOW INDEX FROM activity_log WHERE Key_name = 'idx_activity_log_entity'")
+    if not cursor.fetchone():
+        cursor.execute("CREATE INDEX idx_activity_log_entity ON activity_log (entity_type, entity_id, created_at)")
+    print("Activity log entity columns checked/created successfully")
+
+def migrate_id_sequences(cursor):
+    """Migration 8: counters behind pig tag, litter ID and cow ear tag allocation"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS id_sequences (
+            sequence_name VARCHAR(30) PRIMARY KEY,
+            last_value BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    for name in ID_SEQUENCES:
+        seed_id_sequence(cursor, name)
+    print("ID sequences table checked/created successfully")
+
+def migrate_chicken_hatch_date_index(cursor):
+    """Migration 9: chicken ages are derived from hatch_date, so index it for age-bucket ranges"""
+    # CURDATE() is not allowed in generated columns, so age stays a query-time
+    # DATEDIFF and age buckets become hatch_date ranges on this index
+    cursor.execute("SHOW INDEX FROM chickens WHERE Key_name = 'idx_chickens_status_type_hatch'")
+    if not cursor.fetchone():
+        cursor.execute("CREATE INDEX idx_chickens_status_type_hatch ON chickens (current_status, chicken_type, hatch_date)")
+    print("Chicken hatch date index checked/created successfully")
+
+def migrate_latest_weight(cursor):
+    """Migration 10: latest actual weight per animal and per litter for weight analytics"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS latest_weight (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            animal_id INT NULL,
+            litter_id INT NULL,
+            weight_record_id INT NOT NULL,
+            weight DECIMAL(8,2) NOT NULL,
+            expected_weight DECIMAL(8,2) NULL,
+            weighing_date DATE NOT NULL,
+            expected_record_id INT NULL,
+            expected_record_weight DECIMAL(8,2) NULL,
+            expected_record_expected_weight DECIMAL(8,2) NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_animal (animal_id),
+            UNIQUE KEY unique_litter (litter_id),
+            INDEX idx_weighing_date (weighing_date),
+            FOREIGN KEY (animal_id) REFERENCES pigs(id) ON DELETE CASCADE,
+            FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    print("Latest weight table checked/created successfully")
+    
+    # Refreshes read one animal's or litter's records newest first
+    for index_name, columns in [
+        ('idx_animal_weighing_date', 'animal_id, weighing_date'),
+        ('idx_litter_weighing_date', 'litter_id, weighing_date')
+    ]:
+        cursor.execute("SHOW INDEX FROM weight_records WHERE Key_name = %s", (index_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"CREATE INDEX {index_name} ON weight_records ({columns})")
+    
+    rebuild_latest_weights(cursor)
+
+def migrate_latest_expected_weight(cursor):
+    """Migration 11: latest record with an expected weight, for farm performance"""
+    # The newest weighing may have no expected weight, so performance keeps
+    # its own pointer to the newest one that does
+    for column_name, definition in [
+        ('expected_record_id', 'INT NULL'),
+        ('expected_record_weight', 'DECIMAL(8,2) NULL'),
+        ('expected_record_expected_weight', 'DECIMAL(8,2) NULL')
+    ]:
+        cursor.execute("SHOW COLUMNS FROM latest_weight LIKE %s", (column_name,))
+        if not cursor.fetchone():
+            cursor.execute(f"ALTER TABLE latest_weight ADD COLUMN {column_name} {definition}")
+    rebuild_latest_weights(cursor)
+    print("Latest weight expected record columns checked/created successfully")
+
+def migrate_boar_breeding_activity(cursor):
+    """Migration 12: breeding registrations in the boar's audit trail too"""
+    # Breeding registrations used to be logged against the sow only; give each
+    # one a copy attributed to its boar, as new registrations now get
+    cursor.execute("""
+        INSERT INTO activity_log (employee_id, action, description, table_name, record_id,
+                                  entity_type, entity_id, created_at)
+        SELECT al.employee_id, al.action, al.description, al.table_name, al.record_id,
+               'pig', CAST(p.id AS CHAR), al.created_at
+        FROM activity_log al
+        JOIN pigs p ON p.tag_id = SUBSTRING_INDEX(al.description, ' with Boar ', -1)
+        WHERE al.action = 'BREEDING_REGISTRATION'
+    """)
+    print(f"Boar breeding activity copied ({cursor.rowcount} entries)")
+
+# Ordered schema migrations: (version, description, function(cursor)).
+# Append new migrations at the end; never edit or renumber one that has shipped.
+MIGRATIONS = [
+    (1, 'Core schema', migrate_core_schema),
+    (2, 'Chicken module and cow milk tables', migrate_chicken_and_production_tables),
+    (3, 'Scheduled job bookkeeping', migrate_scheduled_job_runs),
+    (4, 'Cache invalidation table versions', migrate_table_versions),
+    (5, 'Daily milk analytics rollups', migrate_milk_daily_rollups),
+    (6, 'Pig list composite indexes', migrate_pig_list_indexes),
+    (7, 'Activity log entity references', migrate_activity_log_entities),
+    (8, 'ID allocation sequences', migrate_id_sequences),
+    (9, 'Chicken hatch date index', migrate_chicken_hatch_date_index),
+    (10, 'Latest weight per animal and litter', migrate_latest_weight),
+    (11, 'Latest weight record with an expected weight', migrate_latest_expected_weight),
+    (12, 'Breeding activity attributed to boars', migrate_boar_breeding_activity)
+]
+
+def get_schema_version(cursor):
+    """Return the highest applied migration version (0 for a fresh database)"""
+    cursor.execute("SELECT COALESCE(MAX(version), 0) as version FROM schema_version")
+    return cursor.fetchone()['version']
+
+def run_migrations():
+    """Create the database if needed and apply pending migrations in order"""
+    try:
+        # First, connect without specifying database
+        conn = get_db_connection_no_db()
+        cursor = conn.cursor()
         
-        # Insert vaccination schedule sample data if it doesn't exist
-        cursor.execute("SELECT COUNT(*) as count FROM vaccination_schedule")
-        vaccination_count = cursor.fetchone()['count']
+        # Create database if it doesn't exist
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+        cursor.execute(f"USE {DB_CONFIG['database']}")
         
-        if vaccination_count == 0:
-            try:
-                # Get the first employee ID to use as created_by
-                cursor.execute("SELECT id FROM employees ORDER BY id ASC LIMIT 1")
-                employee = cursor.fetchone()
-                if employee:
-                    created_by_id = employee['id']
-                    
-                    # Insert sample vaccination schedule data
-                    sample_vaccinations = [
-                        (0, 'Birth', 'Prevent anemia, boost immunity. Iron deficiency is common in piglets and can lead to poor growth and development.', 'Iron injection; ensure colostrum intake. Administer 200mg iron dextran injection intramuscularly.', '200mg', 'Single dose', 'Critical for piglet survival. Monitor for injection site reactions.', created_by_id),
-                        (3, 'Early development', 'Early disease protection. Young piglets are highly susceptible to respiratory diseases.', 'Mycoplasma hyopneumoniae (optional), PCV2 (some products). Administer according to farm-specific protocols.', '2ml', 'Single dose or as per protocol', 'Optional based on farm disease history and veterinary recommendation.', created_by_id),
-                        (14, '2 weeks', 'Build early immunity. This is the optimal time to establish immunity against common pig diseases.', 'PCV2 (circovirus) - 1st dose; Mycoplasma - 1st dose. Administer 2ml intramuscularly in the neck region.', '2ml', 'First of two doses', 'Ensure piglets are healthy before vaccination. Monitor for any adverse reactions.', created_by_id),
-                        (21, '3 weeks', 'Boost immunity at weaning. Weaning is a stressful period that can compromise immunity.', 'PRRS (if farm affected), Erysipelas (optional start). Administer according to farm PRRS status.', '2ml', 'As per farm protocol', 'PRRS vaccination depends on farm status. Consult with veterinarian for specific recommendations.', created_by_id),
-                        (28, '4 weeks', 'Reinforce protection. Booster vaccinations ensure adequate immunity levels are maintained.', 'Booster: PCV2, Mycoplasma. Second dose of PCV2 and Mycoplasma vaccines to ensure complete immunity.', '2ml', 'Booster dose', 'Complete the vaccination series started at 2 weeks of age.', created_by_id),
-                        (35, '5 weeks', 'Respiratory & gut disease prevention. Growing pigs are susceptible to respiratory and gastrointestinal diseases.', 'Swine influenza, Salmonella, Glässer\'s disease (risk-based). Administer based on farm disease history.', '2ml', 'Single dose or as needed', 'Risk-based vaccination. Consider farm history and seasonal disease patterns.', created_by_id),
-                        (56, '8 weeks', 'Maintain health as pigs grow. Continued protection against diseases that can affect growing pigs.', 'Erysipelas booster, influenza booster (if needed). Administer 2ml intramuscularly in the neck region.', '2ml', 'Booster doses', 'Monitor for any signs of disease before vaccination.', created_by_id),
-                        (90, '12 weeks', 'Grower stage - finishers. Protection during the finishing phase to ensure optimal growth.', 'Optional boosters (farm dependent). Administer based on farm-specific protocols and disease pressure.', '2ml', 'As needed', 'Farm-dependent vaccination. Consult with veterinarian for specific recommendations.', created_by_id),
-                        (150, '5 months', 'Slaughter age - keep pigs healthy. Final protection before slaughter to ensure food safety.', 'Optional: Erysipelas / Salmonella booster (if outbreaks). Administer only if disease outbreaks occur.', '2ml', 'Emergency vaccination', 'Only if disease outbreaks occur. Consult with veterinarian immediately.', created_by_id),
-                        (180, '6 months (Breeding)', 'Protect fertility & reproduction. Breeding animals require specific vaccinations.', 'Parvovirus, Leptospira, Erysipelas (before mating). Administer 2-4 weeks before breeding.', '2ml', 'Pre-breeding vaccination', 'Critical for reproductive health. Ensure vaccination before first breeding.', created_by_id),
-                        (240, 'Pregnancy (3-5 weeks before farrowing)', 'Protect piglets via colostrum. Maternal vaccination provides passive immunity to piglets.', 'Vaccinate against E. coli, Clostridium perfringens, Rotavirus. Administer 3-5 weeks before expected farrowing.', '2ml', 'Pre-farrowing vaccination', 'Critical for piglet survival. Ensure adequate time for immunity development before farrowing.', created_by_id)
-                    ]
-                    
-                    for vaccination in sample_vaccinations:
-                        cursor.execute("""
-                            INSERT INTO vaccination_schedule (day_number, day_description, reason, medicine_activity, dosage_amount, interval_duration, additional_notes, created_by)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """, vaccination)
-                    
-                    print("Sample vaccination schedule data inserted successfully")
-                else:
-                    print("No employees found, skipping vaccination schedule sample data")
-            except Exception as e:
-                print(f"Error inserting vaccination schedule: {e}")
-                # Continue with the rest of the setup
+        # Serialize concurrent runs (e.g. several workers deploying at once)
+        cursor.execute("SELECT GET_LOCK('schema_migrations', 60) as locked")
+        if not cursor.fetchone()['locked']:
+            print("❌ Could not acquire schema migration lock")
+            cursor.close()
+            conn.close()
+            return False
         
-        # Create indexes for better performance
         try:
-            cursor.execute("CREATE INDEX idx_employees_code ON employees(employee_code)")
-            cursor.execute("CREATE INDEX idx_employees_email ON employees(email)")
-            cursor.execute("CREATE INDEX idx_employees_status ON employees(status)")
-            cursor.execute("CREATE INDEX idx_employees_role ON employees(role)")
-            cursor.execute("CREATE INDEX idx_activity_log_date ON activity_log(created_at)")
-            print("Database indexes created successfully")
-        except Exception as e:
-            # Indexes might already exist, that's okay
-            pass
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INT PRIMARY KEY,
+                    description VARCHAR(255) NOT NULL,
+                    duration_ms INT,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            current_version = get_schema_version(cursor)
+            pending = [m for m in MIGRATIONS if m[0] > current_version]
+            if not pending:
+                print(f"Database schema is up to date (version {current_version})")
+            
+            # Tables reference each other in both directions, so create them without FK checks
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for version, description, migration in pending:
+                print(f"Applying migration {version}: {description}...")
+                started = time.perf_counter()
+                migration(cursor)
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                cursor.execute("""
+                    INSERT INTO schema_version (version, description, duration_ms)
+                    VALUES (%s, %s, %s)
+                """, (version, description, duration_ms))
+                conn.commit()
+                print(f"✅ Migration {version} applied in {duration_ms} ms")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('schema_migrations')")
         
-        conn.commit()
         cursor.close()
         conn.close()
         
@@ -1213,74 +2091,546 @@ def create_database_and_tables():
         print(f"❌ Error setting up database: {str(e)}")
         return False
 
-def log_activity(employee_id, action, description, table_name=None, record_id=None):
-    """Log employee activity"""
-    try:
-        conn = get_db_connection()
+def create_database_and_tables():
+    """Create database and tables if they don't exist"""
+    return run_migrations()
+
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending database schema migrations."""
+    if not run_migrations():
+        raise SystemExit(1)
+
+def bump_table_version(cursor, *table_names):
+    """Record that tables changed so every worker drops caches built from them"""
+    for table_name in table_names:
+        cursor.execute("""
+            INSERT INTO table_versions (table_name, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (table_name,))
+
+def get_table_versions(cursor, *table_names):
+    """Return the current change counter of each table (0 if never changed)"""
+    placeholders = ', '.join(['%s'] * len(table_names))
+    cursor.execute(f"SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})", table_names)
+    versions = {row['table_name']: row['version'] for row in cursor.fetchall()}
+    return tuple(versions.get(table_name, 0) for table_name in table_names)
+
+def invalidates(*table_names):
+    """Bump table versions after the decorated write route runs.
+    
+    Bumping on failed writes too only costs a cache rebuild, so the version
+    is bumped whatever the route returned. This worker's caches built from
+    those tables are dropped as well.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                try:
+                    with get_db_connection() as conn:
+                        cursor = conn.cursor()
+                        bump_table_version(cursor, *table_names)
+                        conn.commit()
+                        cursor.close()
+                except Exception as e:
+                    print(f"Error bumping table versions {table_names}: {e}")
+                # Caches read through get_recent() would not see the bump yet
+                for cache in VERSIONED_CACHES.values():
+                    if set(cache.tables) & set(table_names):
+                        cache.invalidate()
+        return wrapper
+    return decorator
+
+# In-process caches by name, for monitoring
+VERSIONED_CACHES = {}
+
+class VersionedCache:
+    """Per-worker cache of one derived value.
+    
+    The value is reused while the table_versions counters of its source
+    tables are unchanged and (if a TTL is set) it is younger than
+    ttl_seconds. Every lookup costs one primary-key read of table_versions,
+    which is what lets a write in one worker invalidate all the others.
+    Caches with a check_interval can also be read through get_recent(),
+    which skips that read for check_interval seconds after the last one.
+    """
+
+    def __init__(self, name, tables, ttl_seconds=None, check_interval=None):
+        self.name = name
+        self.tables = tuple(tables)
+        self.ttl_seconds = ttl_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._value = None
+        self._versions = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'builds': 0, 'last_build_ms': None}
+        VERSIONED_CACHES[name] = self
+
+    def get(self, cursor, build):
+        """Return the cached value, calling build(cursor) when it is stale"""
+        versions = get_table_versions(cursor, *self.tables)
+        with self._lock:
+            fresh = self._versions == versions and (
+                self.ttl_seconds is None or time.monotonic() - self._built_at < self.ttl_seconds
+            )
+            if self._value is not None and fresh:
+                self.stats['hits'] += 1
+                self._checked_at = time.monotonic()
+                return self._value
+            self.stats['misses'] += 1
+        
+        started = time.perf_counter()
+        value = build(cursor)
+        with self._lock:
+            self._value = value
+            self._versions = versions
+            self._built_at = self._checked_at = time.monotonic()
+            self.stats['builds'] += 1
+            self.stats['last_build_ms'] = int((time.perf_counter() - started) * 1000)
+        return value
+
+    def get_recent(self):
+        """Return the cached value if it was checked within check_interval, else None"""
+        if self.check_interval is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            if self._value is None or now - self._checked_at >= self.check_interval:
+                return None
+            if self.ttl_seconds is not None and now - self._built_at >= self.ttl_seconds:
+                return None
+            self.stats['hits'] += 1
+            return self._value
+    
+    def invalidate(self):
+        """Drop this worker's copy; other workers notice via table_versions"""
+        with self._lock:
+            self._value = None
+            self._versions = None
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else None,
+                'age_seconds': round(time.monotonic() - self._built_at, 1) if self._value is not None else None,
+                'ttl_seconds': self.ttl_seconds,
+                'check_interval': self.check_interval,
+                'tables': list(self.tables),
+                'pid': os.getpid()
+            }
+
+# Audit log write-behind queue settings
+AUDIT_LOG_CONFIG = {
+    'async': os.environ.get('AUDIT_LOG_ASYNC', '1') == '1',  # Queue rows for a background writer
+    'max_queue_size': int(os.environ.get('AUDIT_LOG_QUEUE_SIZE', 1000)),  # Beyond this, callers write synchronously
+    'batch_size': int(os.environ.get('AUDIT_LOG_BATCH_SIZE', 100)),  # Rows per multi-row INSERT
+    'flush_seconds': float(os.environ.get('AUDIT_LOG_FLUSH_SECONDS', 1.0))  # Max wait before a partial batch is written
+}
+
+# What activity_log.entity_id refers to for each entity_type. entity_id is a
+# string so chickens can be referenced by their chicken_id code.
+# '' marks rows the backfill could not attribute to any entity.
+ACTIVITY_ENTITY_TYPES = {
+    'employee': 'employees.id',
+    'farm': 'farms.id',
+    'pig': 'pigs.id',
+    'litter': 'litters.id',
+    'breeding': 'breeding_records.id',
+    'farrowing': 'farrowing_records.id',
+    'farrowing_activity': 'farrowing_activities.id',
+    'cow': 'cows.id',
+    'chicken': 'chickens.chicken_id',
+    'milk_transaction': 'milk_sales_usage.id',
+    'slaughter_record': 'slaughter_records.id',
+    'death_record': 'dead_pigs.id',
+    'sale_record': 'sale_records.id',
+    'vaccination_schedule': 'vaccination_schedule.id'
+}
+
+AUDIT_LOG_INSERT = """
+    INSERT INTO activity_log (employee_id, action, description, table_name, record_id,
+                              entity_type, entity_id, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+def write_activity_rows(rows):
+    """Insert activity_log rows in one round trip (executemany batches the VALUES).
+    
+    Always on a pooled connection of its own, never the request's shared
+    one, so an audit write can't commit a transaction the route left open.
+    """
+    with get_db_pool().acquire() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO activity_log (employee_id, action, description, table_name, record_id)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (employee_id, action, description, table_name, record_id))
-        # No need to commit since autocommit is enabled
+        cursor.executemany(AUDIT_LOG_INSERT, rows)
+        conn.commit()
         cursor.close()
-        conn.close()
+
+class AuditLogQueue:
+    """Bounded per-worker queue of activity_log rows drained by a writer thread.
+    
+    Rows carry their own created_at, so batching does not shift audit
+    times. When the queue is full the caller writes its row synchronously
+    instead of waiting; rows are only dropped if that write fails too.
+    """
+
+    def __init__(self, max_size, batch_size, flush_seconds):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._writer_pid = None
+        self.stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'sync_fallbacks': 0, 'dropped': 0}
+
+    def _ensure_writer(self):
+        # Started lazily so each forked worker gets its own thread
+        if self._writer_pid == os.getpid():
+            return
+        with self._lock:
+            if self._writer_pid != os.getpid():
+                self._writer_pid = os.getpid()
+                threading.Thread(target=self._run, name='audit-log-writer', daemon=True).start()
+
+    def put(self, row):
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(row)
+            with self._lock:
+                self.stats['enqueued'] += 1
+        except queue.Full:
+            with self._lock:
+                self.stats['sync_fallbacks'] += 1
+            self._write([row])
+
+    def _take_batch(self, timeout):
+        """Block up to timeout for one row, then take whatever else is queued"""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows):
+        try:
+            write_activity_rows(rows)
+            with self._lock:
+                self.stats['written'] += len(rows)
+                self.stats['batches'] += 1
+        except Exception as e:
+            with self._lock:
+                self.stats['dropped'] += len(rows)
+            print(f"Error logging activity ({len(rows)} rows dropped): {e}")
+
+    def _run(self):
+        while True:
+            batch = self._take_batch(self.flush_seconds)
+            if batch:
+                self._write(batch)
+
+    def flush(self):
+        """Write everything still queued (called at interpreter shutdown)"""
+        while True:
+            batch = self._take_batch(0)
+            if not batch:
+                return
+            self._write(batch)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'queue_depth': self._queue.qsize(), 'queue_capacity': self._queue.maxsize}
+
+audit_log_queue = AuditLogQueue(AUDIT_LOG_CONFIG['max_queue_size'], AUDIT_LOG_CONFIG['batch_size'],
+                                AUDIT_LOG_CONFIG['flush_seconds'])
+atexit.register(audit_log_queue.flush)
+
+def log_activity(employee_id, action, description, table_name=None, record_id=None,
+                 entity_type=None, entity_id=None):
+    """Log employee activity against the entity it concerns (see ACTIVITY_ENTITY_TYPES)"""
+    if entity_id is not None:
+        entity_id = str(entity_id)
+    row = (employee_id, action, description, table_name, record_id, entity_type, entity_id, datetime.now())
+    try:
+        if AUDIT_LOG_CONFIG['async']:
+            audit_log_queue.put(row)
+        else:
+            write_activity_rows([row])
     except Exception as e:
         print(f"Error logging activity: {e}")
         # Don't raise the error to prevent breaking the main functionality
 
-def update_pig_ages(cursor):
-    """Update pig ages and breeding status based on current date"""
-    try:
-        # Get all pigs with birth dates
-        cursor.execute("""
-            SELECT id, birth_date, pig_type, purpose, breeding_status 
-            FROM pigs 
-            WHERE birth_date IS NOT NULL AND status = 'active'
-        """)
-        pigs = cursor.fetchall()
-        
-        updated_count = 0
-        breeding_status_updates = 0
-        
-        for pig in pigs:
+# Background job scheduler settings
+SCHEDULER_CONFIG = {
+    'enabled': os.environ.get('SCHEDULER_ENABLED', '1') == '1',  # Run jobs in a thread inside each worker
+    'poll_seconds': int(os.environ.get('SCHEDULER_POLL_SECONDS', 300))  # How often the thread looks for due jobs
+}
+
+# Registered jobs: name -> {'func': function(cursor) returning rows affected, 'interval': seconds,
+#                           'tables': tables whose version is bumped when the job changed rows}
+SCHEDULED_JOBS = {}
+
+def scheduled_job(name, interval, tables=()):
+    """Register a time-driven status transition to be run by the scheduler"""
+    def decorator(func):
+        SCHEDULED_JOBS[name] = {'func': func, 'interval': interval, 'tables': tables}
+        return func
+    return decorator
+
+def run_scheduled_jobs(force=False, only=None):
+    """Run every registered job that is due and record its last run.
+    
+    A MySQL named lock per job keeps workers from running the same job at
+    once, and scheduled_job_runs.last_run_at keeps them from re-running it
+    before its interval has passed.
+    """
+    results = {}
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for name, job in SCHEDULED_JOBS.items():
+            if only and name not in only:
+                continue
+            cursor.execute("SELECT GET_LOCK(%s, 0) as locked", (f'job:{name}',))
+            if not cursor.fetchone()['locked']:
+                continue  # Another worker is running it right now
             try:
-                # Calculate current age
-                birth_dt = pig['birth_date']
-                # Convert to date if it's datetime
-                if isinstance(birth_dt, datetime):
-                    birth_dt = birth_dt.date()
-                current_age = (datetime.now().date() - birth_dt).days
-                
-                # Update age
-                cursor.execute("UPDATE pigs SET age_days = %s WHERE id = %s", (current_age, pig['id']))
-                
-                # Update breeding status for grown pigs with breeding purpose
-                if pig['pig_type'] == 'grown_pig' and pig['purpose'] == 'breeding':
-                    new_breeding_status = 'available' if current_age >= 200 else 'young'
-                    
-                    # Only update if status changed
-                    if pig['breeding_status'] != new_breeding_status:
-                        cursor.execute("""
-                            UPDATE pigs 
-                            SET breeding_status = %s 
-                            WHERE id = %s
-                        """, (new_breeding_status, pig['id']))
-                        breeding_status_updates += 1
+                if not force:
+                    cursor.execute("""
+                        SELECT job_name FROM scheduled_job_runs 
+                        WHERE job_name = %s AND last_run_at > NOW() - INTERVAL %s SECOND
+                    """, (name, job['interval']))
+                    if cursor.fetchone():
+                        continue
                 
-                updated_count += 1
+                started = time.perf_counter()
+                rows_affected = None
+                error = None
+                try:
+                    rows_affected = job['func'](cursor)
+                    if rows_affected and job['tables']:
+                        bump_table_version(cursor, *job['tables'])
+                except Exception as e:
+                    error = str(e)
+                    print(f"❌ Scheduled job {name} failed: {e}")
+                duration_ms = int((time.perf_counter() - started) * 1000)
                 
-            except Exception as pig_error:
-                print(f"Error updating pig {pig.get('id', 'unknown')}: {pig_error}")
-                continue  # Continue with next pig instead of failing completely
-        
-        print(f"Updated ages for {updated_count} pigs, {breeding_status_updates} breeding status changes")
-        return updated_count
-        
-    except Exception as e:
-        print(f"Error updating pig ages: {e}")
-        # Don't raise the error to prevent breaking login
-        return 0
+                cursor.execute("""
+                    INSERT INTO scheduled_job_runs (job_name, last_run_at, last_duration_ms, last_rows_affected, last_error)
+                    VALUES (%s, NOW(), %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE 
+                        last_run_at = VALUES(last_run_at),
+                        last_duration_ms = VALUES(last_duration_ms),
+                        last_rows_affected = VALUES(last_rows_affected),
+                        last_error = VALUES(last_error)
+                """, (name, duration_ms, rows_affected, error))
+                results[name] = {'rows_affected': rows_affected, 'duration_ms': duration_ms, 'error': error}
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (f'job:{name}',))
+        cursor.close()
+    return results
+
+_scheduler_pid = None
+_scheduler_lock = threading.Lock()
+
+def _scheduler_loop():
+    while True:
+        try:
+            run_scheduled_jobs()
+        except Exception as e:
+            print(f"Error running scheduled jobs: {e}")
+        time.sleep(SCHEDULER_CONFIG['poll_seconds'])
+
+def start_scheduler():
+    """Start the scheduler thread once per worker process"""
+    global _scheduler_pid
+    if not SCHEDULER_CONFIG['enabled'] or _scheduler_pid == os.getpid():
+        return
+    with _scheduler_lock:
+        if _scheduler_pid != os.getpid():
+            _scheduler_pid = os.getpid()
+            threading.Thread(target=_scheduler_loop, name='job-scheduler', daemon=True).start()
+
+@app.before_request
+def ensure_scheduler_started():
+    start_scheduler()
+
+@app.cli.command('run-jobs')
+@click.option('--force', is_flag=True, help='Run jobs even if their interval has not passed.')
+@click.option('--job', 'jobs', multiple=True, help='Only run the named job (repeatable).')
+def run_jobs_command(force, jobs):
+    """Run due scheduled jobs once (for cron or manual use)."""
+    results = run_scheduled_jobs(force=force, only=set(jobs) or None)
+    for name, result in results.items():
+        status = f"failed: {result['error']}" if result['error'] else f"{result['rows_affected']} rows"
+        print(f"{name}: {status} in {result['duration_ms']} ms")
+
+# How to attribute activity_log rows written before entity columns existed:
+# action -> [(entity_type, source, lookup)]. source is a regex whose first group
+# is captured from the description, or an activity_log column name; lookup
+# (a key of ACTIVITY_ENTITY_LOOKUPS) maps the captured value to the entity id.
+ACTIVITY_ENTITY_RULES = {
+    'LOGIN': [('employee', 'employee_id', None)],
+    'LOGOUT': [('employee', 'employee_id', None)],
+    'SIGNUP': [('employee', 'employee_id', None)],
+    'EMPLOYEE_APPROVAL': [('employee', re.compile(r'^Employee (\d+) '), None)],
+    'STATUS_UPDATE': [('employee', re.compile(r'^Employee (\d+) '), None)],
+    'EMPLOYEE_UPDATE': [('employee', re.compile(r'^Employee (\d+) '), None)],
+    'PERMISSION_UPDATE': [('employee', re.compile(r'^Employee (\d+) '), None)],
+    'FINANCE_UPDATE': [('employee', re.compile(r'^Employee (\d+) '), None)],
+    'FARM_REGISTRATION': [('farm', re.compile(r'^New farm "(.+)" registered at '), 'farm_name')],
+    'PIG_REGISTRATION': [('pig', re.compile(r' with tag (\S+) at farm '), 'pig_tag')],
+    'PIG_STATUS_CHANGE': [('pig', re.compile(r'^Changed pig (\S+) status '), 'pig_tag')],
+    'PIG_UPDATE': [('pig', re.compile(r'^Updated pig (\S+) with '), 'pig_tag')],
+    'PIG_DELETED': [('pig', re.compile(r'\(ID: (\d+)\)'), None)],
+    'LITTER_REGISTRATION': [('litter', re.compile(r'^Registered litter (\S+) with '), 'litter_code')],
+    'LITTER_POSTPONED': [('farrowing', re.compile(r'farrowing record (\d+)\.'), None)],
+    'LITTER_WEANED': [('litter', re.compile(r'^Marked litter (\S+) as weaned'), 'litter_code')],
+    'LITTER_WEANED_AUTO': [('litter', re.compile(r'^Litter (\S+) automatically'), 'litter_code')],
+    'BREEDING_REGISTRATION': [('pig', re.compile(r'Sow (\S+) with Boar '), 'pig_tag')],
+    'BREEDING_CANCELLATION': [('pig', re.compile(r'Sow (\S+) - Reason'), 'pig_tag')],
+    'BREEDING_EDIT': [('breeding', re.compile(r'^Breeding record (\d+) updated'), None)],
+    'BREEDING_DELETE': [('pig', re.compile(r' deleted for sow (\S+)$'), 'pig_tag')],
+    'BREEDING_CYCLE_COMPLETED': [('pig', re.compile(r' for sow (\S+?)\. Ready'), 'pig_tag')],
+    'FARROWING_ACTIVITY_COMPLETED': [('farrowing_activity', re.compile(r'activity ID (\d+) '), None)],
+    'FARROWING_EDIT': [('farrowing', re.compile(r'^Farrowing record (\d+) updated'), None)],
+    'FARROWING_DELETE': [('pig', re.compile(r' deleted for sow (\S+)$'), 'pig_tag')],
+    'RECOVERY_PERIOD_STARTED': [('farrowing', re.compile(r' for farrowing (\d+),'), None)],
+    'COW_REGISTRATION': [('cow', re.compile(r' ear tag (\S+)$'), 'cow_ear_tag')],
+    'COW_EDIT': [('cow', re.compile(r' ear tag (\S+) - '), 'cow_ear_tag')],
+    'COW_MILK_PRODUCTION': [('cow', re.compile(r' for cow (\d+)$'), None)],
+    'MILK_PRODUCTION': [('cow', re.compile(r' for cow (\d+)$'), None)],
+    'MILK_PRODUCTION_EDIT': [('cow', re.compile(r'^Milk production record (\d+) updated'), 'milk_production')],
+    'COW_BREEDING': [('cow', re.compile(r'Dam (\d+) x Sire '), None)],
+    'COW_BREEDING_CANCEL': [('cow', re.compile(r'breeding record (\d+)$'), 'cow_breeding')],
+    'LACTATION_ENDED': [('cow', re.compile(r'breeding ID (\d+)$'), 'cow_breeding')],
+    'COW_CALVING': [('cow', re.compile(r' born to (\S+)$'), 'cow_ear_tag')],
+    'CHICKEN_PRODUCTION': [('chicken', re.compile(r' for chicken (\S+)$'), None)],
+    'CHICKEN_REGISTRATION': [('chicken', re.compile(r'^Chicken registered: (\d+) - '), 'chicken_row')],
+    'SLAUGHTER_RECORD': [('pig', re.compile(r': Pig (\d+) - '), None), ('litter', re.compile(r': Litter (\d+) - '), None)],
+    'SLAUGHTER_RECORD_EDIT': [('slaughter_record', re.compile(r'^Slaughter record (\d+) '), None)],
+    'SLAUGHTER_RECORD_DELETE': [('slaughter_record', re.compile(r'^Slaughter record (\d+) '), None)],
+    'DEATH_RECORD': [('pig', re.compile(r': Pig (\d+) - '), None), ('litter', re.compile(r': Litter (\d+) - '), None)],
+    'DEATH_RECORD_EDIT': [('death_record', re.compile(r'^Death record (\d+) '), None)],
+    'DEATH_RECORD_DELETE': [('death_record', re.compile(r'^Death record (\d+) '), None)],
+    'SALE_RECORD': [('pig', re.compile(r': Pig (\d+) - '), None), ('litter', re.compile(r': Litter (\d+) - '), None)],
+    'SALE_RECORD_EDIT': [('sale_record', re.compile(r'^Sale record (\d+) '), None)],
+    'SALE_RECORD_DELETE': [('sale_record', re.compile(r'^Sale record (\d+) '), None)],
+    'CREATE': [('vaccination_schedule', 'record_id', None)],
+    'UPDATE': [('vaccination_schedule', 'record_id', None)],
+    'DELETE': [('vaccination_schedule', 'record_id', None)],
+    'Marked vaccination as completed': [
+        ('pig', re.compile(r' for (?:pig|batch) ID (\d+)$'), None),
+        ('litter', re.compile(r' for litter ID (\d+)$'), None)
+    ]
+}
+
+# Lookup name -> query mapping captured keys (entity_key) to entity ids (id)
+ACTIVITY_ENTITY_LOOKUPS = {
+    'farm_name': "SELECT farm_name AS entity_key, id FROM farms WHERE farm_name IN ({})",
+    'pig_tag': "SELECT tag_id AS entity_key, id FROM pigs WHERE tag_id IN ({})",
+    'litter_code': "SELECT litter_id AS entity_key, id FROM litters WHERE litter_id IN ({})",
+    'cow_ear_tag': "SELECT ear_tag AS entity_key, id FROM cows WHERE ear_tag IN ({})",
+    'cow_breeding': "SELECT id AS entity_key, dam_id AS id FROM cow_breeding WHERE id IN ({})",
+    'milk_production': "SELECT id AS entity_key, cow_id AS id FROM milk_production WHERE id IN ({})",
+    'chicken_row': "SELECT id AS entity_key, chicken_id AS id FROM chickens WHERE id IN ({})"
+}
+
+ACTIVITY_BACKFILL_BATCH_SIZE = 1000
+
+def attribute_activity_rows(cursor, rows):
+    """Return (entity_type, entity_id, activity id) for each row, '' where no rule matches"""
+    matches = {}
+    keys_by_lookup = {}
+    for row in rows:
+        for entity_type, source, lookup in ACTIVITY_ENTITY_RULES.get(row['action'], []):
+            if isinstance(source, str):
+                key = row[source]
+            else:
+                match = source.search(row['description'] or '')
+                key = match.group(1) if match else None
+            if key is not None:
+                matches[row['id']] = (entity_type, str(key), lookup)
+                if lookup:
+                    keys_by_lookup.setdefault(lookup, set()).add(str(key))
+                break
+    
+    resolved = {}
+    for lookup, keys in keys_by_lookup.items():
+        keys = list(keys)
+        placeholders = ', '.join(['%s'] * len(keys))
+        cursor.execute(ACTIVITY_ENTITY_LOOKUPS[lookup].format(placeholders), keys)
+        resolved[lookup] = {str(item['entity_key']): str(item['id']) for item in cursor.fetchall() if item['id'] is not None}
+    
+    updates = []
+    for row in rows:
+        entity_type, key, lookup = matches.get(row['id'], ('', None, None))
+        entity_id = resolved.get(lookup, {}).get(key) if lookup else key
+        updates.append((entity_type if entity_id is not None else '', entity_id, row['id']))
+    return updates
+
+@scheduled_job('activity_log_entities', interval=600)
+def backfill_activity_log_entities(cursor):
+    """Attribute activity_log rows that predate the entity columns to their entity"""
+    updated = 0
+    while True:
+        cursor.execute("""
+            SELECT id, employee_id, action, description, record_id
+            FROM activity_log
+            WHERE entity_type IS NULL
+            ORDER BY id
+            LIMIT %s
+        """, (ACTIVITY_BACKFILL_BATCH_SIZE,))
+        rows = cursor.fetchall()
+        if not rows:
+            return updated
+        
+        cursor.executemany("""
+            UPDATE activity_log SET entity_type = %s, entity_id = %s WHERE id = %s
+        """, attribute_activity_rows(cursor, rows))
+        updated += len(rows)
+
+# Grown breeding pigs become available for breeding at this age
+PIG_BREEDING_AGE_DAYS = 200
+
+@scheduled_job('pig_ages', interval=3600, tables=('pigs',))
+def update_pig_ages(cursor):
+    """Update pig ages and breeding eligibility based on current date.
+    
+    Runs as two set-based UPDATEs so the cost no longer grows with one round
+    trip per pig, and only rows whose derived values changed are touched.
+    Only 'young'/'available' breeding pigs are re-derived; served, pregnant
+    and farrowed sows keep their status. Errors propagate so the scheduler
+    records them in scheduled_job_runs.last_error.
+    """
+    cursor.execute("""
+        UPDATE pigs 
+        SET age_days = DATEDIFF(CURDATE(), birth_date)
+        WHERE birth_date IS NOT NULL AND status = 'active'
+        AND (age_days IS NULL OR age_days <> DATEDIFF(CURDATE(), birth_date))
+    """)
+    updated_count = cursor.rowcount
+    
+    cursor.execute("""
+        UPDATE pigs 
+        SET breeding_status = IF(DATEDIFF(CURDATE(), birth_date) >= %s, 'available', 'young')
+        WHERE birth_date IS NOT NULL AND status = 'active'
+        AND pig_type = 'grown_pig' AND purpose = 'breeding'
+        AND breeding_status IN ('young', 'available')
+        AND breeding_status <> IF(DATEDIFF(CURDATE(), birth_date) >= %s, 'available', 'young')
+    """, (PIG_BREEDING_AGE_DAYS, PIG_BREEDING_AGE_DAYS))
+    breeding_status_updates = cursor.rowcount
+    
+    print(f"Updated ages for {updated_count} pigs, {breeding_status_updates} breeding status changes")
+    return updated_count
 
 def get_role_dashboard_url(role):
     """Get the appropriate dashboard URL based on employee role"""
@@ -1319,69 +2669,23 @@ def contact():
 
 @app.route('/fix-db-schema')
 def fix_database_schema():
-    """Fix database schema issues"""
-    try:
+    """Fix database schema issues by applying any pending migrations"""
+    if run_migrations():
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Make animal_id nullable in weight_records
-        cursor.execute("ALTER TABLE weight_records MODIFY COLUMN animal_id INT NULL")
-        print("Made animal_id nullable in weight_records table")
-        
-        # Add litter_id column if it doesn't exist
-        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'litter_id'")
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE weight_records ADD COLUMN litter_id INT NULL AFTER animal_id")
-            cursor.execute("ALTER TABLE weight_records ADD FOREIGN KEY (litter_id) REFERENCES litters(id) ON DELETE CASCADE")
-            print("Added litter_id column to weight_records table")
-        
-        # Add expected weight and weight type columns
-        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'expected_weight'")
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE weight_records ADD COLUMN expected_weight DECIMAL(8,2) NULL AFTER weight")
-            print("Added expected_weight column to weight_records table")
-        
-        cursor.execute("SHOW COLUMNS FROM weight_records LIKE 'weight_type'")
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE weight_records ADD COLUMN weight_type ENUM('actual', 'expected') DEFAULT 'actual' AFTER expected_weight")
-            print("Added weight_type column to weight_records table")
-        
-        # Check if weight categories exist, if not insert sample data
-        cursor.execute("SELECT COUNT(*) as count FROM weight_categories")
-        category_count = cursor.fetchone()['count']
-        
-        if category_count == 0:
-            # Insert sample weight categories
-            sample_categories = [
-                (0, 30, 'Piglet', 1.0, 8.0, 0.2, 1),  # 0-30 days, 1-8kg, 0.2kg/day gain
-                (31, 60, 'Weaner', 8.0, 20.0, 0.3, 1),  # 31-60 days, 8-20kg, 0.3kg/day gain
-                (61, 120, 'Grower', 20.0, 50.0, 0.4, 1),  # 61-120 days, 20-50kg, 0.4kg/day gain
-                (121, 180, 'Finisher', 50.0, 90.0, 0.5, 1),  # 121-180 days, 50-90kg, 0.5kg/day gain
-                (181, 365, 'Breeder', 90.0, 150.0, 0.2, 1)  # 181-365 days, 90-150kg, 0.2kg/day gain
-            ]
-            
-            for category in sample_categories:
-                cursor.execute("""
-                    INSERT INTO weight_categories (start_age, end_age, category_name, min_weight, max_weight, daily_gain, created_by)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, category)
-            
-            print("Sample weight categories inserted successfully")
-        
-        conn.commit()
+        schema_version = get_schema_version(cursor)
         cursor.close()
         conn.close()
-        
         return jsonify({
             'success': True,
-            'message': 'Database schema fixed successfully'
+            'message': 'Database schema fixed successfully',
+            'schema_version': schema_version
         })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Error fixing database schema: {str(e)}'
-        }), 500
+    
+    return jsonify({
+        'success': False,
+        'message': 'Error fixing database schema, check the server log for details'
+    }), 500
 
 @app.route('/test-db')
 def test_database():
@@ -1391,16 +2695,15 @@ def test_database():
         conn_no_db = get_db_connection_no_db()
         conn_no_db.close()
         
-        # Test connection with database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Test a simple query
-        cursor.execute("SELECT 1 as test")
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        # Test connection with database (checked out from the pool)
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Test a simple query
+            cursor.execute("SELECT 1 as test")
+            result = cursor.fetchone()
+            
+            cursor.close()
         
         # Determine environment
         environment = "LOCAL" if is_localhost() else "PRODUCTION"
@@ -1415,7 +2718,8 @@ def test_database():
                 'database': DB_CONFIG['database'],
                 'charset': DB_CONFIG['charset']
             },
-            'test_result': result
+            'test_result': result,
+            'pool': get_db_pool().get_stats()
         })
         
     except Exception as e:
@@ -1435,6 +2739,66 @@ def test_database():
             'error': str(e)
         }), 500
 
+@app.route('/api/system/scheduled-jobs', methods=['GET'])
+def get_scheduled_jobs_status():
+    """Get the last run time, duration and outcome of each background job"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM scheduled_job_runs")
+        runs = {row['job_name']: row for row in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+        
+        jobs = []
+        for name, job in SCHEDULED_JOBS.items():
+            run = runs.get(name, {})
+            jobs.append({
+                'job_name': name,
+                'interval_seconds': job['interval'],
+                'last_run_at': run.get('last_run_at'),
+                'last_duration_ms': run.get('last_duration_ms'),
+                'last_rows_affected': run.get('last_rows_affected'),
+                'last_error': run.get('last_error')
+            })
+        
+        return jsonify({
+            'success': True,
+            'scheduler_enabled': SCHEDULER_CONFIG['enabled'],
+            'jobs': jobs
+        })
+        
+    except Exception as e:
+        print(f"Error getting scheduled job status: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get scheduled job status: {str(e)}'})
+
+@app.route('/api/system/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Get hit rate and freshness of this worker's in-process caches"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    return jsonify({
+        'success': True,
+        'caches': {name: cache.get_stats() for name, cache in VERSIONED_CACHES.items()}
+    })
+
+@app.route('/api/system/audit-log-queue', methods=['GET'])
+def get_audit_log_queue_stats():
+    """Get queue depth, throughput and drop counts of this worker's audit log writer"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    return jsonify({
+        'success': True,
+        'async': AUDIT_LOG_CONFIG['async'],
+        'pid': os.getpid(),
+        'queue': audit_log_queue.get_stats()
+    })
+
 @app.route('/employee/login')
 def employee_login():
     return render_template('employee_login.html')
@@ -1587,6 +2951,128 @@ def employee_chicken_register_page():
     
     return render_template('employee_chicken_register.html', user=user_data)
 
+# Admin dashboard counters, cached per worker; writes to these tables bump their version
+DASHBOARD_CACHE_CONFIG = {
+    'ttl_seconds': int(os.environ.get('DASHBOARD_CACHE_TTL', 300)),  # Bounds staleness of date-relative counters
+    'tables': ('pigs', 'cows', 'litters', 'milk_production', 'breeding_records', 'cow_breeding')
+}
+
+def build_dashboard_snapshot(cursor):
+    """Compute the admin dashboard counters (one scan per source table)"""
+    # Pigs data
+    cursor.execute("""
+        SELECT 
+            COUNT(*) as total_pigs,
+            SUM(CASE WHEN pig_type = 'grown_pig' AND gender = 'female' AND breeding_status IN ('available', 'served', 'pregnant') THEN 1 ELSE 0 END) as breeding_sows,
+            SUM(CASE WHEN pig_type = 'piglet' THEN 1 ELSE 0 END) as piglets,
+            SUM(CASE WHEN pig_type = 'litter' THEN 1 ELSE 0 END) as litters
+        FROM pigs 
+        WHERE status = 'active'
+    """)
+    pigs_data = cursor.fetchone()
+    
+    # Litter data (piglets from litters)
+    cursor.execute("""
+        SELECT 
+            SUM(total_piglets) as total_piglets_from_litters,
+            SUM(alive_piglets) as alive_piglets_from_litters,
+            COUNT(*) as total_litters
+        FROM litters 
+        WHERE status IN ('unweaned', 'weaned')
+    """)
+    litter_data = cursor.fetchone()
+    
+    # Cows data
+    cursor.execute("""
+        SELECT 
+            COUNT(*) as total_cows,
+            SUM(CASE WHEN gender = 'female' THEN 1 ELSE 0 END) as female_cows,
+            SUM(CASE WHEN gender = 'male' THEN 1 ELSE 0 END) as male_cows
+        FROM cows 
+        WHERE status = 'active'
+    """)
+    cows_data = cursor.fetchone()
+    
+    # Milk production data (average daily production) from the per-cow daily rollup
+    cursor.execute("""
+        SELECT 
+            AVG(total_quantity) as avg_daily_milk_production,
+            COUNT(DISTINCT cow_id) as cows_milked,
+            AVG(total_quantity / record_count) as avg_milk_per_cow
+        FROM milk_daily_cow_rollup 
+        WHERE production_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+    """)
+    milk_data = cursor.fetchone()
+    
+    # Due-soon breeding counts for both species in one round trip
+    cursor.execute("""
+        SELECT 
+            (SELECT COUNT(*)
+             FROM pigs p
+             JOIN breeding_records br ON p.id = br.sow_id
+             WHERE p.status = 'active' 
+             AND p.breeding_status = 'pregnant'
+             AND br.expected_due_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 3 DAY)) as pigs_due,
+            (SELECT COUNT(*)
+             FROM cows c
+             JOIN cow_breeding cb ON c.id = cb.dam_id
+             WHERE c.status = 'active' 
+             AND c.gender = 'female'
+             AND cb.expected_calving_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 3 DAY)) as cows_due
+    """)
+    due_data = cursor.fetchone()
+    
+    # Upcoming activities (notifications from different departments); the Health and
+    # Medical rows are placeholders that reuse the active herd counts above
+    total_pigs = pigs_data['total_pigs'] or 0
+    total_cows = cows_data['total_cows'] or 0
+    upcoming_activities = [
+        {'department': 'Breeding', 'animal_type': 'Cows', 'notification_count': due_data['cows_due'],
+         'description': f"Pregnant cows due in 3 days: {due_data['cows_due']}"},
+        {'department': 'Breeding', 'animal_type': 'Pigs', 'notification_count': due_data['pigs_due'],
+         'description': f"Pregnant pigs due in 3 days: {due_data['pigs_due']}"},
+        {'department': 'Health', 'animal_type': 'Cows', 'notification_count': total_cows,
+         'description': 'Health notifications for cows'},
+        {'department': 'Health', 'animal_type': 'Pigs', 'notification_count': total_pigs,
+         'description': 'Health notifications for pigs'},
+        {'department': 'Medical', 'animal_type': 'Chickens', 'notification_count': 0,
+         'description': 'Medical notifications for chickens (Coming Soon)'},
+        {'department': 'Medical', 'animal_type': 'Cows', 'notification_count': total_cows,
+         'description': 'Medical notifications for cows'},
+        {'department': 'Medical', 'animal_type': 'Pigs', 'notification_count': total_pigs,
+         'description': 'Medical notifications for pigs'}
+    ]
+    
+    # Calculate totals
+    total_animals = total_pigs + total_cows
+    total_piglets = (pigs_data['piglets'] or 0) + (litter_data['alive_piglets_from_litters'] or 0)  # piglets + alive piglets from litters
+    
+    return {
+        'pigs': {
+            'total_pigs': total_pigs,
+            'breeding_sows': pigs_data['breeding_sows'] or 0,
+            'piglets': total_piglets,
+            'litters': pigs_data['litters'] or 0
+        },
+        'cows': {
+            'total_cows': total_cows,
+            'female_cows': cows_data['female_cows'] or 0,
+            'male_cows': cows_data['male_cows'] or 0,
+            'avg_daily_milk_production': milk_data['avg_daily_milk_production'] or 0,
+            'cows_milked': milk_data['cows_milked'] or 0,
+            'avg_milk_per_cow': milk_data['avg_milk_per_cow'] or 0
+        },
+        'totals': {
+            'total_animals': total_animals,
+            'daily_production': milk_data['avg_daily_milk_production'] or 0,  # average daily milk production
+            'system_health': 95  # This could be calculated based on various factors
+        },
+        'upcoming_activities': upcoming_activities
+    }
+
+dashboard_snapshot_cache = VersionedCache('admin_dashboard', DASHBOARD_CACHE_CONFIG['tables'],
+                                          ttl_seconds=DASHBOARD_CACHE_CONFIG['ttl_seconds'])
+
 @app.route('/admin/dashboard')
 def admin_dashboard():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -1601,157 +3087,11 @@ def admin_dashboard():
         'email': f"{session['employee_name'].lower().replace(' ', '.')}@farm.com"
     }
     
-    # Fetch real data from database
+    # Fetch dashboard counters (cached snapshot, rebuilt after relevant writes)
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Pigs data
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_pigs,
-                SUM(CASE WHEN pig_type = 'grown_pig' AND gender = 'female' AND breeding_status IN ('available', 'served', 'pregnant') THEN 1 ELSE 0 END) as breeding_sows,
-                SUM(CASE WHEN pig_type = 'piglet' THEN 1 ELSE 0 END) as piglets,
-                SUM(CASE WHEN pig_type = 'litter' THEN 1 ELSE 0 END) as litters
-            FROM pigs 
-            WHERE status = 'active'
-        """)
-        pigs_data = cursor.fetchone()
-        
-        # Litter data (piglets from litters)
-        cursor.execute("""
-            SELECT 
-                SUM(total_piglets) as total_piglets_from_litters,
-                SUM(alive_piglets) as alive_piglets_from_litters,
-                COUNT(*) as total_litters
-            FROM litters 
-            WHERE status IN ('unweaned', 'weaned')
-        """)
-        litter_data = cursor.fetchone()
-        
-        # Cows data
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_cows,
-                SUM(CASE WHEN gender = 'female' THEN 1 ELSE 0 END) as female_cows,
-                SUM(CASE WHEN gender = 'male' THEN 1 ELSE 0 END) as male_cows
-            FROM cows 
-            WHERE status = 'active'
-        """)
-        cows_data = cursor.fetchone()
-        
-        # Milk production data (average daily production)
-        cursor.execute("""
-            SELECT 
-                AVG(daily_milk) as avg_daily_milk_production,
-                COUNT(DISTINCT cow_id) as cows_milked,
-                AVG(milk_quantity) as avg_milk_per_cow
-            FROM (
-                SELECT 
-                    cow_id,
-                    production_date,
-                    SUM(milk_quantity) as daily_milk,
-                    AVG(milk_quantity) as milk_quantity
-                FROM milk_production 
-                WHERE production_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-                GROUP BY cow_id, production_date
-            ) as daily_totals
-        """)
-        milk_data = cursor.fetchone()
-        
-        # Upcoming activities (notifications from different departments)
-        cursor.execute("""
-            SELECT 
-                'Breeding' as department,
-                'Pigs' as animal_type,
-                COUNT(*) as notification_count,
-                CONCAT('Pregnant pigs due in 3 days: ', COUNT(*)) as description
-            FROM pigs p
-            JOIN breeding_records br ON p.id = br.sow_id
-            WHERE p.status = 'active' 
-            AND p.breeding_status = 'pregnant'
-            AND br.expected_due_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 3 DAY)
-            UNION ALL
-            SELECT 
-                'Breeding' as department,
-                'Cows' as animal_type,
-                COUNT(*) as notification_count,
-                CONCAT('Pregnant cows due in 3 days: ', COUNT(*)) as description
-            FROM cows c
-            JOIN cow_breeding cb ON c.id = cb.dam_id
-            WHERE c.status = 'active' 
-            AND c.gender = 'female'
-            AND cb.expected_calving_date BETWEEN CURDATE() AND DATE_ADD(CURDATE(), INTERVAL 3 DAY)
-            UNION ALL
-            SELECT 
-                'Health' as department,
-                'Pigs' as animal_type,
-                COUNT(*) as notification_count,
-                'Health notifications for pigs' as description
-            FROM pigs 
-            WHERE status = 'active'
-            UNION ALL
-            SELECT 
-                'Health' as department,
-                'Cows' as animal_type,
-                COUNT(*) as notification_count,
-                'Health notifications for cows' as description
-            FROM cows 
-            WHERE status = 'active'
-            UNION ALL
-            SELECT 
-                'Medical' as department,
-                'Pigs' as animal_type,
-                COUNT(*) as notification_count,
-                'Medical notifications for pigs' as description
-            FROM pigs 
-            WHERE status = 'active'
-            UNION ALL
-            SELECT 
-                'Medical' as department,
-                'Cows' as animal_type,
-                COUNT(*) as notification_count,
-                'Medical notifications for cows' as description
-            FROM cows 
-            WHERE status = 'active'
-            UNION ALL
-            SELECT 
-                'Medical' as department,
-                'Chickens' as animal_type,
-                0 as notification_count,
-                'Medical notifications for chickens (Coming Soon)' as description
-            ORDER BY department, animal_type
-        """)
-        upcoming_activities = cursor.fetchall()
-        
-        # Calculate totals
-        total_animals = (pigs_data['total_pigs'] or 0) + (cows_data['total_cows'] or 0)
-        total_piglets = (pigs_data['piglets'] or 0) + (litter_data['alive_piglets_from_litters'] or 0)  # piglets + alive piglets from litters
-        
-        # Prepare dashboard data
-        dashboard_data = {
-            'pigs': {
-                'total_pigs': pigs_data['total_pigs'] or 0,
-                'breeding_sows': pigs_data['breeding_sows'] or 0,
-                'piglets': total_piglets,
-                'litters': pigs_data['litters'] or 0
-            },
-            'cows': {
-                'total_cows': cows_data['total_cows'] or 0,
-                'female_cows': cows_data['female_cows'] or 0,
-                'male_cows': cows_data['male_cows'] or 0,
-                'avg_daily_milk_production': milk_data['avg_daily_milk_production'] or 0,
-                'cows_milked': milk_data['cows_milked'] or 0,
-                'avg_milk_per_cow': milk_data['avg_milk_per_cow'] or 0
-            },
-            'totals': {
-                'total_animals': total_animals,
-                'daily_production': milk_data['avg_daily_milk_production'] or 0,  # average daily milk production
-                'system_health': 95  # This could be calculated based on various factors
-            },
-            'upcoming_activities': upcoming_activities
-        }
-        
+        dashboard_data = dashboard_snapshot_cache.get(cursor, build_dashboard_snapshot)
         cursor.close()
         conn.close()
         
@@ -1967,22 +3307,6 @@ def api_login():
                 else:
                     return {'success': False, 'message': 'Your account is not active. Please contact your administrator.'}
             
-            # Update pig ages on login
-            try:
-                update_pig_ages(cursor)
-                print(f"Updated pig ages for employee {employee['full_name']} login")
-            except Exception as age_error:
-                print(f"Warning: Could not update pig ages: {age_error}")
-                # Don't fail login if age update fails
-            
-            # Update breeding statuses on login
-            try:
-                update_breeding_statuses()
-                print(f"✅ Updated breeding statuses for employee {employee['full_name']} login")
-            except Exception as breeding_error:
-                print(f"Warning: Could not update breeding statuses: {breeding_error}")
-                # Don't fail login if breeding update fails
-            
             cursor.close()
             conn.close()
             
@@ -1992,7 +3316,7 @@ def api_login():
             session['employee_status'] = employee['status']
             
             # Log login activity
-            log_activity(employee['id'], 'LOGIN', f'Employee {employee["full_name"]} logged in successfully')
+            log_activity(employee['id'], 'LOGIN', f'Employee {employee["full_name"]} logged in successfully', entity_type='employee', entity_id=employee['id'])
             
             # Get appropriate dashboard URL based on role
             dashboard_url = get_role_dashboard_url(employee['role'])
@@ -2084,7 +3408,7 @@ def api_signup():
         employee_id = cursor.lastrowid
         
         # Log signup activity
-        log_activity(employee_id, 'SIGNUP', f'New employee {full_name} registered with code {employee_code} - Status: Waiting Approval')
+        log_activity(employee_id, 'SIGNUP', f'New employee {full_name} registered with code {employee_code} - Status: Waiting Approval', entity_type='employee', entity_id=employee_id)
         
         conn.commit()
         cursor.close()
@@ -2333,6 +3657,7 @@ def admin_farm_chicken_management():
     return render_template('admin_farm_chicken_management.html', user=user_data)
 
 @app.route('/admin/farm/chicken-registration', methods=['POST'])
+@invalidates('chickens')
 def chicken_registration():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'success': False, 'message': 'Unauthorized access'})
@@ -2358,32 +3683,6 @@ def chicken_registration():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chickens table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chickens (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id VARCHAR(20) UNIQUE NOT NULL,
-                batch_name VARCHAR(100) NOT NULL,
-                chicken_type ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                breed_name VARCHAR(100) NOT NULL,
-                gender ENUM('male', 'female') NOT NULL,
-                hatch_date DATE NOT NULL,
-                age_days INT NOT NULL,
-                source VARCHAR(100) NOT NULL,
-                coop_number INT NOT NULL,
-                quantity INT NOT NULL DEFAULT 1,
-                current_status ENUM('active', 'sold', 'dead', 'culled') DEFAULT 'active',
-                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_by INT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_chicken_type (chicken_type),
-                INDEX idx_batch_name (batch_name),
-                INDEX idx_coop_number (coop_number),
-                INDEX idx_current_status (current_status)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Insert chicken data
         cursor.execute("""
             INSERT INTO chickens (
@@ -2398,6 +3697,7 @@ def chicken_registration():
         ))
         
         conn.commit()
+        refresh_search_entry('chicken', code=chicken_id)
         cursor.close()
         conn.close()
         
@@ -2442,7 +3742,7 @@ def admin_farm_chicken_flock_management():
                 breed_name,
                 gender,
                 hatch_date,
-                age_days,
+                DATEDIFF(CURDATE(), hatch_date) AS age_days,
                 source,
                 coop_number,
                 quantity,
@@ -2470,7 +3770,7 @@ def admin_farm_chicken_flock_management():
                 chicken_type,
                 COUNT(*) as total_count,
                 SUM(quantity) as total_quantity,
-                AVG(age_days) as avg_age,
+                AVG(DATEDIFF(CURDATE(), hatch_date)) as avg_age,
                 COUNT(DISTINCT batch_name) as batch_count
             FROM chickens 
             WHERE current_status = 'active'
@@ -2501,6 +3801,93 @@ def admin_farm_chicken_flock_management():
                          chickens_by_type=chickens_by_type,
                          stats=stats_dict)
 
+class ChickenStageIndex:
+    """Sorted per-category lookup of chicken stages and weight standards.
+    
+    Stages may share boundary days; flatten_age_ranges() keeps the original
+    rule that the earliest-starting stage wins. Stage and standard lookups
+    are then a bisect.
+    """
+
+    def __init__(self, stages, weight_standards):
+        self.stages_by_category = {}
+        for stage in sorted(stages, key=lambda s: (s['start_day'], s['id'])):
+            self.stages_by_category.setdefault(stage['category'], []).append(stage)
+        
+        self.segment_starts = {}
+        self.segments = {}
+        for category, category_stages in self.stages_by_category.items():
+            self.segment_starts[category], self.segments[category] = flatten_age_ranges(
+                category_stages, 'start_day', 'end_day')
+        
+        self.standards_by_category = {}
+        for standard in sorted(weight_standards, key=lambda s: (s['age_days'], s['id'])):
+            self.standards_by_category.setdefault(standard['category'], []).append(standard)
+        self.standard_ages = {
+            category: [standard['age_days'] for standard in standards]
+            for category, standards in self.standards_by_category.items()
+        }
+
+    def stages(self, category):
+        """All stages of a category ordered by start day"""
+        return self.stages_by_category.get(category, [])
+
+    def stage_for(self, category, age_days):
+        """Stage a chicken of this category and age belongs to, or None"""
+        starts = self.segment_starts.get(category)
+        if not starts or age_days is None:
+            return None
+        position = bisect_right(starts, age_days) - 1
+        return self.segments[category][position] if position >= 0 else None
+
+    def standards_due(self, category, age_days):
+        """Weight standards a chicken of this age has already reached"""
+        ages = self.standard_ages.get(category)
+        if not ages or age_days is None:
+            return []
+        return self.standards_by_category[category][:bisect_right(ages, age_days)]
+
+    def standard_for(self, category, age_days):
+        """Most recent weight standard reached at this age, or None"""
+        due = self.standards_due(category, age_days)
+        return due[-1] if due else None
+
+chicken_stage_index_cache = VersionedCache('chicken_stage_index', ('chicken_stages', 'chicken_weight_standards'))
+
+def build_chicken_stage_index(cursor):
+    """Load stages and weight standards into a ChickenStageIndex"""
+    cursor.execute("""
+        SELECT id, category, stage_name, start_day, end_day, description
+        FROM chicken_stages
+    """)
+    stages = cursor.fetchall()
+    cursor.execute("""
+        SELECT id, category, age_days, expected_weight, description, created_at
+        FROM chicken_weight_standards
+    """)
+    weight_standards = cursor.fetchall()
+    return ChickenStageIndex(stages, weight_standards)
+
+def get_chicken_stage_index(cursor):
+    """Shared ChickenStageIndex, rebuilt when stages or weight standards change"""
+    return chicken_stage_index_cache.get(cursor, build_chicken_stage_index)
+
+def get_chickens_in_age_range(cursor, category, min_age, max_age):
+    """Active chickens of a category aged min_age..max_age days, youngest first.
+    
+    Age is derived from hatch_date, so the bucket is turned into a hatch_date
+    range and read from idx_chickens_status_type_hatch.
+    """
+    cursor.execute("""
+        SELECT chicken_id, batch_name, breed_name, gender, hatch_date,
+               DATEDIFF(CURDATE(), hatch_date) AS age_days, coop_number, quantity
+        FROM chickens
+        WHERE current_status = 'active' AND chicken_type = %s
+        AND hatch_date BETWEEN CURDATE() - INTERVAL %s DAY AND CURDATE() - INTERVAL %s DAY
+        ORDER BY hatch_date DESC
+    """, (category, max_age, min_age))
+    return cursor.fetchall()
+
 @app.route('/admin/farm/chicken-settings')
 def admin_farm_chicken_settings():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -2520,58 +3907,6 @@ def admin_farm_chicken_settings():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chicken_stages table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_stages (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                stage_name VARCHAR(100) NOT NULL,
-                start_day INT NOT NULL,
-                end_day INT NOT NULL,
-                description TEXT,
-                created_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_category (category),
-                INDEX idx_stage_name (stage_name)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # Create chicken_medications table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_medications (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                medication_name VARCHAR(200) NOT NULL,
-                start_day INT NOT NULL,
-                end_day INT NOT NULL,
-                purpose TEXT,
-                image_filename VARCHAR(255),
-                created_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_category (category),
-                INDEX idx_medication_name (medication_name)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # Create chicken_weight_standards table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_weight_standards (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                age_days INT NOT NULL,
-                expected_weight DECIMAL(6,3) NOT NULL COMMENT 'Weight in kilograms',
-                description TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_category (category),
-                INDEX idx_age_days (age_days),
-                UNIQUE KEY unique_category_age (category, age_days)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Get all existing stages
         cursor.execute("""
             SELECT 
@@ -2664,6 +3999,7 @@ def admin_farm_chicken_settings():
                          weight_standards_by_category=weight_standards_by_category)
 
 @app.route('/admin/farm/chicken-stage', methods=['POST'])
+@invalidates('chicken_stages')
 def add_chicken_stage():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'success': False, 'message': 'Unauthorized access'})
@@ -2721,6 +4057,7 @@ def add_chicken_stage():
         })
 
 @app.route('/admin/farm/chicken-stage/<int:stage_id>', methods=['PUT'])
+@invalidates('chicken_stages')
 def update_chicken_stage(stage_id):
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'success': False, 'message': 'Unauthorized access'})
@@ -2783,6 +4120,7 @@ def update_chicken_stage(stage_id):
         })
 
 @app.route('/admin/farm/chicken-stage/<int:stage_id>', methods=['DELETE'])
+@invalidates('chicken_stages')
 def delete_chicken_stage(stage_id):
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'success': False, 'message': 'Unauthorized access'})
@@ -2820,6 +4158,323 @@ def delete_chicken_stage(stage_id):
             'message': f'Error deleting stage: {str(e)}'
         })
 
+@app.route('/api/chicken/stage/<int:stage_id>/entering', methods=['GET'])
+def get_chickens_entering_stage(stage_id):
+    """Active chickens that reach a stage's start day within the next `days` days (default 7)"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        days = max(1, request.args.get('days', 7, type=int))
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT id, category, stage_name, start_day, end_day FROM chicken_stages WHERE id = %s", (stage_id,))
+        stage = cursor.fetchone()
+        
+        if not stage:
+            return jsonify({'success': False, 'message': 'Stage not found'})
+        
+        # A chicken aged start_day - n days enters the stage in n days
+        chickens = get_chickens_in_age_range(cursor, stage['category'],
+                                             max(0, stage['start_day'] - days + 1), stage['start_day'])
+        for chicken in chickens:
+            chicken['days_until_stage'] = stage['start_day'] - chicken['age_days']
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'stage': stage,
+            'days': days,
+            'chickens': chickens
+        })
+        
+    except Exception as e:
+        print(f"Error getting chickens entering stage: {str(e)}")
+        return jsonify({
+            'success': False, 
+            'message': f'Error getting chickens entering stage: {str(e)}'
+        })
+
+# Static asset fingerprinting settings
+ASSET_CONFIG = {
+    'max_age': int(os.environ.get('ASSET_MAX_AGE', 31536000)),  # Cache lifetime of fingerprinted static URLs
+    'hash_length': 12  # Hex digits of the content hash put in ?v=
+}
+
+# Uploads and image variants named by content hash never change in place
+CONTENT_ADDRESSED_NAME = re.compile(r'^[0-9a-f]{32}(-\d+)?\.[a-z]+$')
+
+# filename (relative to static/) -> (mtime_ns, size, hash)
+_asset_manifest = {}
+_asset_manifest_lock = threading.Lock()
+
+def static_asset_hash(filename):
+    """Content hash of a static file, re-hashed only when its mtime or size changes"""
+    path = safe_join(app.static_folder, filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    entry = _asset_manifest.get(filename)
+    if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()[:ASSET_CONFIG['hash_length']]
+    with _asset_manifest_lock:
+        _asset_manifest[filename] = (stat.st_mtime_ns, stat.st_size, content_hash)
+    return content_hash
+
+def build_asset_manifest():
+    """Hash every file under static/ so the first page render does not have to"""
+    started = time.perf_counter()
+    for root, dirs, files in os.walk(app.static_folder):
+        for name in files:
+            static_asset_hash(os.path.relpath(os.path.join(root, name), app.static_folder).replace(os.sep, '/'))
+    print(f"Asset manifest built: {len(_asset_manifest)} files in {int((time.perf_counter() - started) * 1000)} ms")
+
+@app.url_defaults
+def add_static_asset_hash(endpoint, values):
+    """Make url_for('static', ...) fingerprinted by appending ?v=<content hash>"""
+    if endpoint == 'static' and 'v' not in values:
+        content_hash = static_asset_hash(values.get('filename', ''))
+        if content_hash:
+            values['v'] = content_hash
+
+@app.after_request
+def cache_fingerprinted_assets(response):
+    """Let browsers keep a static file for a year when its URL or name carries its hash"""
+    if request.endpoint == 'static' and response.status_code in (200, 304):
+        filename = request.view_args.get('filename', '')
+        version = request.args.get('v')
+        if (version and version == static_asset_hash(filename)) or CONTENT_ADDRESSED_NAME.match(os.path.basename(filename)):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = ASSET_CONFIG['max_age']
+            response.cache_control.immutable = True
+    return response
+
+build_asset_manifest()
+
+# Image pipeline settings
+IMAGE_PIPELINE_CONFIG = {
+    'widths': tuple(int(w) for w in os.environ.get('IMAGE_WIDTHS', '320,640,1024,1920').split(',')),  # Resized variant widths
+    'quality': int(os.environ.get('IMAGE_QUALITY', 80)),  # JPEG and WebP quality
+    'variants_dir': 'images/variants',  # Under static/, for variants of files in static/images
+    'medication_uploads': 'uploads/medications'  # Under static/
+}
+
+# Pillow format per file extension; other uploads are stored without variants
+IMAGE_FORMATS = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP'}
+
+# <content hash>-<width>.<ext>, the name of every resized variant
+IMAGE_VARIANT_PATTERN = re.compile(r'^(?P<stem>[0-9a-f]{32})-(?P<width>\d+)\.(?P<ext>[a-z]+)$')
+
+def image_content_hash(data):
+    """Name stem for image bytes, so identical files share one name"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+def write_image_variants(data, output_dir, stem, extension):
+    """Write resized copies and WebP versions of an image as <stem>-<width>.<ext>.
+    
+    Widths are the configured ones narrower than the image, plus the image
+    width itself capped at the largest configured width. Existing files are
+    kept, since a stem is a content hash. Returns the widths written.
+    """
+    image_format = IMAGE_FORMATS.get(extension)
+    if Image is None or image_format is None:
+        return []
+    quality = IMAGE_PIPELINE_CONFIG['quality']
+    with Image.open(io.BytesIO(data)) as original:
+        # Phone photos are often stored sideways with an EXIF rotation
+        image = ImageOps.exif_transpose(original)
+        largest = min(image.width, max(IMAGE_PIPELINE_CONFIG['widths']))
+        widths = sorted({w for w in IMAGE_PIPELINE_CONFIG['widths'] if w < largest} | {largest})
+        for width in widths:
+            paths = {extension: os.path.join(output_dir, f"{stem}-{width}.{extension}"),
+                     'webp': os.path.join(output_dir, f"{stem}-{width}.webp")}
+            if all(os.path.exists(path) for path in paths.values()):
+                continue
+            resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            if image_format == 'JPEG':
+                resized.convert('RGB').save(paths[extension], 'JPEG', quality=quality, optimize=True, progressive=True)
+            elif image_format == 'PNG':
+                resized.save(paths[extension], 'PNG', optimize=True)
+            if resized.mode not in ('RGB', 'RGBA'):
+                resized = resized.convert('RGBA' if 'A' in resized.getbands() else 'RGB')
+            resized.save(paths['webp'], 'WEBP', quality=quality, method=6)
+    return widths
+
+def save_uploaded_image(upload, static_dir):
+    """Store an uploaded image under static/<static_dir> by content hash.
+    
+    Variants are generated on the spot; an image Pillow cannot read is kept
+    as uploaded. Returns the stored file name.
+    """
+    data = upload.read()
+    extension = upload.filename.rsplit('.', 1)[1].lower() if '.' in upload.filename else 'jpg'
+    stem = image_content_hash(data)
+    upload_dir = os.path.join(app.static_folder, static_dir)
+    os.makedirs(upload_dir, exist_ok=True)
+    
+    filename = f"{stem}.{extension}"
+    path = os.path.join(upload_dir, filename)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    try:
+        write_image_variants(data, upload_dir, stem, extension)
+    except Exception as e:
+        print(f"Error generating variants for {filename}: {str(e)}")
+    return filename
+
+# directory -> (mtime, {stem: {extension: [widths]}}), refreshed when the directory changes
+_image_variant_listings = {}
+_image_manifest = {'mtime': None, 'paths': {}}
+
+def load_image_manifest():
+    """static/images path -> content hash of its variants, from optimize-images"""
+    path = os.path.join(app.static_folder, IMAGE_PIPELINE_CONFIG['variants_dir'], 'manifest.json')
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    if _image_manifest['mtime'] != mtime:
+        with open(path) as f:
+            _image_manifest['paths'] = json.load(f)
+        _image_manifest['mtime'] = mtime
+    return _image_manifest['paths']
+
+def image_variants(path):
+    """Directory, stem and {extension: sorted widths} of the variants of a static image"""
+    directory, filename = os.path.split(path)
+    stem = filename.rsplit('.', 1)[0]
+    content_hash = load_image_manifest().get(path)
+    if content_hash:
+        directory, stem = IMAGE_PIPELINE_CONFIG['variants_dir'], content_hash
+    full_dir = os.path.join(app.static_folder, directory)
+    try:
+        mtime = os.stat(full_dir).st_mtime_ns
+    except OSError:
+        return directory, stem, {}
+    listing = _image_variant_listings.get(directory)
+    if listing is None or listing[0] != mtime:
+        variants = {}
+        for name in os.listdir(full_dir):
+            match = IMAGE_VARIANT_PATTERN.match(name)
+            if match:
+                variants.setdefault(match['stem'], {}).setdefault(match['ext'], []).append(int(match['width']))
+        for formats in variants.values():
+            for widths in formats.values():
+                widths.sort()
+        listing = _image_variant_listings[directory] = (mtime, variants)
+    return directory, stem, listing[1].get(stem, {})
+
+@app.template_global()
+def responsive_image(path, alt='', sizes='100vw', **attrs):
+    """<img> for a static image with WebP and resized srcset variants when they exist"""
+    directory, stem, variants = image_variants(path)
+    extension = path.rsplit('.', 1)[-1].lower()
+    if 'class_' in attrs:
+        attrs['class'] = attrs.pop('class_')
+    
+    def srcset(image_extension):
+        return ', '.join(f"{url_for('static', filename=f'{directory}/{stem}-{w}.{image_extension}')} {w}w"
+                         for w in variants.get(image_extension, []))
+    
+    img_attrs = {'src': url_for('static', filename=path), 'alt': alt}
+    if variants.get(extension):
+        img_attrs.update({'srcset': srcset(extension), 'sizes': sizes})
+    img_attrs.update(attrs)
+    img = '<img ' + ' '.join(f'{name}="{escape(value)}"' for name, value in img_attrs.items()) + '>'
+    if not variants.get('webp'):
+        return Markup(img)
+    # display: contents keeps the <img> laid out as if <picture> were not there
+    return Markup(f'<picture style="display: contents"><source type="image/webp" srcset="{escape(srcset("webp"))}" '
+                  f'sizes="{escape(sizes)}">{img}</picture>')
+
+@app.template_global()
+def image_variant_url(path, width):
+    """URL of the smallest variant at least width wide (the largest if none is), else the original"""
+    directory, stem, variants = image_variants(path)
+    extension = path.rsplit('.', 1)[-1].lower()
+    widths = variants.get(extension)
+    if not widths:
+        return url_for('static', filename=path)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    return url_for('static', filename=f'{directory}/{stem}-{chosen}.{extension}')
+
+@app.cli.command('optimize-images')
+def optimize_images_command():
+    """Generate image variants for static/images and rename medication uploads by content hash."""
+    if Image is None:
+        print("❌ Pillow is not installed")
+        return
+    static_folder = app.static_folder
+    variants_dir = os.path.join(static_folder, IMAGE_PIPELINE_CONFIG['variants_dir'])
+    os.makedirs(variants_dir, exist_ok=True)
+    
+    manifest = {}
+    for root, dirs, files in os.walk(os.path.join(static_folder, 'images')):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != variants_dir]
+        for name in sorted(files):
+            extension = name.rsplit('.', 1)[-1].lower()
+            if extension not in IMAGE_FORMATS:
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            content_hash = image_content_hash(data)
+            try:
+                widths = write_image_variants(data, variants_dir, content_hash, extension)
+            except Exception as e:
+                print(f"Error generating variants for {name}: {str(e)}")
+                continue
+            manifest[os.path.relpath(path, static_folder).replace(os.sep, '/')] = content_hash
+            print(f"{name}: {', '.join(str(w) for w in widths)}")
+    with open(os.path.join(variants_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    # Older uploads are named by uuid; move them to content hashes so duplicates collapse
+    upload_dir = os.path.join(static_folder, IMAGE_PIPELINE_CONFIG['medication_uploads'])
+    if not os.path.isdir(upload_dir):
+        return
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    renamed = 0
+    for name in sorted(os.listdir(upload_dir)):
+        stem, _, extension = name.rpartition('.')
+        if not stem or IMAGE_VARIANT_PATTERN.match(name):
+            continue
+        path = os.path.join(upload_dir, name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        content_hash = image_content_hash(data)
+        new_name = f"{content_hash}.{extension}"
+        if new_name != name:
+            if not os.path.exists(os.path.join(upload_dir, new_name)):
+                os.replace(path, os.path.join(upload_dir, new_name))
+            cursor.execute("UPDATE chicken_medications SET image_filename = %s WHERE image_filename = %s", (new_name, name))
+            conn.commit()
+            if os.path.exists(path):
+                os.remove(path)
+            renamed += 1
+        try:
+            write_image_variants(data, upload_dir, content_hash, extension.lower())
+        except Exception as e:
+            print(f"Error generating variants for {name}: {str(e)}")
+    cursor.close()
+    conn.close()
+    print(f"✅ {len(manifest)} static images optimized, {renamed} medication uploads renamed by content hash")
+
 @app.route('/admin/farm/chicken-medication', methods=['POST'])
 def add_chicken_medication():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -2838,18 +4493,8 @@ def add_chicken_medication():
         image_filename = None
         
         if medication_image and medication_image.filename:
-            # Create uploads directory if it doesn't exist
-            import os
-            upload_dir = 'static/uploads/medications'
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            # Generate unique filename
-            import uuid
-            file_extension = medication_image.filename.rsplit('.', 1)[1].lower() if '.' in medication_image.filename else 'jpg'
-            image_filename = f"{uuid.uuid4().hex}.{file_extension}"
-            
-            # Save file
-            medication_image.save(os.path.join(upload_dir, image_filename))
+            # Stored by content hash, with resized and WebP variants
+            image_filename = save_uploaded_image(medication_image, IMAGE_PIPELINE_CONFIG['medication_uploads'])
         
         # Validate required fields
         if not all([category, medication_name, start_day, end_day]):
@@ -2862,24 +4507,6 @@ def add_chicken_medication():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chicken_medications table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_medications (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                medication_name VARCHAR(200) NOT NULL,
-                start_day INT NOT NULL,
-                end_day INT NOT NULL,
-                purpose TEXT,
-                image_filename VARCHAR(255),
-                created_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_category (category),
-                INDEX idx_medication_name (medication_name)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Insert medication data
         cursor.execute("""
             INSERT INTO chicken_medications (category, medication_name, start_day, end_day, purpose, image_filename, created_by)
@@ -2920,18 +4547,8 @@ def update_chicken_medication(medication_id):
         image_filename = None
         
         if medication_image and medication_image.filename:
-            # Create uploads directory if it doesn't exist
-            import os
-            upload_dir = 'static/uploads/medications'
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            # Generate unique filename
-            import uuid
-            file_extension = medication_image.filename.rsplit('.', 1)[1].lower() if '.' in medication_image.filename else 'jpg'
-            image_filename = f"{uuid.uuid4().hex}.{file_extension}"
-            
-            # Save file
-            medication_image.save(os.path.join(upload_dir, image_filename))
+            # Stored by content hash, with resized and WebP variants
+            image_filename = save_uploaded_image(medication_image, IMAGE_PIPELINE_CONFIG['medication_uploads'])
         
         # Validate required fields
         if not all([category, medication_name, start_day, end_day]):
@@ -3044,7 +4661,7 @@ def admin_farm_chicken_health():
                 breed_name,
                 gender,
                 hatch_date,
-                age_days,
+                DATEDIFF(CURDATE(), hatch_date) AS age_days,
                 source,
                 coop_number,
                 quantity,
@@ -3052,23 +4669,12 @@ def admin_farm_chicken_health():
                 registration_date
             FROM chickens 
             WHERE current_status = 'active'
-            ORDER BY chicken_type, age_days
+            ORDER BY chicken_type, hatch_date DESC
         """)
         chickens = cursor.fetchall()
         
-        # Get all chicken stages
-        cursor.execute("""
-            SELECT 
-                id,
-                category,
-                stage_name,
-                start_day,
-                end_day,
-                description
-            FROM chicken_stages 
-            ORDER BY category, start_day
-        """)
-        stages = cursor.fetchall()
+        # Shared stage index (rebuilt only when chicken_stages changes)
+        stage_index = get_chicken_stage_index(cursor)
         
         # Group chickens by type and then by stage
         chickens_by_category_and_stage = {
@@ -3077,11 +4683,6 @@ def admin_farm_chicken_health():
             'layer': {}
         }
         
-        # Create stage lookup for each category
-        stage_lookup = {'broiler': {}, 'kienyeji': {}, 'layer': {}}
-        for stage in stages:
-            stage_lookup[stage['category']][stage['id']] = stage
-        
         # Group chickens by category first
         chickens_by_type = {'broiler': [], 'kienyeji': [], 'layer': []}
         for chicken in chickens:
@@ -3090,12 +4691,11 @@ def admin_farm_chicken_health():
         # For each category, group chickens by their current stage
         for category in ['broiler', 'kienyeji', 'layer']:
             category_chickens = chickens_by_type[category]
-            category_stages = stage_lookup[category]
             
             # Initialize stage groups
             stage_groups = {}
-            for stage_id, stage in category_stages.items():
-                stage_groups[stage_id] = {
+            for stage in stage_index.stages(category):
+                stage_groups[stage['id']] = {
                     'stage_info': stage,
                     'chickens': []
                 }
@@ -3113,19 +4713,8 @@ def admin_farm_chicken_health():
             
             # Assign chickens to appropriate stages
             for chicken in category_chickens:
-                assigned = False
-                chicken_age = chicken['age_days']
-                
-                # Check if chicken fits into any defined stage
-                for stage_id, stage in category_stages.items():
-                    if stage['start_day'] <= chicken_age <= stage['end_day']:
-                        stage_groups[stage_id]['chickens'].append(chicken)
-                        assigned = True
-                        break
-                
-                # If not assigned to any stage, put in "No Stage"
-                if not assigned:
-                    stage_groups['no_stage']['chickens'].append(chicken)
+                stage = stage_index.stage_for(category, chicken['age_days'])
+                stage_groups[stage['id'] if stage else 'no_stage']['chickens'].append(chicken)
             
             chickens_by_category_and_stage[category] = stage_groups
         
@@ -3135,7 +4724,7 @@ def admin_farm_chicken_health():
                 chicken_type,
                 COUNT(*) as total_count,
                 SUM(quantity) as total_quantity,
-                AVG(age_days) as avg_age,
+                AVG(DATEDIFF(CURDATE(), hatch_date)) as avg_age,
                 COUNT(DISTINCT batch_name) as batch_count
             FROM chickens 
             WHERE current_status = 'active'
@@ -3170,9 +4759,102 @@ def admin_farm_chicken_health():
                          chickens_by_category_and_stage=chickens_by_category_and_stage,
                          stats=stats_dict)
 
+# Age window (relative to a medication's end_day) covered by each urgency level
+MEDICATION_URGENCY_OFFSETS = {
+    'overdue': (1, None),   # Past the end of the medication period
+    'high': (-2, 0),        # 0-2 days left
+    'medium': (-5, -3),     # 3-5 days left
+    'low': (None, -6)       # More than 5 days left
+}
+
+class ChickenMedicationSchedule:
+    """Matches active chickens against the medications of their category.
+    
+    Chickens are bucketed by category and sorted by age, and completed
+    (chicken_id, medication_id) pairs are kept in a hash set, so each
+    medication is resolved with a bisect plus a walk over the page being
+    shown instead of scanning every chicken and tracking row.
+    """
+
+    def __init__(self, chickens, completed_pairs, open_tracking):
+        self.chickens_by_category = {}
+        for chicken in sorted(chickens, key=lambda c: c['age_days']):
+            self.chickens_by_category.setdefault(chicken['chicken_type'], []).append(chicken)
+        self.ages_by_category = {
+            category: [chicken['age_days'] for chicken in category_chickens]
+            for category, category_chickens in self.chickens_by_category.items()
+        }
+        chickens_by_id = {chicken['chicken_id']: chicken for chicken in chickens}
+        self.completed = set(completed_pairs)
+        self.completed_by_medication = {}
+        for chicken_id, medication_id in self.completed:
+            if chicken_id in chickens_by_id:
+                self.completed_by_medication.setdefault(medication_id, []).append(chickens_by_id[chicken_id])
+        self.open_tracking = {(row['chicken_id'], row['medication_id']): row for row in open_tracking}
+
+    def _age_bounds(self, medication, urgency):
+        low_offset, high_offset = MEDICATION_URGENCY_OFFSETS[urgency] if urgency else (None, None)
+        end_day = medication['end_day']
+        return (end_day + low_offset if low_offset is not None else None,
+                end_day + high_offset if high_offset is not None else None)
+
+    def _index_range(self, ages, low_age, high_age):
+        start = bisect_left(ages, low_age) if low_age is not None else 0
+        stop = bisect_right(ages, high_age) if high_age is not None else len(ages)
+        return start, stop
+
+    def count(self, medication, urgency=None):
+        """Number of chickens still needing a medication within an urgency level"""
+        ages = self.ages_by_category.get(medication['category'], [])
+        low_age, high_age = self._age_bounds(medication, urgency)
+        start, stop = self._index_range(ages, low_age, high_age)
+        completed = 0
+        for chicken in self.completed_by_medication.get(medication['id'], ()):
+            age = chicken['age_days']
+            if chicken['chicken_type'] != medication['category']:
+                continue
+            if (low_age is None or age >= low_age) and (high_age is None or age <= high_age):
+                completed += 1
+        return max(0, stop - start - completed)
+
+    def match(self, medication, urgency=None, offset=0, limit=None):
+        """Chickens needing a medication, most urgent (oldest) first"""
+        category_chickens = self.chickens_by_category.get(medication['category'], [])
+        ages = self.ages_by_category.get(medication['category'], [])
+        start, stop = self._index_range(ages, *self._age_bounds(medication, urgency))
+        
+        matched = []
+        skipped = 0
+        for index in range(stop - 1, start - 1, -1):
+            chicken = category_chickens[index]
+            key = (chicken['chicken_id'], medication['id'])
+            if key in self.completed:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if limit is not None and len(matched) >= limit:
+                break
+            
+            days_remaining = medication['end_day'] - chicken['age_days']
+            if days_remaining >= 0:
+                urgency_level = 'high' if days_remaining <= 2 else 'medium' if days_remaining <= 5 else 'low'
+                status = 'eligible'
+            else:
+                urgency_level = 'overdue'
+                status = 'overdue'
+            matched.append({
+                'chicken': chicken,
+                'tracking': self.open_tracking.get(key),
+                'days_remaining': days_remaining,
+                'days_overdue': max(0, -days_remaining),
+                'urgency': urgency_level,
+                'status': status
+            })
+        return matched
+
 @app.route('/admin/farm/chicken-upcoming-medications')
 def admin_farm_chicken_upcoming_medications():
-    print("DEBUG: Route accessed - /admin/farm/chicken-upcoming-medications")
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return redirect(url_for('employee_login'))
     
@@ -3185,36 +4867,18 @@ def admin_farm_chicken_upcoming_medications():
         'email': f"{session['employee_name'].lower().replace(' ', '.')}@farm.com"
     }
     
-    # Initialize variables
-    stages_by_category = {'broiler': [], 'kienyeji': [], 'layer': []}
-    medications_by_category = {'broiler': [], 'kienyeji': [], 'layer': []}
-    weight_standards_by_category = {'broiler': [], 'kienyeji': [], 'layer': []}
+    # Optional urgency filter and per-medication pagination of the chicken lists
+    urgency = request.args.get('urgency')
+    if urgency not in MEDICATION_URGENCY_OFFSETS:
+        urgency = None
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 500)
+    total_pages = 1
     
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get all active chickens
-        cursor.execute("""
-            SELECT 
-                chicken_id,
-                batch_name,
-                chicken_type,
-                breed_name,
-                gender,
-                hatch_date,
-                age_days,
-                source,
-                coop_number,
-                quantity,
-                current_status,
-                registration_date
-            FROM chickens 
-            WHERE current_status = 'active'
-            ORDER BY chicken_type, age_days
-        """)
-        chickens = cursor.fetchall()
-        
         # Get all medications
         cursor.execute("""
             SELECT 
@@ -3231,137 +4895,85 @@ def admin_farm_chicken_upcoming_medications():
         """)
         medications = cursor.fetchall()
         
-        # Get all weight standards
-        cursor.execute("""
-            SELECT 
-                id,
-                category,
-                age_days,
-                expected_weight,
-                description,
-                created_at
-            FROM chicken_weight_standards 
-            ORDER BY category, age_days
-        """)
-        weight_standards = cursor.fetchall()
-        
-        # Create medication tracking table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_medication_tracking (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id VARCHAR(20) NOT NULL,
-                medication_id INT NOT NULL,
-                scheduled_date DATE NOT NULL,
-                completed_date DATE NULL,
-                status ENUM('pending', 'completed', 'missed') DEFAULT 'pending',
-                notes TEXT,
-                administered_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_medication_id (medication_id),
-                INDEX idx_status (status),
-                INDEX idx_scheduled_date (scheduled_date),
-                FOREIGN KEY (medication_id) REFERENCES chicken_medications(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # Get existing medication tracking records
-        cursor.execute("""
-            SELECT 
-                cmt.id,
-                cmt.chicken_id,
-                cmt.medication_id,
-                cmt.scheduled_date,
-                cmt.completed_date,
-                cmt.status,
-                cmt.notes,
-                cm.medication_name,
-                cm.category,
-                cm.purpose
-            FROM chicken_medication_tracking cmt
-            JOIN chicken_medications cm ON cmt.medication_id = cm.id
-            ORDER BY cmt.scheduled_date, cmt.chicken_id
-        """)
-        tracking_records = cursor.fetchall()
-        
-        # Group chickens by type
-        chickens_by_type = {'broiler': [], 'kienyeji': [], 'layer': []}
-        for chicken in chickens:
-            chickens_by_type[chicken['chicken_type']].append(chicken)
+        categories = sorted({medication['category'] for medication in medications})
+        chickens = []
+        completed_pairs = []
+        open_tracking = []
+        if categories:
+            placeholders = ', '.join(['%s'] * len(categories))
+            
+            # Get active chickens in categories that have medications
+            cursor.execute(f"""
+                SELECT 
+                    chicken_id,
+                    batch_name,
+                    chicken_type,
+                    breed_name,
+                    DATEDIFF(CURDATE(), hatch_date) AS age_days,
+                    coop_number,
+                    quantity
+                FROM chickens 
+                WHERE current_status = 'active' AND chicken_type IN ({placeholders})
+            """, categories)
+            chickens = cursor.fetchall()
+            
+            # First tracking record (by scheduled date) of each pair for the chickens and
+            # medications in scope; a completed one hides the pair, an open one is shown
+            # alongside the chicken
+            cursor.execute(f"""
+                SELECT id, chicken_id, medication_id, scheduled_date, completed_date, status, notes
+                FROM (
+                    SELECT 
+                        cmt.id, cmt.chicken_id, cmt.medication_id, cmt.scheduled_date,
+                        cmt.completed_date, cmt.status, cmt.notes,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY cmt.chicken_id, cmt.medication_id
+                            ORDER BY cmt.scheduled_date, cmt.id
+                        ) AS rn
+                    FROM chicken_medication_tracking cmt
+                    JOIN chickens c ON c.chicken_id = cmt.chicken_id
+                    JOIN chicken_medications cm ON cm.id = cmt.medication_id AND cm.category = c.chicken_type
+                    WHERE c.current_status = 'active' AND c.chicken_type IN ({placeholders})
+                ) AS first_tracking
+                WHERE rn = 1
+            """, categories)
+            for row in cursor.fetchall():
+                if row['status'] == 'completed':
+                    completed_pairs.append((row['chicken_id'], row['medication_id']))
+                else:
+                    open_tracking.append(row)
         
-        # Group medications by category
-        medications_by_category = {'broiler': [], 'kienyeji': [], 'layer': []}
-        for medication in medications:
-            medications_by_category[medication['category']].append(medication)
+        cursor.close()
+        conn.close()
         
-        # Group weight standards by category
-        weight_standards_by_category = {'broiler': [], 'kienyeji': [], 'layer': []}
-        for weight_standard in weight_standards:
-            weight_standards_by_category[weight_standard['category']].append(weight_standard)
+        schedule = ChickenMedicationSchedule(chickens, completed_pairs, open_tracking)
         
         # Create medications with their chickens list
         medications_with_chickens = []
-        
         for medication in medications:
-            eligible_chickens = []
+            matched_count = schedule.count(medication, urgency)
+            if not matched_count:
+                continue
             
-            # Find all chickens that need this medication
-            for chicken in chickens:
-                chicken_age = chicken['age_days']
-                
-                # Check if this medication is already tracked and completed for this chicken
-                existing_tracking = None
-                for tracking in tracking_records:
-                    if (tracking['chicken_id'] == chicken['chicken_id'] and 
-                        tracking['medication_id'] == medication['id']):
-                        existing_tracking = tracking
-                        break
-                
-                # Only include if not completed (regardless of age)
-                if not existing_tracking or existing_tracking['status'] != 'completed':
-                    # Calculate status and urgency
-                    if chicken_age <= medication['end_day']:
-                        # Chicken is still eligible (within or before the medication period)
-                        days_remaining = medication['end_day'] - chicken_age
-                        urgency = 'high' if days_remaining <= 2 else 'medium' if days_remaining <= 5 else 'low'
-                        status = 'eligible'
-                    else:
-                        # Chicken is past the medication period but still show it
-                        days_overdue = chicken_age - medication['end_day']
-                        urgency = 'overdue'
-                        status = 'overdue'
-                    
-                    eligible_chickens.append({
-                        'chicken': chicken,
-                        'tracking': existing_tracking,
-                        'days_remaining': medication['end_day'] - chicken_age,
-                        'days_overdue': max(0, chicken_age - medication['end_day']),
-                        'urgency': urgency,
-                        'status': status
-                    })
+            overdue_count = schedule.count(medication, 'overdue')
+            total_chickens = schedule.count(medication)
+            if overdue_count:
+                overall_urgency = 'overdue'
+            elif schedule.count(medication, 'high'):
+                overall_urgency = 'high'
+            else:
+                overall_urgency = 'medium'
             
-            # Only add medication if it has eligible chickens
-            if eligible_chickens:
-                # Calculate overall urgency for this medication
-                has_overdue = any(chicken['status'] == 'overdue' for chicken in eligible_chickens)
-                has_high_priority = any(chicken['urgency'] == 'high' for chicken in eligible_chickens)
-                
-                if has_overdue:
-                    overall_urgency = 'overdue'
-                elif has_high_priority:
-                    overall_urgency = 'high'
-                else:
-                    overall_urgency = 'medium'
-                
-                medications_with_chickens.append({
-                    'medication': medication,
-                    'chickens': eligible_chickens,
-                    'total_chickens': len(eligible_chickens),
-                    'overdue_count': len([c for c in eligible_chickens if c['status'] == 'overdue']),
-                    'eligible_count': len([c for c in eligible_chickens if c['status'] == 'eligible']),
-                    'overall_urgency': overall_urgency
-                })
+            total_pages = max(total_pages, (matched_count + per_page - 1) // per_page)
+            medications_with_chickens.append({
+                'medication': medication,
+                'chickens': schedule.match(medication, urgency, offset=(page - 1) * per_page, limit=per_page),
+                'total_chickens': total_chickens,
+                'matched_chickens': matched_count,
+                'overdue_count': overdue_count,
+                'eligible_count': total_chickens - overdue_count,
+                'overall_urgency': overall_urgency
+            })
         
         # Sort by urgency
         medications_with_chickens.sort(key=lambda x: (
@@ -3369,16 +4981,20 @@ def admin_farm_chicken_upcoming_medications():
             x['medication']['medication_name']
         ))
         
-        cursor.close()
-        conn.close()
-        
     except Exception as e:
         print(f"Error fetching upcoming medications data: {str(e)}")
         medications_with_chickens = []
     
     return render_template('admin_farm_chicken_upcoming_medications.html',
                          user=user_data,
-                         medications_with_chickens=medications_with_chickens)
+                         medications_with_chickens=medications_with_chickens,
+                         upcoming_medications=medications_with_chickens,
+                         pagination={
+                             'page': page,
+                             'per_page': per_page,
+                             'total_pages': total_pages,
+                             'urgency': urgency
+                         })
 
 @app.route('/admin/farm/chicken-health-analytics')
 def admin_farm_chicken_health_analytics():
@@ -3407,7 +5023,7 @@ def admin_farm_chicken_health_analytics():
                 breed_name,
                 gender,
                 hatch_date,
-                age_days,
+                DATEDIFF(CURDATE(), hatch_date) AS age_days,
                 source,
                 coop_number,
                 quantity,
@@ -3415,7 +5031,7 @@ def admin_farm_chicken_health_analytics():
                 registration_date
             FROM chickens 
             WHERE current_status = 'active'
-            ORDER BY chicken_type, age_days
+            ORDER BY chicken_type, hatch_date DESC
         """)
         chickens = cursor.fetchall()
         
@@ -3490,7 +5106,7 @@ def admin_farm_chicken_health_analytics():
             SELECT 
                 chicken_type,
                 COUNT(*) as total_chickens,
-                AVG(age_days) as avg_age,
+                AVG(DATEDIFF(CURDATE(), hatch_date)) as avg_age,
                 SUM(CASE WHEN gender = 'male' THEN 1 ELSE 0 END) as males,
                 SUM(CASE WHEN gender = 'female' THEN 1 ELSE 0 END) as females
             FROM chickens 
@@ -3569,6 +5185,20 @@ def admin_farm_chicken_production():
     
     return render_template('admin_farm_chicken_production.html', user=user_data)
 
+def load_meat_details(cursor, production_ids):
+    """Fetch meat details for many productions at once, grouped by production id"""
+    meat_details = {production_id: [] for production_id in production_ids}
+    for chunk, placeholders in in_list_chunks(meat_details):
+        cursor.execute(f"""
+            SELECT production_id, chicken_number, alive_weight, dead_weight
+            FROM chicken_meat_production
+            WHERE production_id IN ({placeholders})
+            ORDER BY production_id, chicken_number
+        """, chunk)
+        for row in cursor.fetchall():
+            meat_details[row.pop('production_id')].append(row)
+    return meat_details
+
 @app.route('/admin/farm/chicken-production-management')
 def admin_farm_chicken_production_management():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -3583,33 +5213,54 @@ def admin_farm_chicken_production_management():
         'email': f"{session['employee_name'].lower().replace(' ', '.')}@farm.com"
     }
     
+    # Date range filter and pagination
+    start_date = request.args.get('start_date', '').strip()
+    end_date = request.args.get('end_date', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), 200)
+    
+    where_clauses = []
+    params = []
+    try:
+        if start_date:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            where_clauses.append("cp.production_date >= %s")
+            params.append(start_date)
+        if end_date:
+            datetime.strptime(end_date, '%Y-%m-%d')
+            where_clauses.append("cp.production_date <= %s")
+            params.append(end_date)
+    except ValueError:
+        where_clauses, params = [], []
+        start_date = end_date = ''
+    where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    
     # Fetch production data
     conn = None
     cursor = None
+    total_pages = 1
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create audit table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_production_audit (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                production_id INT NOT NULL,
-                chicken_id VARCHAR(50) NOT NULL,
-                production_type ENUM('eggs', 'meat') NOT NULL,
-                field_name VARCHAR(50) NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                edited_by INT NOT NULL,
-                edited_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_production_id (production_id),
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_edited_at (edited_at)
-            )
-        """)
-        
-        # Get all production records with chicken details and edit status
-        cursor.execute("""
+        # Statistics over the whole filtered range in one aggregate
+        cursor.execute(f"""
+            SELECT 
+                COUNT(*) as total_productions,
+                COALESCE(SUM(cp.production_type = 'eggs'), 0) as egg_productions,
+                COALESCE(SUM(cp.production_type = 'meat'), 0) as meat_productions,
+                COALESCE(SUM(CASE WHEN cp.production_type = 'eggs' THEN cp.quantity ELSE 0 END), 0) as total_eggs,
+                COALESCE(SUM(CASE WHEN cp.production_type = 'meat' THEN cp.quantity ELSE 0 END), 0) as total_meat_chickens,
+                COALESCE(SUM(cp.production_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)), 0) as recent_productions
+            FROM chicken_production cp
+            {where_sql}
+        """, params)
+        stats = {key: int(value) for key, value in cursor.fetchone().items()}
+        total_pages = max(1, (stats['total_productions'] + per_page - 1) // per_page)
+        page = min(page, total_pages)
+        
+        # Get one page of production records with chicken details and edit status
+        cursor.execute(f"""
             SELECT 
                 cp.id,
                 cp.production_type,
@@ -3626,8 +5277,10 @@ def admin_farm_chicken_production_management():
                 CASE WHEN EXISTS(SELECT 1 FROM chicken_production_audit WHERE production_id = cp.id) THEN 1 ELSE 0 END as is_edited
             FROM chicken_production cp
             LEFT JOIN chickens c ON cp.chicken_id COLLATE utf8mb4_unicode_ci = c.chicken_id COLLATE utf8mb4_unicode_ci
-            ORDER BY cp.created_at DESC
-        """)
+            {where_sql}
+            ORDER BY cp.created_at DESC, cp.id DESC
+            LIMIT %s OFFSET %s
+        """, params + [per_page, (page - 1) * per_page])
         productions = cursor.fetchall()
         
         # Convert timedelta to time string for display
@@ -3645,44 +5298,10 @@ def admin_farm_chicken_production_management():
             else:
                 production['production_time_str'] = str(production['production_time'])
         
-        # Get meat production details for meat productions
-        meat_productions = []
+        # Get meat production details for this page's meat productions in one query
+        meat_details = load_meat_details(cursor, [p['id'] for p in productions if p['production_type'] == 'meat'])
         for production in productions:
-            if production['production_type'] == 'meat':
-                cursor.execute("""
-                    SELECT chicken_number, alive_weight, dead_weight
-                    FROM chicken_meat_production
-                    WHERE production_id = %s
-                    ORDER BY chicken_number
-                """, (production['id'],))
-                meat_details = cursor.fetchall()
-                production['meat_details'] = meat_details
-            else:
-                production['meat_details'] = []
-        
-        # Calculate statistics
-        total_productions = len(productions)
-        egg_productions = len([p for p in productions if p['production_type'] == 'eggs'])
-        meat_productions_count = len([p for p in productions if p['production_type'] == 'meat'])
-        total_eggs = sum(p['quantity'] for p in productions if p['production_type'] == 'eggs')
-        total_meat_chickens = sum(p['quantity'] for p in productions if p['production_type'] == 'meat')
-        
-        # Get recent productions (last 7 days)
-        cursor.execute("""
-            SELECT COUNT(*) as recent_count
-            FROM chicken_production
-            WHERE production_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
-        """)
-        recent_productions = cursor.fetchone()['recent_count']
-        
-        stats = {
-            'total_productions': total_productions,
-            'egg_productions': egg_productions,
-            'meat_productions': meat_productions_count,
-            'total_eggs': total_eggs,
-            'total_meat_chickens': total_meat_chickens,
-            'recent_productions': recent_productions
-        }
+            production['meat_details'] = meat_details.get(production['id'], [])
         
     except Exception as e:
         print(f"Error fetching production data: {str(e)}")
@@ -3704,7 +5323,13 @@ def admin_farm_chicken_production_management():
     return render_template('admin_farm_chicken_production_management.html', 
                          user=user_data, 
                          productions=productions, 
-                         stats=stats)
+                         stats=stats,
+                         filters={'start_date': start_date, 'end_date': end_date},
+                         pagination={
+                             'page': page,
+                             'per_page': per_page,
+                             'total_pages': total_pages
+                         })
 
 @app.route('/admin/farm/chicken-production-edit/<int:production_id>', methods=['GET'])
 def admin_farm_chicken_production_edit(production_id):
@@ -3890,6 +5515,7 @@ def admin_farm_chicken_production_update(production_id):
         return jsonify({'success': False, 'message': f'Server error: {str(e)}'})
 
 @app.route('/admin/farm/chicken-production-delete/<int:production_id>', methods=['DELETE'])
+@invalidates('chickens')
 def admin_farm_chicken_production_delete(production_id):
     """Delete production record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -3927,6 +5553,7 @@ def admin_farm_chicken_production_delete(production_id):
         cursor.execute("DELETE FROM chicken_production WHERE id = %s", (production_id,))
         
         conn.commit()
+        refresh_search_entry('chicken', code=production['chicken_id'])
         return jsonify({'success': True, 'message': 'Production deleted successfully'})
         
     except Exception as e:
@@ -4113,19 +5740,10 @@ def admin_farm_chicken_production_history(chicken_id):
         """, (chicken_id,))
         productions = cursor.fetchall()
         
-        # Get meat production details for meat productions
+        # Get meat production details for all meat productions in one query
+        meat_details = load_meat_details(cursor, [p['id'] for p in productions if p['production_type'] == 'meat'])
         for production in productions:
-            if production['production_type'] == 'meat':
-                cursor.execute("""
-                    SELECT chicken_number, alive_weight, dead_weight
-                    FROM chicken_meat_production
-                    WHERE production_id = %s
-                    ORDER BY chicken_number
-                """, (production['id'],))
-                meat_details = cursor.fetchall()
-                production['meat_details'] = meat_details
-            else:
-                production['meat_details'] = []
+            production['meat_details'] = meat_details.get(production['id'], [])
         
         # Convert time to string for JSON serialization
         for production in productions:
@@ -4156,6 +5774,98 @@ def admin_farm_chicken_production_history(chicken_id):
         if conn:
             conn.close()
 
+# In-process search index settings
+SEARCH_INDEX_CONFIG = {
+    'check_seconds': float(os.environ.get('SEARCH_INDEX_CHECK_SECONDS', 5)),  # How long a worker trusts its index without asking MySQL
+    'limit': int(os.environ.get('SEARCH_INDEX_LIMIT', 10))  # Hits returned per lookup
+}
+
+class ChickenSearchIndex:
+    """Typeahead index over active chickens, per category.
+    
+    Every substring of chicken_id and every prefix of each word of
+    batch_name and breed_name is a key mapping to the chickens it matches
+    and how well (exact ID, ID prefix, ID substring, batch word, breed word).
+    A lookup is one dict access per query word plus ranking the hits.
+    """
+    
+    RANK_EXACT_ID, RANK_ID_PREFIX, RANK_ID_SUBSTRING, RANK_BATCH, RANK_BREED = range(5)
+    
+    def __init__(self, chickens):
+        self.chickens = {}
+        self.terms = {}
+        for chicken in chickens:
+            category_chickens = self.chickens.setdefault(chicken['chicken_type'], [])
+            terms = self.terms.setdefault(chicken['chicken_type'], {})
+            position = len(category_chickens)
+            category_chickens.append(chicken)
+            for term, rank in self._terms_for(chicken):
+                matches = terms.setdefault(term, {})
+                if position not in matches or rank < matches[position]:
+                    matches[position] = rank
+    
+    def _terms_for(self, chicken):
+        chicken_id = chicken['chicken_id'].lower()
+        for start in range(len(chicken_id)):
+            for end in range(start + 1, len(chicken_id) + 1):
+                if start == 0:
+                    rank = self.RANK_EXACT_ID if end == len(chicken_id) else self.RANK_ID_PREFIX
+                else:
+                    rank = self.RANK_ID_SUBSTRING
+                yield chicken_id[start:end], rank
+        for field, rank in (('batch_name', self.RANK_BATCH), ('breed_name', self.RANK_BREED)):
+            for word in (chicken[field] or '').lower().split():
+                for end in range(1, len(word) + 1):
+                    yield word[:end], rank
+    
+    def search(self, category, query, limit):
+        """Best matches for every word of query, best rank first"""
+        terms = self.terms.get(category)
+        words = query.lower().split()
+        if not terms or not words:
+            return []
+        scores = dict(terms.get(words[0], {}))
+        for word in words[1:]:
+            matches = terms.get(word, {})
+            scores = {position: score + matches[position] for position, score in scores.items() if position in matches}
+        chickens = self.chickens[category]
+        ranked = heapq.nsmallest(limit, scores, key=lambda position: (scores[position], chickens[position]['chicken_id']))
+        today = datetime.now().date()
+        results = []
+        for position in ranked:
+            chicken = chickens[position]
+            results.append({
+                'chicken_id': chicken['chicken_id'],
+                'batch_name': chicken['batch_name'],
+                'breed_name': chicken['breed_name'],
+                'gender': chicken['gender'],
+                'age_days': (today - chicken['hatch_date']).days if chicken['hatch_date'] else None,
+                'coop_number': chicken['coop_number'],
+                'quantity': chicken['quantity']
+            })
+        return results
+
+chicken_search_cache = VersionedCache('chicken_search', ('chickens',), check_interval=SEARCH_INDEX_CONFIG['check_seconds'])
+
+def build_chicken_search_index(cursor):
+    """Load active chickens into a ChickenSearchIndex"""
+    cursor.execute("""
+        SELECT chicken_id, chicken_type, batch_name, breed_name, gender, hatch_date, coop_number, quantity
+        FROM chickens
+        WHERE current_status = 'active'
+    """)
+    return ChickenSearchIndex(cursor.fetchall())
+
+def get_chicken_search_index():
+    """Shared ChickenSearchIndex; MySQL is only asked once per check interval"""
+    index = chicken_search_cache.get_recent()
+    if index is None:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            index = chicken_search_cache.get(cursor, build_chicken_search_index)
+            cursor.close()
+    return index
+
 @app.route('/api/chickens/search')
 def api_chickens_search():
     """API endpoint for searching chickens by category and ID"""
@@ -4165,65 +5875,245 @@ def api_chickens_search():
     category = request.args.get('category')
     query = request.args.get('query', '').strip()
     
-    print(f"Chicken search request: category={category}, query={query}")
-    
     if not category or not query:
-        print("Missing category or query")
         return jsonify([])
     
-    conn = None
-    cursor = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # First, let's check if there are any chickens at all
-        cursor.execute("SELECT COUNT(*) as total FROM chickens WHERE current_status = 'active'")
-        total_chickens = cursor.fetchone()
-        print(f"Total active chickens in database: {total_chickens['total']}")
-        
-        # Search for chickens by category and ID (partial match)
-        search_pattern = f'%{query}%'
-        print(f"Searching with pattern: {search_pattern}")
-        
-        cursor.execute("""
-            SELECT chicken_id, batch_name, breed_name, gender, age_days, coop_number, quantity
-            FROM chickens 
-            WHERE chicken_type = %s 
-            AND current_status = 'active' 
-            AND chicken_id LIKE %s
-            ORDER BY chicken_id
-            LIMIT 10
-        """, (category, search_pattern))
-        
-        chickens = cursor.fetchall()
-        print(f"Found {len(chickens)} chickens matching search criteria")
-        
-        # If no results, let's show all chickens of that category for debugging
-        if len(chickens) == 0:
-            cursor.execute("""
-                SELECT chicken_id, batch_name, breed_name, gender, age_days, coop_number, quantity
-                FROM chickens 
-                WHERE chicken_type = %s 
-                AND current_status = 'active'
-                ORDER BY chicken_id
-                LIMIT 5
-            """, (category,))
-            all_chickens = cursor.fetchall()
-            print(f"All chickens of type {category}: {[c['chicken_id'] for c in all_chickens]}")
-        
-        return jsonify(chickens)
+        limit = max(1, min(request.args.get('limit', SEARCH_INDEX_CONFIG['limit'], type=int), 50))
+        return jsonify(get_chicken_search_index().search(category, query, limit))
         
     except Exception as e:
         print(f"Error searching chickens: {str(e)}")
         return jsonify({'error': str(e)})
-    finally:
-        if cursor:
+
+# Species covered by /api/search: source query (id, code, name, status) and
+# deep links for a hit. Page links carry a #<type>-<id> fragment for the
+# management pages to focus the record.
+SEARCH_ENTITIES = {
+    'pig': {
+        'table': 'pigs',
+        'select': "SELECT id, tag_id AS code, name, status FROM pigs",
+        'code_column': 'tag_id',
+        'url': lambda hit: url_for('admin_farm_pig_management') + f"#pig-{hit['id']}",
+        'api_url': lambda hit: url_for('get_pig_details', pig_id=hit['id'])
+    },
+    'litter': {
+        'table': 'litters',
+        'select': "SELECT id, litter_id AS code, NULL AS name, status FROM litters",
+        'code_column': 'litter_id',
+        'url': lambda hit: url_for('admin_farm_litters') + f"#litter-{hit['id']}",
+        'api_url': lambda hit: url_for('get_litter_details', litter_id=hit['id'])
+    },
+    'cow': {
+        'table': 'cows',
+        'select': "SELECT id, ear_tag AS code, name, status FROM cows",
+        'code_column': 'ear_tag',
+        'url': lambda hit: url_for('cow_detail_page', cow_id=hit['id']),
+        'api_url': lambda hit: url_for('get_cow_details', cow_id=hit['id'])
+    },
+    'calf': {
+        'table': 'calves',
+        'select': "SELECT id, calf_id AS code, name, status FROM calves",
+        'code_column': 'calf_id',
+        'url': lambda hit: url_for('admin_farm_cow_management') + f"#calf-{hit['id']}",
+        'api_url': lambda hit: None
+    },
+    'chicken': {
+        'table': 'chickens',
+        'select': "SELECT id, chicken_id AS code, batch_name AS name, current_status AS status FROM chickens",
+        'code_column': 'chicken_id',
+        'url': lambda hit: url_for('admin_farm_chicken_detail', chicken_id=hit['code']),
+        'api_url': lambda hit: url_for('get_chicken_audit_trail', chicken_id=hit['code'])
+    }
+}
+
+class SearchIndex:
+    """Inverted index over identifiers and names of every species.
+    
+    Keys are (entity_type, id). Terms are the prefixes of the identifier, of
+    its letter and number runs (with and without leading zeros, so "12"
+    finds P0012) and of each word of the name, each with a rank: exact
+    identifier, identifier prefix, whole part, part prefix, name.
+    
+    A species is reloaded when its table version moves. That is checked at
+    most once per SEARCH_INDEX_CONFIG['check_seconds'], and write routes
+    patch single entries in between through refresh_search_entry().
+    """
+    
+    RANK_EXACT, RANK_PREFIX, RANK_PART, RANK_PART_PREFIX, RANK_NAME = range(5)
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.postings = {}
+        self.versions = {}
+        self.checked_at = 0.0
+    
+    def _terms_for(self, code, name):
+        code = (code or '').lower()
+        terms = {}
+        if code:
+            terms[code] = self.RANK_EXACT
+        for end in range(1, len(code)):
+            terms.setdefault(code[:end], self.RANK_PREFIX)
+        for part in re.findall(r'[a-z]+|\d+', code):
+            for variant in (part, part.lstrip('0')):
+                if variant:
+                    terms.setdefault(variant, self.RANK_PART)
+                for end in range(1, len(variant)):
+                    terms.setdefault(variant[:end], self.RANK_PART_PREFIX)
+        for word in re.findall(r'\w+', (name or '').lower()):
+            for end in range(1, len(word) + 1):
+                terms.setdefault(word[:end], self.RANK_NAME)
+        return terms
+    
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for term in entry['terms']:
+            matches = self.postings.get(term)
+            if matches is not None:
+                matches.pop(key, None)
+                if not matches:
+                    del self.postings[term]
+    
+    def _add(self, entity_type, row):
+        key = (entity_type, row['id'])
+        self._remove(key)
+        terms = self._terms_for(row['code'], row['name'])
+        self.entries[key] = {'code': row['code'], 'name': row['name'], 'status': row['status'], 'terms': terms}
+        for term, rank in terms.items():
+            self.postings.setdefault(term, {})[key] = rank
+    
+    def load(self, cursor, entity_type):
+        """Replace every entry of one species from its table"""
+        cursor.execute(SEARCH_ENTITIES[entity_type]['select'])
+        rows = cursor.fetchall()
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == entity_type]:
+                self._remove(key)
+            for row in rows:
+                self._add(entity_type, row)
+    
+    def refresh(self, cursor, entity_type, record_id=None, code=None):
+        """Re-read one record by id or identifier; a missing id is removed"""
+        entity = SEARCH_ENTITIES[entity_type]
+        if record_id is not None:
+            cursor.execute(entity['select'] + " WHERE id = %s", (record_id,))
+        else:
+            cursor.execute(entity['select'] + f" WHERE {entity['code_column']} = %s", (code,))
+        row = cursor.fetchone()
+        with self._lock:
+            if row:
+                self._add(entity_type, row)
+            elif record_id is not None:
+                self._remove((entity_type, record_id))
+    
+    def search(self, query, entity_types, limit):
+        """Entries matching every word of query, best rank then active first"""
+        words = query.lower().split()
+        if not words:
+            return []
+        with self._lock:
+            scores = {key: rank for key, rank in self.postings.get(words[0], {}).items() if key[0] in entity_types}
+            for word in words[1:]:
+                matches = self.postings.get(word, {})
+                scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+            ranked = heapq.nsmallest(limit, scores, key=lambda key: (
+                scores[key], self.entries[key]['status'] != 'active', self.entries[key]['code'] or ''
+            ))
+            hits = []
+            for entity_type, record_id in ranked:
+                entry = self.entries[(entity_type, record_id)]
+                hits.append({
+                    'type': entity_type,
+                    'id': record_id,
+                    'code': entry['code'],
+                    'name': entry['name'],
+                    'status': entry['status'],
+                    'rank': scores[(entity_type, record_id)]
+                })
+        return hits
+
+_search_index = None
+_search_index_pid = None
+_search_index_lock = threading.Lock()
+
+def get_search_index():
+    """This worker's SearchIndex, built on first use and synced with table_versions"""
+    global _search_index, _search_index_pid
+    if _search_index is None or _search_index_pid != os.getpid():
+        with _search_index_lock:
+            if _search_index is None or _search_index_pid != os.getpid():
+                _search_index = SearchIndex()
+                _search_index_pid = os.getpid()
+    index = _search_index
+    if time.monotonic() - index.checked_at < SEARCH_INDEX_CONFIG['check_seconds']:
+        return index
+    
+    with _search_index_lock:
+        if time.monotonic() - index.checked_at < SEARCH_INDEX_CONFIG['check_seconds']:
+            return index
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            entity_types = list(SEARCH_ENTITIES)
+            versions = get_table_versions(cursor, *[SEARCH_ENTITIES[t]['table'] for t in entity_types])
+            for entity_type, version in zip(entity_types, versions):
+                if index.versions.get(entity_type) != version:
+                    index.load(cursor, entity_type)
+                    index.versions[entity_type] = version
             cursor.close()
-        if conn:
-            conn.close()
+        index.checked_at = time.monotonic()
+    return index
+
+def refresh_search_entry(entity_type, record_id=None, code=None):
+    """Patch one record into this worker's search index after a write.
+    
+    Other workers pick the change up from table_versions; this only makes
+    the writer's own index current before its next version check.
+    """
+    index = _search_index
+    if index is None or _search_index_pid != os.getpid():
+        return
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            index.refresh(cursor, entity_type, record_id=record_id, code=code)
+            cursor.close()
+    except Exception as e:
+        print(f"Error refreshing search entry {entity_type} {record_id or code}: {str(e)}")
+
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """Look up pigs, litters, cows, calves and chickens by identifier or name"""
+    if 'employee_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    query = request.args.get('q', '').strip()
+    types = request.args.get('types')
+    entity_types = set(SEARCH_ENTITIES)
+    if types:
+        entity_types &= {t.strip() for t in types.split(',')}
+    limit = max(1, min(request.args.get('limit', SEARCH_INDEX_CONFIG['limit'], type=int), 100))
+    
+    if not query or not entity_types:
+        return jsonify({'success': True, 'query': query, 'hits': []})
+    
+    try:
+        hits = get_search_index().search(query, entity_types, limit)
+        for hit in hits:
+            entity = SEARCH_ENTITIES[hit['type']]
+            hit['url'] = entity['url'](hit)
+            hit['api_url'] = entity['api_url'](hit)
+        return jsonify({'success': True, 'query': query, 'hits': hits})
+        
+    except Exception as e:
+        print(f"Error searching animals: {str(e)}")
+        return jsonify({'success': False, 'message': f'Search failed: {str(e)}'})
 
 @app.route('/admin/farm/chicken-production-register', methods=['POST'])
+@invalidates('chickens')
 def admin_farm_chicken_production_register():
     """Handle production registration form submission"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -4244,37 +6134,6 @@ def admin_farm_chicken_production_register():
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            # Create chicken_production table if it doesn't exist
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS chicken_production (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    production_type ENUM('eggs', 'meat') NOT NULL,
-                    chicken_id VARCHAR(50) NOT NULL,
-                    chicken_category VARCHAR(20) NOT NULL,
-                    production_date DATE NOT NULL,
-                    production_time TIME NOT NULL,
-                    quantity INT NOT NULL,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_by INT,
-                    INDEX idx_chicken_id (chicken_id),
-                    INDEX idx_production_date (production_date),
-                    INDEX idx_production_type (production_type)
-                )
-            """)
-            
-            # Create chicken_meat_production table if it doesn't exist
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS chicken_meat_production (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    production_id INT,
-                    chicken_number INT NOT NULL,
-                    alive_weight DECIMAL(6,3) NOT NULL,
-                    dead_weight DECIMAL(6,3) NOT NULL,
-                    FOREIGN KEY (production_id) REFERENCES chicken_production(id) ON DELETE CASCADE
-                )
-            """)
-            
             # Insert production record
             production_date = data.get('egg_collection_date') or data.get('slaughter_date')
             production_time = data.get('egg_collection_time') or data.get('slaughter_time')
@@ -4354,6 +6213,7 @@ def admin_farm_chicken_production_register():
                         return jsonify({'success': False, 'message': f'Chicken {data["chicken_id_search"]} not found in database'})
             
             conn.commit()
+            refresh_search_entry('chicken', code=data['chicken_id_search'])
             return jsonify({'success': True, 'message': 'Production registered successfully'})
             
         except Exception as e:
@@ -4397,7 +6257,7 @@ def admin_farm_chicken_detail(chicken_id):
                 breed_name,
                 gender,
                 hatch_date,
-                age_days,
+                DATEDIFF(CURDATE(), hatch_date) AS age_days,
                 source,
                 coop_number,
                 quantity,
@@ -4476,27 +6336,24 @@ def admin_farm_chicken_detail(chicken_id):
         
         upcoming_medications = cursor.fetchall()
         
-        # Get upcoming weight checks for this chicken
+        # Get upcoming weight checks for this chicken from the shared standard index
+        stage_index = get_chicken_stage_index(cursor)
         cursor.execute("""
-            SELECT 
-                cws.id,
-                cws.age_days,
-                cws.expected_weight,
-                cws.description,
-                CASE 
-                    WHEN %s >= cws.age_days THEN 'ready'
-                    ELSE 'pending'
-                END as status
-            FROM chicken_weight_standards cws
-            WHERE cws.category = %s
-            AND NOT EXISTS (
-                SELECT 1 FROM chicken_weight_tracking cwt 
-                WHERE cwt.chicken_id = %s AND cwt.weight_standard_id = cws.id
-            )
-            ORDER BY cws.age_days
-        """, (chicken['age_days'], chicken['chicken_type'], chicken_id))
-        
-        upcoming_weight_checks = cursor.fetchall()
+            SELECT weight_standard_id FROM chicken_weight_tracking WHERE chicken_id = %s
+        """, (chicken_id,))
+        checked_standard_ids = {row['weight_standard_id'] for row in cursor.fetchall()}
+        
+        upcoming_weight_checks = []
+        for standard in stage_index.standards_by_category.get(chicken['chicken_type'], []):
+            if standard['id'] in checked_standard_ids:
+                continue
+            upcoming_weight_checks.append({
+                'id': standard['id'],
+                'age_days': standard['age_days'],
+                'expected_weight': standard['expected_weight'],
+                'description': standard['description'],
+                'status': 'ready' if chicken['age_days'] >= standard['age_days'] else 'pending'
+            })
         
         cursor.close()
         conn.close()
@@ -4514,6 +6371,7 @@ def admin_farm_chicken_detail(chicken_id):
                          upcoming_weight_checks=upcoming_weight_checks)
 
 @app.route('/admin/farm/chicken-weight-standard', methods=['POST'])
+@invalidates('chicken_weight_standards')
 def add_chicken_weight_standard():
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'success': False, 'message': 'Unauthorized access'})
@@ -4530,23 +6388,6 @@ def add_chicken_weight_standard():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chicken_weight_standards table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_weight_standards (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                age_days INT NOT NULL,
-                expected_weight DECIMAL(6,3) NOT NULL COMMENT 'Weight in kilograms',
-                description TEXT,
-                created_by INT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_category (category),
-                INDEX idx_age_days (age_days),
-                UNIQUE KEY unique_category_age (category, age_days)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Check if weight standard already exists for this category and age
         cursor.execute("""
             SELECT id FROM chicken_weight_standards 
@@ -4636,7 +6477,7 @@ def debug_medications():
         medication_count = cursor.fetchone()['count']
         
         # Get sample data
-        cursor.execute("SELECT chicken_id, age_days, chicken_type FROM chickens WHERE current_status = 'active' LIMIT 5")
+        cursor.execute("SELECT chicken_id, DATEDIFF(CURDATE(), hatch_date) AS age_days, chicken_type FROM chickens WHERE current_status = 'active' LIMIT 5")
         sample_chickens = cursor.fetchall()
         
         cursor.execute("SELECT medication_name, start_day, end_day, category FROM chicken_medications LIMIT 5")
@@ -5179,7 +7020,8 @@ def approve_employee():
         
         # Log activity
         log_activity(session['employee_id'], 'EMPLOYEE_APPROVAL', 
-                    f'Employee {employee_id} {action_desc}')
+                    f'Employee {employee_id} {action_desc}',
+                    entity_type='employee', entity_id=employee_id)
         
         cursor.close()
         conn.close()
@@ -5207,7 +7049,8 @@ def update_employee_status():
         
         # Log activity
         log_activity(session['employee_id'], 'STATUS_UPDATE', 
-                    f'Employee {employee_id} status changed to {new_status}')
+                    f'Employee {employee_id} status changed to {new_status}',
+                    entity_type='employee', entity_id=employee_id)
         
         cursor.close()
         conn.close()
@@ -5255,7 +7098,8 @@ def update_employee():
         
         # Log activity
         log_activity(session['employee_id'], 'EMPLOYEE_UPDATE', 
-                    f'Employee {employee_id} details updated')
+                    f'Employee {employee_id} details updated',
+                    entity_type='employee', entity_id=employee_id)
         
         cursor.close()
         conn.close()
@@ -5282,7 +7126,8 @@ def update_permissions():
         
         # Log activity
         log_activity(session['employee_id'], 'PERMISSION_UPDATE', 
-                    f'Employee {employee_id} permissions updated')
+                    f'Employee {employee_id} permissions updated',
+                    entity_type='employee', entity_id=employee_id)
         
         cursor.close()
         conn.close()
@@ -5311,7 +7156,8 @@ def update_finance():
         
         # Log activity
         log_activity(session['employee_id'], 'FINANCE_UPDATE', 
-                    f'Employee {employee_id} finance details updated')
+                    f'Employee {employee_id} finance details updated',
+                    entity_type='employee', entity_id=employee_id)
         
         cursor.close()
         conn.close()
@@ -5362,7 +7208,8 @@ def register_farm():
         
         # Log activity
         log_activity(session['employee_id'], 'FARM_REGISTRATION', 
-                    f'New farm "{farm_name}" registered at {farm_location}')
+                    f'New farm "{farm_name}" registered at {farm_location}',
+                    entity_type='farm', entity_id=farm_id)
         
         conn.commit()
         cursor.close()
@@ -5593,6 +7440,7 @@ def get_farm_litters(farm_id):
 
 # Pig Management API Routes
 @app.route('/api/pig/register', methods=['POST'])
+@invalidates('pigs')
 def register_pig():
     """Register a new pig"""
     if 'employee_id' not in session:
@@ -5643,7 +7491,7 @@ def register_pig():
         # Determine breeding status for grown pigs based on age
         breeding_status = None
         if pig_type == 'grown_pig' and purpose == 'breeding' and age_days is not None:
-            breeding_status = 'available' if age_days >= 200 else 'young'
+            breeding_status = 'available' if age_days >= PIG_BREEDING_AGE_DAYS else 'young'
         elif pig_type == 'grown_pig' and purpose == 'meat':
             breeding_status = None  # Meat pigs don't have breeding status
         
@@ -5657,26 +7505,31 @@ def register_pig():
             conn.close()
             return jsonify({'success': False, 'message': 'Farm not found or inactive'})
         
-        # Generate unique tag ID
-        tag_id = generate_pig_tag_id(pig_type)
-        print(f"Generated tag ID: {tag_id} for pig type: {pig_type}")
-        
-        # Insert new pig
-        print(f"Inserting pig with data: tag_id={tag_id}, farm_id={farm_id}, pig_type={pig_type}, pig_source={pig_source}, breed={breed}, gender={gender}, purpose={purpose}, breeding_status={breeding_status}, birth_date={birth_date}, purchase_date={purchase_date}, age_days={age_days}, registered_by={session['employee_id']}")
-        
-        cursor.execute("""
-            INSERT INTO pigs (tag_id, farm_id, pig_type, pig_source, breed, gender, purpose, breeding_status, birth_date, purchase_date, age_days, registered_by)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (tag_id, farm_id, pig_type, pig_source, breed, gender, purpose, breeding_status, birth_date, purchase_date, age_days, session['employee_id']))
-        
-        pig_id = cursor.lastrowid
+        # The tag ID is allocated in the same transaction as the insert, so a
+        # failed insert hands it back; generate_pig_tag_id() reuses the same
+        # request connection
+        with db_transaction():
+            tag_id = generate_pig_tag_id(pig_type)
+            print(f"Generated tag ID: {tag_id} for pig type: {pig_type}")
+            
+            # Insert new pig
+            print(f"Inserting pig with data: tag_id={tag_id}, farm_id={farm_id}, pig_type={pig_type}, pig_source={pig_source}, breed={breed}, gender={gender}, purpose={purpose}, breeding_status={breeding_status}, birth_date={birth_date}, purchase_date={purchase_date}, age_days={age_days}, registered_by={session['employee_id']}")
+            
+            cursor.execute("""
+                INSERT INTO pigs (tag_id, farm_id, pig_type, pig_source, breed, gender, purpose, breeding_status, birth_date, purchase_date, age_days, registered_by)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (tag_id, farm_id, pig_type, pig_source, breed, gender, purpose, breeding_status, birth_date, purchase_date, age_days, session['employee_id']))
+            
+            pig_id = cursor.lastrowid
         print(f"Pig inserted successfully with ID: {pig_id}")
         
         # Log activity
         log_activity(session['employee_id'], 'PIG_REGISTRATION', 
-                    f'New {pig_type} registered with tag {tag_id} at farm {farm_id}')
+                    f'New {pig_type} registered with tag {tag_id} at farm {farm_id}',
+                    entity_type='pig', entity_id=pig_id)
         
         conn.commit()
+        refresh_search_entry('pig', pig_id)
         cursor.close()
         conn.close()
         
@@ -5748,34 +7601,103 @@ def get_pig_registration_stats():
         print(f"Error getting pig registration stats: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Columns the pig list pages actually render
+PIG_LIST_COLUMNS = """
+    p.id, p.tag_id, p.farm_id, p.pig_type, p.pig_source, p.breed, p.gender, p.purpose,
+    p.breeding_status, p.birth_date, p.purchase_date, p.age_days, p.status, p.is_edited,
+    p.registered_by, p.created_at, f.farm_name, e.full_name as registered_by_name
+"""
+PIG_LIST_FILTERS = ['farm_id', 'pig_type', 'gender', 'breeding_status', 'purpose']
+PIG_LIST_MAX_LIMIT = 500
+PIG_LIST_COUNT_CAP = 10000  # Totals above this are reported as an estimate
+
+def encode_pig_list_cursor(pig):
+    """Opaque keyset cursor for the (created_at, id) position after a pig"""
+    position = f"{pig['created_at'].strftime('%Y-%m-%d %H:%M:%S')}|{pig['id']}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_pig_list_cursor(cursor_value):
+    """Return (created_at, id) from a cursor made by encode_pig_list_cursor"""
+    created_at, pig_id = base64.urlsafe_b64decode(cursor_value.encode()).decode().split('|')
+    return datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S'), int(pig_id)
+
 @app.route('/api/pig/list', methods=['GET'])
 def get_pigs_list():
-    """Get all pigs for display"""
+    """Get active pigs for display.
+    
+    Optional filters: farm_id, pig_type, gender, breeding_status, purpose and
+    q (part of the tag ID). Passing limit switches to keyset pagination,
+    newest first; follow next_cursor (sent back as cursor) for more pages.
+    """
     if 'employee_id' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
+    where_clauses = ["p.status = 'active'"]
+    params = []
+    for field in PIG_LIST_FILTERS:
+        value = request.args.get(field)
+        if value:
+            where_clauses.append(f"p.{field} = %s")
+            params.append(value)
+    search = request.args.get('q', '').strip()
+    if search:
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        where_clauses.append("p.tag_id LIKE %s")
+        params.append(f"%{escaped}%")
+    
+    limit = request.args.get('limit', type=int)
+    cursor_value = request.args.get('cursor')
+    keyset_clauses = list(where_clauses)
+    keyset_params = list(params)
+    if limit is not None:
+        limit = min(max(limit, 1), PIG_LIST_MAX_LIMIT)
+        if cursor_value:
+            try:
+                after_created_at, after_id = decode_pig_list_cursor(cursor_value)
+            except Exception:
+                return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+            keyset_clauses.append("(p.created_at < %s OR (p.created_at = %s AND p.id < %s))")
+            keyset_params += [after_created_at, after_created_at, after_id]
+    
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get all pigs with farm and registration information
-        cursor.execute("""
-            SELECT p.*, f.farm_name, e.full_name as registered_by_name 
+        # Get pigs with farm and registration information
+        cursor.execute(f"""
+            SELECT {PIG_LIST_COLUMNS}
             FROM pigs p 
             LEFT JOIN farms f ON p.farm_id = f.id 
             LEFT JOIN employees e ON p.registered_by = e.id 
-            WHERE p.status = 'active'
-            ORDER BY p.created_at DESC
-        """)
+            WHERE {' AND '.join(keyset_clauses)}
+            ORDER BY p.created_at DESC, p.id DESC
+            {'LIMIT %s' if limit is not None else ''}
+        """, keyset_params + ([limit + 1] if limit is not None else []))
         pigs = cursor.fetchall()
         
+        response = {'success': True}
+        if limit is not None:
+            has_more = len(pigs) > limit
+            pigs = pigs[:limit]
+            response['has_more'] = has_more
+            response['next_cursor'] = encode_pig_list_cursor(pigs[-1]) if has_more else None
+            
+            # Total only on the first page, counted up to a cap so it stays cheap
+            if not cursor_value:
+                cursor.execute(f"""
+                    SELECT COUNT(*) as total FROM (
+                        SELECT 1 FROM pigs p WHERE {' AND '.join(where_clauses)} LIMIT %s
+                    ) as matching
+                """, params + [PIG_LIST_COUNT_CAP + 1])
+                total = cursor.fetchone()['total']
+                response['total'] = min(total, PIG_LIST_COUNT_CAP)
+                response['total_is_estimate'] = total > PIG_LIST_COUNT_CAP
+        
         cursor.close()
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'pigs': pigs
-        })
+        response['pigs'] = pigs
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -5793,8 +7715,12 @@ def generate_tag_id():
         if not pig_type or pig_type not in ['grown_pig', 'piglet', 'litter', 'batch']:
             return jsonify({'success': False, 'message': 'Invalid pig type'})
         
-        # Generate the tag ID
-        tag_id = generate_pig_tag_id(pig_type)
+        # Preview the tag ID (register_pig allocates it)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        tag_id = peek_next_id(cursor, f'pig_{pig_type}')
+        cursor.close()
+        conn.close()
         
         return jsonify({
             'success': True,
@@ -5806,6 +7732,7 @@ def generate_tag_id():
         return jsonify({'success': False, 'message': 'Failed to generate tag ID'})
 
 @app.route('/api/pig/update/<int:pig_id>', methods=['PUT'])
+@invalidates('pigs')
 def update_pig(pig_id):
     """Update pig details"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -5916,7 +7843,7 @@ def update_pig(pig_id):
             
             # Determine breeding status based on purpose and age
             if purpose == 'breeding' and age_days is not None:
-                new_breeding_status = 'available' if age_days >= 200 else 'young'
+                new_breeding_status = 'available' if age_days >= PIG_BREEDING_AGE_DAYS else 'young'
                 update_fields.append("breeding_status = %s")
                 update_values.append(new_breeding_status)
                 changes.append(f"Breeding Status: {current_pig.get('breeding_status', 'None')} → {new_breeding_status}")
@@ -5953,12 +7880,14 @@ def update_pig(pig_id):
                 changes.append(f"Status: {old_status} → {new_status} (Reason: {status_reason})")
                 # Log status change with reason
                 log_activity(session['employee_id'], 'PIG_STATUS_CHANGE', 
-                           f'Changed pig {current_pig["tag_id"]} status from {old_status} to {new_status}. Reason: {status_reason}')
+                           f'Changed pig {current_pig["tag_id"]} status from {old_status} to {new_status}. Reason: {status_reason}',
+                           entity_type='pig', entity_id=pig_id)
             else:
                 changes.append(f"Status: {old_status} → {new_status}")
                 # Log status change without reason
                 log_activity(session['employee_id'], 'PIG_STATUS_CHANGE', 
-                           f'Changed pig {current_pig["tag_id"]} status from {old_status} to {new_status}')
+                           f'Changed pig {current_pig["tag_id"]} status from {old_status} to {new_status}',
+                           entity_type='pig', entity_id=pig_id)
         
         # Mark pig as edited in the database
         cursor.execute("""
@@ -5967,9 +7896,11 @@ def update_pig(pig_id):
         
         # Log activity
         log_activity(session['employee_id'], 'PIG_UPDATE', 
-                    f'Updated pig {current_pig["tag_id"]} with changes: {", ".join(changes)}')
+                    f'Updated pig {current_pig["tag_id"]} with changes: {", ".join(changes)}',
+                    entity_type='pig', entity_id=pig_id)
         
         conn.commit()
+        refresh_search_entry('pig', pig_id)
         cursor.close()
         conn.close()
         
@@ -6022,6 +7953,7 @@ def get_pig_details(pig_id):
         return jsonify({'success': False, 'message': f'Failed to get pig details: {str(e)}'})
 
 @app.route('/api/pig/delete/<int:pig_id>', methods=['DELETE'])
+@invalidates('pigs', 'weight_records')
 def delete_pig(pig_id):
     """Delete a pig from the system"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6117,9 +8049,11 @@ def delete_pig(pig_id):
         
         # Log the deletion activity
         log_activity(session['employee_id'], 'PIG_DELETED', 
-                   f'Pig deleted: {pig["tag_id"]} (ID: {pig_id}) - Type: {pig["pig_type"]}, Breed: {pig["breed"]}, Status: {pig["status"]}')
+                   f'Pig deleted: {pig["tag_id"]} (ID: {pig_id}) - Type: {pig["pig_type"]}, Breed: {pig["breed"]}, Status: {pig["status"]}',
+                   entity_type='pig', entity_id=pig_id)
         
         conn.commit()
+        refresh_search_entry('pig', pig_id)
         cursor.close()
         conn.close()
         
@@ -6194,29 +8128,7 @@ def recalculate_pig_ages():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get all pigs with birth dates
-        cursor.execute("""
-            SELECT id, birth_date, age_days FROM pigs 
-            WHERE birth_date IS NOT NULL AND status = 'active'
-        """)
-        pigs = cursor.fetchall()
-        
-        updated_count = 0
-        for pig in pigs:
-            if pig['birth_date']:
-                try:
-                    birth_dt = datetime.strptime(str(pig['birth_date']), '%Y-%m-%d').date()
-                    age_days = (datetime.now().date() - birth_dt).days
-                    
-                    # Update age if it's different
-                    if pig['age_days'] != age_days:
-                        cursor.execute("""
-                            UPDATE pigs SET age_days = %s WHERE id = %s
-                        """, (age_days, pig['id']))
-                        updated_count += 1
-                        
-                except ValueError:
-                    continue  # Skip invalid dates
+        updated_count = update_pig_ages(cursor)
         
         conn.commit()
         cursor.close()
@@ -6231,6 +8143,25 @@ def recalculate_pig_ages():
         print(f"Error recalculating pig ages: {str(e)}")
         return jsonify({'success': False, 'message': f'Failed to recalculate ages: {str(e)}'})
 
+def get_entity_audit_trail(cursor, entity_type, entity_id):
+    """Return one entity's activity_log entries, newest first (idx_activity_log_entity range scan)"""
+    cursor.execute("""
+        SELECT al.action, al.description, al.created_at, e.full_name, e.role
+        FROM activity_log al
+        LEFT JOIN employees e ON al.employee_id = e.id
+        WHERE al.entity_type = %s AND al.entity_id = %s
+        ORDER BY al.created_at DESC
+    """, (entity_type, str(entity_id)))
+    
+    # Format audit entries
+    return [{
+        'timestamp': entry['created_at'].strftime('%Y-%m-%d %H:%M:%S') if entry['created_at'] else 'Unknown',
+        'activity_type': entry['action'],
+        'description': entry['description'],
+        'employee_name': entry['full_name'] or 'Unknown',
+        'employee_role': entry['role'] or 'Unknown'
+    } for entry in cursor.fetchall()]
+
 @app.route('/api/pig/audit-trail/<int:pig_id>', methods=['GET'])
 def get_pig_audit_trail(pig_id):
     """Get audit trail for a specific pig"""
@@ -6254,27 +8185,7 @@ def get_pig_audit_trail(pig_id):
             return jsonify({'success': False, 'message': 'Pig not found'}), 404
         
         # Get activity log entries for this pig
-        cursor.execute("""
-            SELECT al.*, e.full_name, e.role
-            FROM activity_log al
-            LEFT JOIN employees e ON al.employee_id = e.id
-            WHERE al.action IN ('PIG_REGISTRATION', 'PIG_UPDATE', 'PIG_STATUS_CHANGE', 'BREEDING_REGISTRATION', 'BREEDING_CANCELLATION', 'FARROWING_ACTIVITY_COMPLETED', 'BREEDING_CYCLE_COMPLETED', 'LITTER_REGISTRATION', 'LITTER_POSTPONED', 'LOGIN', 'LOGOUT')
-            AND al.description LIKE %s
-            ORDER BY al.created_at DESC
-        """, (f'%{pig["tag_id"]}%',))
-        
-        audit_entries = cursor.fetchall()
-        
-        # Format audit entries
-        formatted_entries = []
-        for entry in audit_entries:
-            formatted_entries.append({
-                'timestamp': entry['created_at'].strftime('%Y-%m-%d %H:%M:%S') if entry['created_at'] else 'Unknown',
-                'activity_type': entry['action'],
-                'description': entry['description'],
-                'employee_name': entry['full_name'] or 'Unknown',
-                'employee_role': entry['role'] or 'Unknown'
-            })
+        audit_trail = get_entity_audit_trail(cursor, 'pig', pig_id)
         
         cursor.close()
         conn.close()
@@ -6282,7 +8193,7 @@ def get_pig_audit_trail(pig_id):
         return jsonify({
             'success': True,
             'pig': pig,
-            'audit_trail': formatted_entries
+            'audit_trail': audit_trail
         })
         
     except Exception as e:
@@ -6336,25 +8247,8 @@ def get_next_litter_id():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get the highest existing litter ID
-        cursor.execute("""
-            SELECT litter_id FROM litters 
-            ORDER BY CAST(SUBSTRING(litter_id, 2) AS UNSIGNED) DESC 
-            LIMIT 1
-        """)
-        
-        result = cursor.fetchone()
-        
-        if result:
-            # Extract number from existing ID (e.g., L001 -> 1)
-            current_number = int(result['litter_id'][1:])
-            next_number = current_number + 1
-        else:
-            # No existing litters, start with 1
-            next_number = 1
-        
-        # Format as L001, L002, etc.
-        next_litter_id = f"L{next_number:03d}"
+        # Next litter ID from the litter sequence (claimed when the litter is registered)
+        next_litter_id = peek_next_id(cursor, 'litter')
         
         cursor.close()
         conn.close()
@@ -6369,6 +8263,7 @@ def get_next_litter_id():
         return jsonify({'success': False, 'message': f'Failed to get next litter ID: {str(e)}'})
 
 @app.route('/api/litter/register', methods=['POST'])
+@invalidates('pigs', 'litters', 'breeding_records')
 def register_litter():
     """Register a new litter"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6377,8 +8272,8 @@ def register_litter():
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['sow_id', 'farrowing_record_id', 'litter_id', 'farrowing_date', 'total_piglets', 'alive_piglets']
+        # Validate required fields (a blank litter ID is allocated below)
+        required_fields = ['sow_id', 'farrowing_record_id', 'farrowing_date', 'total_piglets', 'alive_piglets']
         for field in required_fields:
             if not data.get(field):
                 return jsonify({'success': False, 'message': f'{field.replace("_", " ").title()} is required'})
@@ -6386,11 +8281,6 @@ def register_litter():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Check if litter ID already exists
-        cursor.execute("SELECT id FROM litters WHERE litter_id = %s", (data['litter_id'],))
-        if cursor.fetchone():
-            return jsonify({'success': False, 'message': 'Litter ID already exists'})
-        
         # Get weaning data from farrowing activities if available
         weaning_weight = None
         weaning_date = None
@@ -6406,21 +8296,33 @@ def register_litter():
             weaning_weight = weaning_data['weaning_weight']
             weaning_date = weaning_data['weaning_date']
         
-        # Insert litter record
-        cursor.execute("""
-            INSERT INTO litters (
-                litter_id, farrowing_record_id, sow_id, boar_id, farrowing_date,
-                total_piglets, alive_piglets, still_births, avg_weight, 
-                weaning_weight, weaning_date, notes, created_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            data['litter_id'], data['farrowing_record_id'], data['sow_id'], 
-            data.get('boar_id'), data['farrowing_date'], data['total_piglets'],
-            data['alive_piglets'], data.get('still_births', 0), data.get('avg_weight'),
-            weaning_weight, weaning_date, data.get('notes'), session['employee_id']
-        ))
-        
-        litter_id = cursor.lastrowid
+        # The litter ID is allocated (or a typed-in one claimed) in the same
+        # transaction as the insert, so concurrent registrations never share one
+        with db_transaction():
+            litter_code = resolve_submitted_id(cursor, 'litter', data.get('litter_id'), data.get('previewed_litter_id'))
+            
+            # Check if litter ID already exists
+            cursor.execute("SELECT id FROM litters WHERE litter_id = %s", (litter_code,))
+            if cursor.fetchone():
+                # Roll back so an allocated number goes back to the series
+                conn.rollback()
+                return jsonify({'success': False, 'message': 'Litter ID already exists'})
+            
+            # Insert litter record
+            cursor.execute("""
+                INSERT INTO litters (
+                    litter_id, farrowing_record_id, sow_id, boar_id, farrowing_date,
+                    total_piglets, alive_piglets, still_births, avg_weight, 
+                    weaning_weight, weaning_date, notes, created_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                litter_code, data['farrowing_record_id'], data['sow_id'], 
+                data.get('boar_id'), data['farrowing_date'], data['total_piglets'],
+                data['alive_piglets'], data.get('still_births', 0), data.get('avg_weight'),
+                weaning_weight, weaning_date, data.get('notes'), session['employee_id']
+            ))
+            
+            litter_id = cursor.lastrowid
         
         # Get breeding record ID from farrowing record
         cursor.execute("""
@@ -6447,15 +8349,18 @@ def register_litter():
         
         # Log activity
         log_activity(session['employee_id'], 'LITTER_REGISTRATION', 
-                   f'Registered litter {data["litter_id"]} with {data["alive_piglets"]} alive piglets from sow {data["sow_id"]}')
+                   f'Registered litter {litter_code} with {data["alive_piglets"]} alive piglets from sow {data["sow_id"]}',
+                   entity_type='litter', entity_id=litter_id)
         
         conn.commit()
+        refresh_search_entry('litter', litter_id)
         cursor.close()
         conn.close()
         
         return jsonify({
             'success': True,
-            'message': f'Litter {data["litter_id"]} registered successfully with {data["alive_piglets"]} alive piglets'
+            'message': f'Litter {litter_code} registered successfully with {data["alive_piglets"]} alive piglets',
+            'litter_id': litter_code
         })
         
     except Exception as e:
@@ -6463,6 +8368,7 @@ def register_litter():
         return jsonify({'success': False, 'message': f'Failed to register litter: {str(e)}'})
 
 @app.route('/api/litter/postpone', methods=['POST'])
+@invalidates('breeding_records')
 def postpone_litter_registration():
     """Postpone litter registration with reason"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6495,7 +8401,8 @@ def postpone_litter_registration():
         
         # Log activity
         log_activity(session['employee_id'], 'LITTER_POSTPONED', 
-                   f'Postponed litter registration for farrowing record {data["farrowing_record_id"]}. Reason: {data["reason"]}')
+                   f'Postponed litter registration for farrowing record {data["farrowing_record_id"]}. Reason: {data["reason"]}',
+                   entity_type='farrowing', entity_id=data['farrowing_record_id'])
         
         conn.commit()
         cursor.close()
@@ -6628,6 +8535,7 @@ def get_available_boars():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/breeding/register', methods=['POST'])
+@invalidates('pigs', 'breeding_records')
 def register_breeding():
     """Register a new breeding record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6695,9 +8603,11 @@ def register_breeding():
         cursor.close()
         conn.close()
         
-        # Log activity
-        log_activity(session['employee_id'], 'BREEDING_REGISTRATION', 
-                    f'Breeding record created: Sow {sow["tag_id"]} with Boar {boar["tag_id"]}')
+        # Log activity once per pig so both audit trails show the breeding
+        for pig in (sow, boar):
+            log_activity(session['employee_id'], 'BREEDING_REGISTRATION', 
+                        f'Breeding record created: Sow {sow["tag_id"]} with Boar {boar["tag_id"]}',
+                        entity_type='pig', entity_id=pig['id'])
         
         return jsonify({
             'success': True,
@@ -6740,19 +8650,14 @@ def get_breeding_records():
         from datetime import datetime
         today = datetime.now().date()
         
-        # Auto-update breeding statuses based on time
+        # Show the time-based status even if the breeding_statuses job has not run yet
         for record in records:
             if record['mating_date'] and record['breeding_status'] == 'served':
                 mating_date = record['mating_date']
                 days_since_mating = (today - mating_date).days
                 
-                # If more than 25 days have passed since mating, update to pregnant
+                # If more than 25 days have passed since mating, it is pregnant
                 if days_since_mating > 25:
-                    cursor.execute("""
-                        UPDATE pigs 
-                        SET breeding_status = 'pregnant' 
-                        WHERE id = %s
-                    """, (record['sow_id'],))
                     record['breeding_status'] = 'pregnant'
         
         processed_records = []
@@ -6809,6 +8714,7 @@ def get_breeding_records():
 
 
 @app.route('/api/breeding/cancel/<int:breeding_id>', methods=['POST'])
+@invalidates('pigs', 'breeding_records')
 def cancel_breeding(breeding_id):
     """Cancel a breeding record (within 93 days to farrowing)"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6863,7 +8769,8 @@ def cancel_breeding(breeding_id):
         
         # Log activity
         log_activity(session['employee_id'], 'BREEDING_CANCELLATION', 
-                    f'Breeding cancelled: Sow {record["sow_tag_id"]} - Reason: {reason}')
+                    f'Breeding cancelled: Sow {record["sow_tag_id"]} - Reason: {reason}',
+                    entity_type='pig', entity_id=record['sow_id'])
         
         return jsonify({
             'success': True,
@@ -6913,6 +8820,7 @@ def get_failed_conceptions():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/breeding/<int:breeding_id>/edit', methods=['PUT'])
+@invalidates('pigs', 'breeding_records')
 def edit_breeding_record(breeding_id):
     """Edit a breeding record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -6963,7 +8871,8 @@ def edit_breeding_record(breeding_id):
         
         # Log activity
         log_activity(session['employee_id'], 'BREEDING_EDIT', 
-                    f'Breeding record {breeding_id} updated')
+                    f'Breeding record {breeding_id} updated',
+                    entity_type='breeding', entity_id=breeding_id)
         
         return jsonify({
             'success': True,
@@ -6975,6 +8884,7 @@ def edit_breeding_record(breeding_id):
         return jsonify({'success': False, 'message': f'Failed to update breeding record: {str(e)}'})
 
 @app.route('/api/breeding/<int:breeding_id>/delete', methods=['DELETE'])
+@invalidates('pigs', 'breeding_records')
 def delete_breeding_record(breeding_id):
     """Delete a breeding record and set sow status to available"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7031,7 +8941,8 @@ def delete_breeding_record(breeding_id):
         
         # Log activity
         log_activity(session['employee_id'], 'BREEDING_DELETE', 
-                    f'Breeding record {breeding_id} deleted for sow {record["sow_tag_id"]}')
+                    f'Breeding record {breeding_id} deleted for sow {record["sow_tag_id"]}',
+                    entity_type='pig', entity_id=record['sow_id'])
         
         return jsonify({
             'success': True,
@@ -7139,58 +9050,24 @@ def get_breeding_statistics():
         print(f"Error getting breeding statistics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def update_breeding_statuses():
-    """Update breeding statuses based on time elapsed"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get breeding records that need status updates
-        cursor.execute("""
-            SELECT br.id, br.sow_id, br.mating_date, br.status, sow.tag_id
-            FROM breeding_records br
-            LEFT JOIN pigs sow ON br.sow_id = sow.id
-            WHERE br.status = 'served'
-        """)
-        records = cursor.fetchall()
-        
-        from datetime import datetime
-        today = datetime.now().date()
-        updated_count = 0
-        
-        for record in records:
-            days_since_mating = (today - record['mating_date']).days
-            
-            # If more than 25 days have passed, change status to pregnant
-            if days_since_mating > 25:
-                cursor.execute("""
-                    UPDATE breeding_records 
-                    SET status = 'pregnant' 
-                    WHERE id = %s
-                """, (record['id'],))
-                
-                # Update sow's breeding status to pregnant
-                cursor.execute("""
-                    UPDATE pigs 
-                    SET breeding_status = 'pregnant' 
-                    WHERE id = %s
-                """, (record['sow_id'],))
-                
-                updated_count += 1
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        if updated_count > 0:
-            print(f"✅ Updated {updated_count} breeding statuses to pregnant")
-        
-    except Exception as e:
-        print(f"❌ Error updating breeding statuses: {e}")
-        import traceback
-        traceback.print_exc()
+@scheduled_job('breeding_statuses', interval=3600, tables=('breeding_records', 'pigs'))
+def update_breeding_statuses(cursor):
+    """Move served breeding records (and their sows) to pregnant 25 days after mating"""
+    cursor.execute("""
+        UPDATE breeding_records br
+        JOIN pigs sow ON br.sow_id = sow.id
+        SET br.status = 'pregnant', sow.breeding_status = 'pregnant'
+        WHERE br.status = 'served'
+        AND br.mating_date < DATE_SUB(CURDATE(), INTERVAL 25 DAY)
+    """)
+    updated_count = cursor.rowcount
+    
+    if updated_count > 0:
+        print(f"✅ Updated {updated_count} breeding statuses to pregnant")
+    return updated_count
 
 @app.route('/api/breeding/register-farrowing/<int:breeding_id>', methods=['POST'])
+@invalidates('pigs', 'litters', 'breeding_records')
 def register_farrowing(breeding_id):
     """Register farrowing for a breeding record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7208,104 +9085,104 @@ def register_farrowing(breeding_id):
         if not all([farrowing_date, alive_piglets is not None, still_births is not None, avg_weight is not None]):
             return jsonify({'success': False, 'message': 'Missing required fields'})
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Farrowing record, activities, litter and sow status are written in one
+        # transaction; generate_litter_id() reuses the same request connection
+        with db_transaction() as conn:
+            cursor = conn.cursor()
         
-        # Get breeding record details
-        cursor.execute("""
-            SELECT br.*, p.tag_id as sow_tag_id, p.breed as sow_breed
-            FROM breeding_records br
-            JOIN pigs p ON br.sow_id = p.id
-            WHERE br.id = %s
-        """, (breeding_id,))
+            # Get breeding record details
+            cursor.execute("""
+                SELECT br.*, p.tag_id as sow_tag_id, p.breed as sow_breed
+                FROM breeding_records br
+                JOIN pigs p ON br.sow_id = p.id
+                WHERE br.id = %s
+            """, (breeding_id,))
         
-        breeding_record = cursor.fetchone()
-        if not breeding_record:
-            return jsonify({'success': False, 'message': 'Breeding record not found'})
+            breeding_record = cursor.fetchone()
+            if not breeding_record:
+                return jsonify({'success': False, 'message': 'Breeding record not found'})
         
-        # Insert farrowing record
-        cursor.execute("""
-            INSERT INTO farrowing_records (
-                breeding_id, farrowing_date, alive_piglets, still_births, 
-                avg_weight, health_notes, created_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (
-            breeding_id, farrowing_date, alive_piglets, still_births,
-            avg_weight, health_notes, session['employee_id']
-        ))
+            # Insert farrowing record
+            cursor.execute("""
+                INSERT INTO farrowing_records (
+                    breeding_id, farrowing_date, alive_piglets, still_births, 
+                    avg_weight, health_notes, created_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (
+                breeding_id, farrowing_date, alive_piglets, still_births,
+                avg_weight, health_notes, session['employee_id']
+            ))
         
-        farrowing_id = cursor.lastrowid
-        
-        # Create farrowing activities with due dates
-        activities = [
-            (1, 'Clear airways, ensure colostrum intake'),
-            (1, 'Provide heat lamps'),
-            (1, 'Remove afterbirth'),
-            (2, 'Iron injections'),
-            (2, 'Ear notching/tagging'),
-            (3, 'Tail docking'),
-            (3, 'Castration (males)'),
-            (14, 'Start creep feed'),
-            (21, 'Weaning')
-        ]
+            farrowing_id = cursor.lastrowid
+        
+            # Create farrowing activities with due dates
+            activities = [
+                (1, 'Clear airways, ensure colostrum intake'),
+                (1, 'Provide heat lamps'),
+                (1, 'Remove afterbirth'),
+                (2, 'Iron injections'),
+                (2, 'Ear notching/tagging'),
+                (3, 'Tail docking'),
+                (3, 'Castration (males)'),
+                (14, 'Start creep feed'),
+                (21, 'Weaning')
+            ]
         
-        for due_day, activity_name in activities:
-            # Convert farrowing_date string to date object for timedelta calculation
-            farrowing_date_obj = datetime.strptime(farrowing_date, '%Y-%m-%d').date()
-            due_date = farrowing_date_obj + timedelta(days=due_day)
-            cursor.execute("""
-                INSERT INTO farrowing_activities (
-                    farrowing_record_id, activity_name, due_day, due_date
-                ) VALUES (%s, %s, %s, %s)
-            """, (farrowing_id, activity_name, due_day, due_date))
+            for due_day, activity_name in activities:
+                # Convert farrowing_date string to date object for timedelta calculation
+                farrowing_date_obj = datetime.strptime(farrowing_date, '%Y-%m-%d').date()
+                due_date = farrowing_date_obj + timedelta(days=due_day)
+                cursor.execute("""
+                    INSERT INTO farrowing_activities (
+                        farrowing_record_id, activity_name, due_day, due_date
+                    ) VALUES (%s, %s, %s, %s)
+                """, (farrowing_id, activity_name, due_day, due_date))
         
-        # Update breeding record status to completed
-        print(f"Updating breeding record {breeding_id} status to 'completed'")
-        cursor.execute("""
-            UPDATE breeding_records 
-            SET status = 'completed', updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (breeding_id,))
+            # Update breeding record status to completed
+            print(f"Updating breeding record {breeding_id} status to 'completed'")
+            cursor.execute("""
+                UPDATE breeding_records 
+                SET status = 'completed', updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (breeding_id,))
         
-        # Create litter record
-        litter_id = generate_litter_id()
-        total_piglets = alive_piglets + still_births
+            # Create litter record
+            litter_id = generate_litter_id()
+            total_piglets = alive_piglets + still_births
         
-        cursor.execute("""
-            INSERT INTO litters (
-                litter_id, farrowing_record_id, sow_id, boar_id, farrowing_date,
-                total_piglets, alive_piglets, still_births, avg_weight, created_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            litter_id, farrowing_id, breeding_record['sow_id'], breeding_record['boar_id'],
-            farrowing_date, total_piglets, alive_piglets, still_births, avg_weight, session['employee_id']
-        ))
+            cursor.execute("""
+                INSERT INTO litters (
+                    litter_id, farrowing_record_id, sow_id, boar_id, farrowing_date,
+                    total_piglets, alive_piglets, still_births, avg_weight, created_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                litter_id, farrowing_id, breeding_record['sow_id'], breeding_record['boar_id'],
+                farrowing_date, total_piglets, alive_piglets, still_births, avg_weight, session['employee_id']
+            ))
         
-        print(f"📝 Created litter record: {litter_id}")
+            print(f"📝 Created litter record: {litter_id}")
         
-        # Update sow's breeding status to farrowed
-        print(f"Updating sow {breeding_record['sow_id']} breeding status to 'farrowed'")
-        # Note: Sows with 'farrowed' status need recovery time before being bred again
-        # This status can be manually changed back to 'available' by farm managers
-        # or automatically after a set recovery period (typically 2-3 months)
-        cursor.execute("""
-            UPDATE pigs 
-            SET breeding_status = 'farrowed' 
-            WHERE id = %s
-        """, (breeding_record['sow_id'],))
+            # Update sow's breeding status to farrowed
+            print(f"Updating sow {breeding_record['sow_id']} breeding status to 'farrowed'")
+            # Note: Sows with 'farrowed' status need recovery time before being bred again
+            # This status can be manually changed back to 'available' by farm managers
+            # or automatically after a set recovery period (typically 2-3 months)
+            cursor.execute("""
+                UPDATE pigs 
+                SET breeding_status = 'farrowed' 
+                WHERE id = %s
+            """, (breeding_record['sow_id'],))
         
-        # Verify the updates
-        cursor.execute("SELECT status FROM breeding_records WHERE id = %s", (breeding_id,))
-        updated_breeding = cursor.fetchone()
-        print(f"✅ Breeding record status after update: {updated_breeding['status']}")
+            # Verify the updates
+            cursor.execute("SELECT status FROM breeding_records WHERE id = %s", (breeding_id,))
+            updated_breeding = cursor.fetchone()
+            print(f"✅ Breeding record status after update: {updated_breeding['status']}")
         
-        cursor.execute("SELECT breeding_status FROM pigs WHERE id = %s", (breeding_record['sow_id'],))
-        updated_pig = cursor.fetchone()
-        print(f"✅ Pig breeding status after update: {updated_pig['breeding_status']}")
+            cursor.execute("SELECT breeding_status FROM pigs WHERE id = %s", (breeding_record['sow_id'],))
+            updated_pig = cursor.fetchone()
+            print(f"✅ Pig breeding status after update: {updated_pig['breeding_status']}")
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+            cursor.close()
         
         print(f"Farrowing registration completed successfully for breeding record {breeding_id}")
         
@@ -7395,6 +9272,7 @@ def get_farrowing_activities(farrowing_id):
         return jsonify({'success': False, 'message': f'Failed to get activities: {str(e)}'})
 
 @app.route('/api/farrowing/activities/<int:activity_id>/complete', methods=['POST'])
+@invalidates('litters')
 def complete_farrowing_activity(activity_id):
     """Mark a farrowing activity as completed"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7471,7 +9349,8 @@ def complete_farrowing_activity(activity_id):
         
         # Log activity
         log_activity(session['employee_id'], 'FARROWING_ACTIVITY_COMPLETED', 
-                    f'Completed farrowing activity ID {activity_id} on {today}')
+                    f'Completed farrowing activity ID {activity_id} on {today}',
+                    entity_type='farrowing_activity', entity_id=activity_id)
         
         # Check if all activities are completed and trigger recovery period
         if is_overdue:
@@ -7490,6 +9369,7 @@ def complete_farrowing_activity(activity_id):
         return jsonify({'success': False, 'message': f'Failed to complete activity: {str(e)}'})
 
 @app.route('/api/farrowing/complete-activity/<int:activity_id>', methods=['POST'])
+@invalidates('litters')
 def complete_farrowing_activity_simple(activity_id):
     """Simple complete farrowing activity endpoint for compatibility"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7597,6 +9477,7 @@ def check_sow_recovery_status(farrowing_id):
         return jsonify({'success': False, 'message': f'Failed to check recovery status: {str(e)}'})
 
 @app.route('/api/farrowing/mark-sow-available/<int:farrowing_id>', methods=['POST'])
+@invalidates('pigs', 'litters')
 def mark_sow_available_for_breeding(farrowing_id):
     """Mark sow as available for next breeding after recovery period"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7713,7 +9594,8 @@ def mark_sow_available_for_breeding(farrowing_id):
         
         # Log the successful breeding cycle completion
         log_activity(session['employee_id'], 'BREEDING_CYCLE_COMPLETED', 
-                    f'Successful breeding cycle completed for sow {farrowing["sow_tag_id"]}. Ready for next breeding.')
+                    f'Successful breeding cycle completed for sow {farrowing["sow_tag_id"]}. Ready for next breeding.',
+                    entity_type='pig', entity_id=farrowing['sow_id'])
         
         conn.commit()
         cursor.close()
@@ -7839,7 +9721,8 @@ def edit_farrowing_record(farrowing_id):
         
         # Log activity
         log_activity(session['employee_id'], 'FARROWING_EDIT', 
-                    f'Farrowing record {farrowing_id} updated')
+                    f'Farrowing record {farrowing_id} updated',
+                    entity_type='farrowing', entity_id=farrowing_id)
         
         return jsonify({
             'success': True,
@@ -7851,6 +9734,7 @@ def edit_farrowing_record(farrowing_id):
         return jsonify({'success': False, 'message': f'Failed to update farrowing record: {str(e)}'})
 
 @app.route('/api/farrowing/<int:farrowing_id>/delete', methods=['DELETE'])
+@invalidates('pigs', 'litters', 'breeding_records')
 def delete_farrowing_record(farrowing_id):
     """Delete a farrowing record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -7908,7 +9792,8 @@ def delete_farrowing_record(farrowing_id):
         
         # Log activity
         log_activity(session['employee_id'], 'FARROWING_DELETE', 
-                    f'Farrowing record {farrowing_id} deleted for sow {record["sow_tag_id"]}')
+                    f'Farrowing record {farrowing_id} deleted for sow {record["sow_tag_id"]}',
+                    entity_type='pig', entity_id=record['sow_id'])
         
         return jsonify({
             'success': True,
@@ -8052,25 +9937,8 @@ def generate_cow_ear_tag():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get the highest existing ear tag number
-        cursor.execute("""
-            SELECT ear_tag FROM cows 
-            WHERE ear_tag LIKE 'C%' 
-            ORDER BY CAST(SUBSTRING(ear_tag, 2) AS UNSIGNED) DESC 
-            LIMIT 1
-        """)
-        result = cursor.fetchone()
-        
-        if result:
-            # Extract number from existing tag and increment
-            current_number = int(result['ear_tag'][1:])
-            next_number = current_number + 1
-        else:
-            # First cow
-            next_number = 1
-        
-        # Format with leading zeros
-        next_ear_tag = f"C{next_number:03d}"
+        # Next ear tag from the cow sequence (claimed when the cow is registered)
+        next_ear_tag = peek_next_id(cursor, 'cow')
         
         cursor.close()
         conn.close()
@@ -8085,6 +9953,7 @@ def generate_cow_ear_tag():
         return jsonify({'success': False, 'message': f'Failed to generate ear tag: {str(e)}'})
 
 @app.route('/api/cow/register', methods=['POST'])
+@invalidates('cows')
 def register_cow():
     """Register a new cow"""
     if 'employee_id' not in session:
@@ -8093,8 +9962,8 @@ def register_cow():
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['ear_tag', 'breed', 'gender', 'source', 'birth_date']
+        # Validate required fields (a blank ear tag is allocated below)
+        required_fields = ['breed', 'gender', 'source', 'birth_date']
         for field in required_fields:
             if not data.get(field):
                 return jsonify({'success': False, 'message': f'{field.replace("_", " ").title()} is required'})
@@ -8111,42 +9980,53 @@ def register_cow():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Check if ear tag already exists
-        cursor.execute("SELECT id FROM cows WHERE ear_tag = %s", (data['ear_tag'],))
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return jsonify({'success': False, 'message': 'Ear tag already exists'})
-        
-        # Insert new cow
-        cursor.execute("""
-            INSERT INTO cows (
-                ear_tag, name, breed, color_markings, gender, birth_date, age_days,
-                source, purchase_date, purchase_place, sire_ear_tag, sire_details,
-                dam_ear_tag, dam_details, registered_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            data['ear_tag'], data.get('name'), data['breed'], data.get('color_markings'),
-            data['gender'], data['birth_date'], age_days, data['source'],
-            data.get('purchase_date'), data.get('purchase_place'),
-            data.get('sire_ear_tag'), data.get('sire_details'),
-            data.get('dam_ear_tag'), data.get('dam_details'), session['employee_id']
-        ))
-        
-        cow_id = cursor.lastrowid
+        # The ear tag is allocated (or a typed-in one claimed) in the same
+        # transaction as the insert, so concurrent registrations never share one
+        with db_transaction():
+            ear_tag = resolve_submitted_id(cursor, 'cow', data.get('ear_tag'), data.get('previewed_ear_tag'))
+            claim_id(cursor, 'cow_edit', ear_tag)
+            
+            # Check if ear tag already exists
+            cursor.execute("SELECT id FROM cows WHERE ear_tag = %s", (ear_tag,))
+            if cursor.fetchone():
+                # Roll back so an allocated number goes back to the series
+                conn.rollback()
+                cursor.close()
+                conn.close()
+                return jsonify({'success': False, 'message': 'Ear tag already exists'})
+            
+            # Insert new cow
+            cursor.execute("""
+                INSERT INTO cows (
+                    ear_tag, name, breed, color_markings, gender, birth_date, age_days,
+                    source, purchase_date, purchase_place, sire_ear_tag, sire_details,
+                    dam_ear_tag, dam_details, registered_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                ear_tag, data.get('name'), data['breed'], data.get('color_markings'),
+                data['gender'], data['birth_date'], age_days, data['source'],
+                data.get('purchase_date'), data.get('purchase_place'),
+                data.get('sire_ear_tag'), data.get('sire_details'),
+                data.get('dam_ear_tag'), data.get('dam_details'), session['employee_id']
+            ))
+            
+            cow_id = cursor.lastrowid
         
         # Log activity
         log_activity(session['employee_id'], 'COW_REGISTRATION', 
-                   f'New cow registered with ear tag {data["ear_tag"]}')
+                   f'New cow registered with ear tag {ear_tag}',
+                   entity_type='cow', entity_id=cow_id)
         
         conn.commit()
+        refresh_search_entry('cow', cow_id)
         cursor.close()
         conn.close()
         
         return jsonify({
             'success': True,
-            'message': 'Cow registered successfully',
-            'cow_id': cow_id
+            'message': f'Cow registered successfully with ear tag {ear_tag}',
+            'cow_id': cow_id,
+            'ear_tag': ear_tag
         })
         
     except Exception as e:
@@ -8276,26 +10156,6 @@ def record_cow_milk_production():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create cow_milk_production table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cow_milk_production (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                cow_id INT NOT NULL,
-                production_date DATE NOT NULL,
-                milking_session ENUM('morning', 'afternoon', 'evening') NOT NULL,
-                milk_quantity DECIMAL(5,2) NOT NULL,
-                notes TEXT,
-                recorded_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (cow_id) REFERENCES cows(id),
-                FOREIGN KEY (recorded_by) REFERENCES employees(id),
-                INDEX idx_cow_id (cow_id),
-                INDEX idx_production_date (production_date),
-                INDEX idx_milking_session (milking_session)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Insert production record
         cursor.execute("""
             INSERT INTO cow_milk_production (
@@ -8310,7 +10170,8 @@ def record_cow_milk_production():
         
         # Log activity
         log_activity(session['employee_id'], 'COW_MILK_PRODUCTION', 
-                   f'Milk production recorded: {data["milk_quantity"]}L for cow {data["cow_id"]}')
+                   f'Milk production recorded: {data["milk_quantity"]}L for cow {data["cow_id"]}',
+                   entity_type='cow', entity_id=data['cow_id'])
         
         conn.commit()
         cursor.close()
@@ -8337,26 +10198,6 @@ def get_chicken_production_stats():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chicken_production table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_production (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id INT NOT NULL,
-                production_date DATE NOT NULL,
-                production_type ENUM('eggs', 'meat') NOT NULL,
-                quantity INT NOT NULL,
-                notes TEXT,
-                recorded_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (chicken_id) REFERENCES chickens(id),
-                FOREIGN KEY (recorded_by) REFERENCES employees(id),
-                INDEX idx_production_date (production_date),
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_production_type (production_type)
-            )
-        """)
-        
         # Get today's production
         cursor.execute("""
             SELECT COALESCE(SUM(quantity), 0) as today_production
@@ -8416,36 +10257,6 @@ def get_chicken_production_records():
         print("Database cursor created for production records")
         print(f"Database cursor object: {cursor}")
         
-        # Create chicken_production table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_production (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id INT NOT NULL,
-                production_date DATE NOT NULL,
-                production_type ENUM('eggs', 'meat') NOT NULL,
-                quantity INT NOT NULL,
-                notes TEXT,
-                created_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (chicken_id) REFERENCES chickens(id),
-                FOREIGN KEY (created_by) REFERENCES employees(id),
-                INDEX idx_production_date (production_date),
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_production_type (production_type)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # Check if updated_at column exists, if not add it
-        cursor.execute("""
-            SELECT COLUMN_NAME 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'chicken_production' 
-            AND COLUMN_NAME = 'updated_at'
-        """)
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE chicken_production ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
-        
         # Check if production records exist, if not create sample data
         cursor.execute("SELECT COUNT(*) FROM chicken_production")
         production_count = cursor.fetchone()[0]
@@ -8540,50 +10351,9 @@ def record_chicken_production():
             if not data.get(field):
                 return jsonify({'success': False, 'message': f'{field.replace("_", " ").title()} is required'})
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create chicken_production table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_production (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id INT NOT NULL,
-                production_date DATE NOT NULL,
-                production_type ENUM('eggs', 'meat') NOT NULL,
-                quantity INT NOT NULL,
-                notes TEXT,
-                recorded_by INT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (chicken_id) REFERENCES chickens(id),
-                FOREIGN KEY (recorded_by) REFERENCES employees(id),
-                INDEX idx_production_date (production_date),
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_production_type (production_type)
-            )
-        """)
-        
-        # Check if created_by column exists, if not add it
-        cursor.execute("""
-            SELECT COLUMN_NAME 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'chicken_production' 
-            AND COLUMN_NAME = 'created_by'
-        """)
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE chicken_production ADD COLUMN created_by INT")
-            cursor.execute("ALTER TABLE chicken_production ADD FOREIGN KEY (created_by) REFERENCES employees(id)")
-        
-        # Check if updated_at column exists, if not add it
-        cursor.execute("""
-            SELECT COLUMN_NAME 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'chicken_production' 
-            AND COLUMN_NAME = 'updated_at'
-        """)
-        if not cursor.fetchone():
-            cursor.execute("ALTER TABLE chicken_production ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP")
-        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
         # Insert production record
         cursor.execute("""
             INSERT INTO chicken_production (
@@ -8596,21 +10366,8 @@ def record_chicken_production():
         
         production_id = cursor.lastrowid
         
-        # If meat production, insert weight details and create chicken_meat_production table
+        # If meat production, insert weight details
         if data['production_type'] == 'meat' and data.get('alive_weights') and data.get('dead_weights'):
-            # Create chicken_meat_production table if it doesn't exist
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS chicken_meat_production (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    production_id INT NOT NULL,
-                    chicken_number INT NOT NULL,
-                    alive_weight DECIMAL(10,3) NOT NULL,
-                    dead_weight DECIMAL(10,3) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (production_id) REFERENCES chicken_production(id),
-                    INDEX idx_production_id (production_id)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """)
             
             alive_weights = data.get('alive_weights', [])
             dead_weights = data.get('dead_weights', [])
@@ -8624,7 +10381,8 @@ def record_chicken_production():
         
         # Log activity
         log_activity(session['employee_id'], 'CHICKEN_PRODUCTION', 
-                   f'Chicken production recorded: {data["quantity"]} {data["production_type"]} for chicken {data["chicken_id"]}')
+                   f'Chicken production recorded: {data["quantity"]} {data["production_type"]} for chicken {data["chicken_id"]}',
+                   entity_type='chicken', entity_id=data['chicken_id'])
         
         conn.commit()
         cursor.close()
@@ -8656,32 +10414,6 @@ def get_chickens_list():
         print("Database cursor created")
         print(f"Database cursor object: {cursor}")
         
-        # Create chickens table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chickens (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id VARCHAR(20) UNIQUE NOT NULL,
-                batch_name VARCHAR(100) NOT NULL,
-                chicken_type ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                breed_name VARCHAR(100) NOT NULL,
-                gender ENUM('male', 'female') NOT NULL,
-                hatch_date DATE NOT NULL,
-                age_days INT NOT NULL,
-                source VARCHAR(100) NOT NULL,
-                coop_number INT NOT NULL,
-                quantity INT NOT NULL DEFAULT 1,
-                current_status ENUM('active', 'sold', 'dead', 'culled') DEFAULT 'active',
-                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_by INT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_chicken_type (chicken_type),
-                INDEX idx_batch_name (batch_name),
-                INDEX idx_coop_number (coop_number),
-                INDEX idx_current_status (current_status)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Check if chickens exist, if not create sample data
         cursor.execute("SELECT COUNT(*) FROM chickens WHERE current_status = 'active'")
         chicken_count = cursor.fetchone()[0]
@@ -8710,7 +10442,7 @@ def get_chickens_list():
         # Get all active chickens
         cursor.execute("""
             SELECT c.id, c.chicken_id, c.batch_name, c.chicken_type, c.breed_name, 
-                   c.gender, c.hatch_date, c.age_days, c.source, c.coop_number, 
+                   c.gender, c.hatch_date, DATEDIFF(CURDATE(), c.hatch_date) AS age_days, c.source, c.coop_number, 
                    c.quantity, c.current_status, c.registration_date, c.created_by
             FROM chickens c 
             WHERE c.current_status = 'active'
@@ -8761,6 +10493,7 @@ def get_chickens_list():
 
 # Employee Chicken Registration API
 @app.route('/api/chicken/register', methods=['POST'])
+@invalidates('chickens')
 def register_employee_chicken():
     """Register a new chicken (for employees)"""
     if 'employee_id' not in session:
@@ -8787,32 +10520,6 @@ def register_employee_chicken():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Create chickens table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chickens (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id VARCHAR(20) UNIQUE NOT NULL,
-                batch_name VARCHAR(100) NOT NULL,
-                chicken_type ENUM('broiler', 'kienyeji', 'layer') NOT NULL,
-                breed_name VARCHAR(100) NOT NULL,
-                gender ENUM('male', 'female') NOT NULL,
-                hatch_date DATE NOT NULL,
-                age_days INT NOT NULL,
-                source VARCHAR(100) NOT NULL,
-                coop_number INT NOT NULL,
-                quantity INT NOT NULL DEFAULT 1,
-                current_status ENUM('active', 'sold', 'dead', 'culled') DEFAULT 'active',
-                registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_by INT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_chicken_type (chicken_type),
-                INDEX idx_batch_name (batch_name),
-                INDEX idx_coop_number (coop_number),
-                INDEX idx_current_status (current_status)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
         # Insert chicken data (like admin version)
         cursor.execute("""
             INSERT INTO chickens (
@@ -8830,9 +10537,11 @@ def register_employee_chicken():
         
         # Log activity
         log_activity(session['employee_id'], 'CHICKEN_REGISTRATION', 
-                   f'Chicken registered: {chicken_id} - {batch_name}')
+                   f'Chicken registered: {chicken_id} - {batch_name}',
+                   entity_type='chicken', entity_id=request.form.get('chicken_id'))
         
         conn.commit()
+        refresh_search_entry('chicken', chicken_id)
         cursor.close()
         conn.close()
         
@@ -8846,6 +10555,42 @@ def register_employee_chicken():
         print(f"Error registering chicken: {str(e)}")
         return jsonify({'success': False, 'message': f'Failed to register chicken: {str(e)}'})
 
+@app.route('/api/chicken/audit-trail/<chicken_id>', methods=['GET'])
+def get_chicken_audit_trail(chicken_id):
+    """Get audit trail for a specific chicken batch"""
+    if 'employee_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Get chicken basic info
+        cursor.execute("""
+            SELECT id, chicken_id, batch_name, chicken_type, breed_name, quantity, current_status
+            FROM chickens WHERE chicken_id = %s
+        """, (chicken_id,))
+        chicken = cursor.fetchone()
+        
+        if not chicken:
+            return jsonify({'success': False, 'message': 'Chicken not found'}), 404
+        
+        # Get activity log entries for this chicken
+        audit_trail = get_entity_audit_trail(cursor, 'chicken', chicken_id)
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'chicken': chicken,
+            'audit_trail': audit_trail
+        })
+        
+    except Exception as e:
+        print(f"Error getting chicken audit trail: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get audit trail: {str(e)}'})
+
 @app.route('/api/cow/list', methods=['GET'])
 def get_cows_list():
     """Get all cows for display"""
@@ -8996,6 +10741,7 @@ def get_cow_details(cow_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/cow/<int:cow_id>/edit', methods=['PUT'])
+@invalidates('cows')
 def edit_cow(cow_id):
     """Edit cow details"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -9004,8 +10750,8 @@ def edit_cow(cow_id):
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['ear_tag', 'breed', 'gender', 'source', 'birth_date']
+        # Validate required fields (a blank ear tag is allocated below)
+        required_fields = ['breed', 'gender', 'source', 'birth_date']
         for field in required_fields:
             if not data.get(field):
                 return jsonify({'success': False, 'message': f'{field.replace("_", " ").title()} is required'})
@@ -9022,13 +10768,6 @@ def edit_cow(cow_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Check if new ear tag already exists (excluding current cow)
-        cursor.execute("SELECT id FROM cows WHERE ear_tag = %s AND id != %s", (data['ear_tag'], cow_id))
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return jsonify({'success': False, 'message': 'Ear tag already exists'})
-        
         # Get current cow data for comparison
         cursor.execute("""
             SELECT ear_tag, name, breed, color_markings, gender, birth_date, 
@@ -9038,57 +10777,75 @@ def edit_cow(cow_id):
         """, (cow_id,))
         current_cow = cursor.fetchone()
         
-        # Track changes and log to history
-        changes_logged = 0
-        fields_to_check = [
-            ('ear_tag', 'Ear Tag'),
-            ('name', 'Name'),
-            ('breed', 'Breed'),
-            ('color_markings', 'Color/Markings'),
-            ('gender', 'Gender'),
-            ('birth_date', 'Birth Date'),
-            ('source', 'Source'),
-            ('purchase_date', 'Purchase Date'),
-            ('purchase_place', 'Purchase Place'),
-            ('sire_ear_tag', 'Sire Ear Tag'),
-            ('sire_details', 'Sire Details'),
-            ('dam_ear_tag', 'Dam Ear Tag'),
-            ('dam_details', 'Dam Details')
-        ]
-        
-        for field, display_name in fields_to_check:
-            old_value = str(current_cow[field]) if current_cow[field] is not None else ''
-            new_value = str(data.get(field, '')) if data.get(field) is not None else ''
+        # A new EC tag is allocated (or a typed-in one claimed) in the same
+        # transaction as the update, so concurrent edits never share one
+        with db_transaction():
+            if data.get('ear_tag') != current_cow['ear_tag']:
+                data['ear_tag'] = resolve_submitted_id(cursor, 'cow_edit', data.get('ear_tag'), data.get('previewed_ear_tag'))
+                claim_id(cursor, 'cow', data['ear_tag'])
             
-            if old_value != new_value:
-                cursor.execute("""
-                    INSERT INTO cow_edit_history (cow_id, field_name, old_value, new_value, edited_by)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (cow_id, display_name, old_value, new_value, session['employee_id']))
-                changes_logged += 1
-        
-        # Update cow
-        cursor.execute("""
-            UPDATE cows SET 
-                ear_tag = %s, name = %s, breed = %s, color_markings = %s, 
-                gender = %s, birth_date = %s, age_days = %s, source = %s, 
-                purchase_date = %s, purchase_place = %s, sire_ear_tag = %s, 
-                sire_details = %s, dam_ear_tag = %s, dam_details = %s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (
-            data['ear_tag'], data.get('name'), data['breed'], data.get('color_markings'),
-            data['gender'], data['birth_date'], age_days, data['source'],
-            data.get('purchase_date'), data.get('purchase_place'),
-            data.get('sire_ear_tag'), data.get('sire_details'),
-            data.get('dam_ear_tag'), data.get('dam_details'), cow_id
-        ))
+            # Check if new ear tag already exists (excluding current cow)
+            cursor.execute("SELECT id FROM cows WHERE ear_tag = %s AND id != %s", (data['ear_tag'], cow_id))
+            if cursor.fetchone():
+                # Roll back so an allocated number goes back to the series
+                conn.rollback()
+                cursor.close()
+                conn.close()
+                return jsonify({'success': False, 'message': 'Ear tag already exists'})
+            
+            # Track changes and log to history
+            changes_logged = 0
+            fields_to_check = [
+                ('ear_tag', 'Ear Tag'),
+                ('name', 'Name'),
+                ('breed', 'Breed'),
+                ('color_markings', 'Color/Markings'),
+                ('gender', 'Gender'),
+                ('birth_date', 'Birth Date'),
+                ('source', 'Source'),
+                ('purchase_date', 'Purchase Date'),
+                ('purchase_place', 'Purchase Place'),
+                ('sire_ear_tag', 'Sire Ear Tag'),
+                ('sire_details', 'Sire Details'),
+                ('dam_ear_tag', 'Dam Ear Tag'),
+                ('dam_details', 'Dam Details')
+            ]
+            
+            for field, display_name in fields_to_check:
+                old_value = str(current_cow[field]) if current_cow[field] is not None else ''
+                new_value = str(data.get(field, '')) if data.get(field) is not None else ''
+                
+                if old_value != new_value:
+                    cursor.execute("""
+                        INSERT INTO cow_edit_history (cow_id, field_name, old_value, new_value, edited_by)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """, (cow_id, display_name, old_value, new_value, session['employee_id']))
+                    changes_logged += 1
+            
+            # Update cow
+            cursor.execute("""
+                UPDATE cows SET 
+                    ear_tag = %s, name = %s, breed = %s, color_markings = %s, 
+                    gender = %s, birth_date = %s, age_days = %s, source = %s, 
+                    purchase_date = %s, purchase_place = %s, sire_ear_tag = %s, 
+                    sire_details = %s, dam_ear_tag = %s, dam_details = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (
+                data['ear_tag'], data.get('name'), data['breed'], data.get('color_markings'),
+                data['gender'], data['birth_date'], age_days, data['source'],
+                data.get('purchase_date'), data.get('purchase_place'),
+                data.get('sire_ear_tag'), data.get('sire_details'),
+                data.get('dam_ear_tag'), data.get('dam_details'), cow_id
+            ))
         
         # Log activity
         log_activity(session['employee_id'], 'COW_EDIT', 
-                   f'Cow details updated for ear tag {data["ear_tag"]} - {changes_logged} changes logged')
+                   f'Cow details updated for ear tag {data["ear_tag"]} - {changes_logged} changes logged',
+                   entity_type='cow', entity_id=cow_id)
         
         conn.commit()
+        refresh_search_entry('cow', cow_id)
         cursor.close()
         conn.close()
         
@@ -9112,25 +10869,8 @@ def generate_edit_ear_tag():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get the highest existing EC ear tag number
-        cursor.execute("""
-            SELECT ear_tag FROM cows 
-            WHERE ear_tag LIKE 'EC%' 
-            ORDER BY CAST(SUBSTRING(ear_tag, 3) AS UNSIGNED) DESC 
-            LIMIT 1
-        """)
-        result = cursor.fetchone()
-        
-        if result:
-            # Extract number from existing EC tag and increment
-            current_number = int(result['ear_tag'][2:])  # Remove EC prefix
-            next_number = current_number + 1
-        else:
-            # First EC cow
-            next_number = 1
-        
-        # Format with leading zeros
-        new_ear_tag = f"EC{next_number:03d}"
+        # Next EC ear tag from its sequence (claimed when the edit is saved)
+        new_ear_tag = peek_next_id(cursor, 'cow_edit')
         
         cursor.close()
         conn.close()
@@ -9186,7 +10926,184 @@ def get_cow_edit_history(cow_id):
         print(f"Error getting cow edit history: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cow/audit-trail/<int:cow_id>', methods=['GET'])
+def get_cow_audit_trail(cow_id):
+    """Get audit trail for a specific cow"""
+    if 'employee_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Get cow basic info
+        cursor.execute("SELECT id, ear_tag, name, breed, status FROM cows WHERE id = %s", (cow_id,))
+        cow = cursor.fetchone()
+        
+        if not cow:
+            return jsonify({'success': False, 'message': 'Cow not found'}), 404
+        
+        # Get activity log entries for this cow
+        audit_trail = get_entity_audit_trail(cursor, 'cow', cow_id)
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'cow': cow,
+            'audit_trail': audit_trail
+        })
+        
+    except Exception as e:
+        print(f"Error getting cow audit trail: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get audit trail: {str(e)}'})
+
+MILK_USAGE_PURPOSES = ['calf_feeding', 'home_consumption', 'processing', 'wastage_spoiled']
+
+def _insert_milk_cow_rollups(cursor, where_sql, params):
+    """Aggregate milk_production rows matching where_sql into milk_daily_cow_rollup"""
+    cursor.execute(f"""
+        INSERT INTO milk_daily_cow_rollup (
+            cow_id, production_date, record_count, total_quantity, max_quantity,
+            fat_sum, fat_count, protein_sum, protein_count,
+            composition_count, composition_fat_sum, composition_protein_sum,
+            good_quality_count, moderate_quality_count, poor_quality_count
+        )
+        SELECT 
+            cow_id, production_date, COUNT(*), SUM(milk_quantity), MAX(milk_quantity),
+            COALESCE(SUM(fat_percentage), 0), COUNT(fat_percentage),
+            COALESCE(SUM(protein_percentage), 0), COUNT(protein_percentage),
+            SUM(fat_percentage IS NOT NULL AND protein_percentage IS NOT NULL),
+            COALESCE(SUM(CASE WHEN protein_percentage IS NOT NULL THEN fat_percentage END), 0),
+            COALESCE(SUM(CASE WHEN fat_percentage IS NOT NULL THEN protein_percentage END), 0),
+            SUM(milk_quality_assessment = 'good_quality'),
+            SUM(milk_quality_assessment = 'moderate_quality'),
+            SUM(milk_quality_assessment = 'poor_quality')
+        FROM milk_production
+        {where_sql}
+        GROUP BY cow_id, production_date
+    """, params)
+
+def _upsert_milk_daily_production(cursor, where_sql, params):
+    """Fold milk_daily_cow_rollup rows matching where_sql into milk_daily_rollup"""
+    cursor.execute(f"""
+        INSERT INTO milk_daily_rollup (
+            rollup_date, record_count, total_quantity, max_quantity,
+            composition_count, composition_fat_sum, composition_protein_sum,
+            good_quality_count, moderate_quality_count, poor_quality_count
+        )
+        SELECT 
+            production_date, SUM(record_count), SUM(total_quantity), MAX(max_quantity),
+            SUM(composition_count), SUM(composition_fat_sum), SUM(composition_protein_sum),
+            SUM(good_quality_count), SUM(moderate_quality_count), SUM(poor_quality_count)
+        FROM milk_daily_cow_rollup
+        {where_sql}
+        GROUP BY production_date
+        ON DUPLICATE KEY UPDATE
+            record_count = VALUES(record_count),
+            total_quantity = VALUES(total_quantity),
+            max_quantity = VALUES(max_quantity),
+            composition_count = VALUES(composition_count),
+            composition_fat_sum = VALUES(composition_fat_sum),
+            composition_protein_sum = VALUES(composition_protein_sum),
+            good_quality_count = VALUES(good_quality_count),
+            moderate_quality_count = VALUES(moderate_quality_count),
+            poor_quality_count = VALUES(poor_quality_count)
+    """, params)
+
+def _upsert_milk_daily_sales(cursor, where_sql, params):
+    """Fold milk_sales_usage rows matching where_sql into milk_daily_rollup and milk_daily_buyer_rollup"""
+    usage_columns = ',\n            '.join(
+        f"COALESCE(SUM(CASE WHEN transaction_type = 'usage' AND purpose_of_use = '{purpose}' THEN quantity_used END), 0)"
+        for purpose in MILK_USAGE_PURPOSES
+    )
+    cursor.execute(f"""
+        INSERT INTO milk_daily_rollup (
+            rollup_date, sales_count, quantity_sold, revenue, price_sum, price_count,
+            {', '.join(f'{purpose}_used' for purpose in MILK_USAGE_PURPOSES)}
+        )
+        SELECT 
+            transaction_date,
+            COALESCE(SUM(transaction_type = 'sale'), 0),
+            COALESCE(SUM(CASE WHEN transaction_type = 'sale' THEN quantity_sold END), 0),
+            COALESCE(SUM(CASE WHEN transaction_type = 'sale' THEN total_amount END), 0),
+            COALESCE(SUM(CASE WHEN transaction_type = 'sale' THEN price_per_liter END), 0),
+            COUNT(CASE WHEN transaction_type = 'sale' THEN price_per_liter END),
+            {usage_columns}
+        FROM milk_sales_usage
+        {where_sql}
+        GROUP BY transaction_date
+        ON DUPLICATE KEY UPDATE
+            sales_count = VALUES(sales_count),
+            quantity_sold = VALUES(quantity_sold),
+            revenue = VALUES(revenue),
+            price_sum = VALUES(price_sum),
+            price_count = VALUES(price_count),
+            {', '.join(f'{purpose}_used = VALUES({purpose}_used)' for purpose in MILK_USAGE_PURPOSES)}
+    """, params)
+    
+    cursor.execute(f"""
+        INSERT INTO milk_daily_buyer_rollup (transaction_date, buyer, sales_count, quantity_sold, revenue)
+        SELECT transaction_date, COALESCE(buyer, ''), COUNT(*),
+               COALESCE(SUM(quantity_sold), 0), COALESCE(SUM(total_amount), 0)
+        FROM milk_sales_usage
+        {where_sql} {'AND' if where_sql else 'WHERE'} transaction_type = 'sale'
+        GROUP BY transaction_date, COALESCE(buyer, '')
+    """, params)
+
+def refresh_milk_production_rollup(cursor, cow_id, production_date):
+    """Recompute the cow-day and farm-day production rollups for one cow and date"""
+    cursor.execute("""
+        DELETE FROM milk_daily_cow_rollup WHERE cow_id = %s AND production_date = %s
+    """, (cow_id, production_date))
+    _insert_milk_cow_rollups(cursor, "WHERE cow_id = %s AND production_date = %s", (cow_id, production_date))
+    
+    # Reset the day first so a day whose last record was removed drops to zero
+    cursor.execute("""
+        UPDATE milk_daily_rollup SET 
+            record_count = 0, total_quantity = 0, max_quantity = 0,
+            composition_count = 0, composition_fat_sum = 0, composition_protein_sum = 0,
+            good_quality_count = 0, moderate_quality_count = 0, poor_quality_count = 0
+        WHERE rollup_date = %s
+    """, (production_date,))
+    _upsert_milk_daily_production(cursor, "WHERE production_date = %s", (production_date,))
+
+def refresh_milk_sales_rollup(cursor, transaction_date):
+    """Recompute the farm-day sales/usage and buyer-day rollups for one date"""
+    cursor.execute("DELETE FROM milk_daily_buyer_rollup WHERE transaction_date = %s", (transaction_date,))
+    _upsert_milk_daily_sales(cursor, "WHERE transaction_date = %s", (transaction_date,))
+
+def rebuild_milk_rollups(cursor):
+    """Rebuild every milk rollup from the raw production and sales tables"""
+    cursor.execute("DELETE FROM milk_daily_cow_rollup")
+    cursor.execute("DELETE FROM milk_daily_rollup")
+    cursor.execute("DELETE FROM milk_daily_buyer_rollup")
+    _insert_milk_cow_rollups(cursor, "", ())
+    _upsert_milk_daily_production(cursor, "", ())
+    _upsert_milk_daily_sales(cursor, "", ())
+
+@app.cli.command('rebuild-milk-rollups')
+def rebuild_milk_rollups_command():
+    """Rebuild the daily milk analytics rollups from raw records."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    rebuild_milk_rollups(cursor)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    print("✅ Milk rollups rebuilt")
+
+def month_range(months_back=0):
+    """[start, end) dates of the current month, or of an earlier one"""
+    start = datetime.now().date().replace(day=1)
+    for _ in range(months_back):
+        start = (start - timedelta(days=1)).replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
 @app.route('/api/milk-production/record', methods=['POST'])
+@invalidates('milk_production')
 def record_milk_production():
     """Record milk production data"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -9204,25 +11121,28 @@ def record_milk_production():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Insert milk production record
-        cursor.execute("""
-            INSERT INTO milk_production (
-                cow_id, production_date, milking_session, milk_quantity,
-                fat_percentage, protein_percentage, milk_grade,
-                milk_quality_assessment, additional_notes, recorded_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            data['cow_id'], data['production_date'], data['milking_session'],
-            data['milk_quantity'], data.get('fat_percentage'), data.get('protein_percentage'),
-            data.get('milk_grade'), data.get('milk_quality_assessment'),
-            data.get('additional_notes'), session['employee_id']
-        ))
-        
-        production_id = cursor.lastrowid
+        # Insert milk production record and update its daily rollups together
+        with db_transaction():
+            cursor.execute("""
+                INSERT INTO milk_production (
+                    cow_id, production_date, milking_session, milk_quantity,
+                    fat_percentage, protein_percentage, milk_grade,
+                    milk_quality_assessment, additional_notes, recorded_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                data['cow_id'], data['production_date'], data['milking_session'],
+                data['milk_quantity'], data.get('fat_percentage'), data.get('protein_percentage'),
+                data.get('milk_grade'), data.get('milk_quality_assessment'),
+                data.get('additional_notes'), session['employee_id']
+            ))
+            
+            production_id = cursor.lastrowid
+            refresh_milk_production_rollup(cursor, data['cow_id'], data['production_date'])
         
         # Log activity
         log_activity(session['employee_id'], 'MILK_PRODUCTION', 
-                   f'Milk production recorded: {data["milk_quantity"]}L for cow {data["cow_id"]}')
+                   f'Milk production recorded: {data["milk_quantity"]}L for cow {data["cow_id"]}',
+                   entity_type='cow', entity_id=data['cow_id'])
         
         conn.commit()
         cursor.close()
@@ -9286,6 +11206,7 @@ def get_milk_production_record(production_id):
         return jsonify({'success': False, 'message': f'Failed to get production record: {str(e)}'})
 
 @app.route('/api/milk-production/<int:production_id>/edit', methods=['PUT'])
+@invalidates('milk_production')
 def edit_milk_production_record(production_id):
     """Edit a milk production record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -9305,7 +11226,7 @@ def edit_milk_production_record(production_id):
         
         # Get original data for comparison
         cursor.execute("""
-            SELECT production_date, milking_session, milk_quantity, fat_percentage, 
+            SELECT cow_id, production_date, milking_session, milk_quantity, fat_percentage, 
                    protein_percentage, milk_grade, milk_quality_assessment, additional_notes
             FROM milk_production WHERE id = %s
         """, (production_id,))
@@ -9335,31 +11256,38 @@ def edit_milk_production_record(production_id):
         if str(original_data['additional_notes'] or '') != str(data.get('additional_notes') or ''):
             changes.append(('additional_notes', str(original_data['additional_notes'] or ''), str(data.get('additional_notes') or '')))
         
-        # Update milk production record
-        cursor.execute("""
-            UPDATE milk_production SET 
-                production_date = %s, milking_session = %s, milk_quantity = %s,
-                fat_percentage = %s, protein_percentage = %s, milk_grade = %s,
-                milk_quality_assessment = %s, additional_notes = %s
-            WHERE id = %s
-        """, (
-            data['production_date'], data['milking_session'], data['milk_quantity'],
-            data.get('fat_percentage'), data.get('protein_percentage'),
-            data.get('milk_grade'), data.get('milk_quality_assessment'),
-            data.get('additional_notes'), production_id
-        ))
-        
-        # Insert audit records for each changed field
-        for field_name, old_value, new_value in changes:
+        with db_transaction():
+            # Update milk production record
             cursor.execute("""
-                INSERT INTO milk_production_edit_history 
-                (production_id, field_name, old_value, new_value, edited_by)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (production_id, field_name, old_value, new_value, session['employee_id']))
+                UPDATE milk_production SET 
+                    production_date = %s, milking_session = %s, milk_quantity = %s,
+                    fat_percentage = %s, protein_percentage = %s, milk_grade = %s,
+                    milk_quality_assessment = %s, additional_notes = %s
+                WHERE id = %s
+            """, (
+                data['production_date'], data['milking_session'], data['milk_quantity'],
+                data.get('fat_percentage'), data.get('protein_percentage'),
+                data.get('milk_grade'), data.get('milk_quality_assessment'),
+                data.get('additional_notes'), production_id
+            ))
+            
+            # Insert audit records for each changed field
+            for field_name, old_value, new_value in changes:
+                cursor.execute("""
+                    INSERT INTO milk_production_edit_history 
+                    (production_id, field_name, old_value, new_value, edited_by)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (production_id, field_name, old_value, new_value, session['employee_id']))
+            
+            # Refresh the rollups of the old and (if moved) the new production day
+            refresh_milk_production_rollup(cursor, original_data['cow_id'], original_data['production_date'])
+            if str(original_data['production_date']) != str(data['production_date']):
+                refresh_milk_production_rollup(cursor, original_data['cow_id'], data['production_date'])
         
         # Log activity
         log_activity(session['employee_id'], 'MILK_PRODUCTION_EDIT', 
-                   f'Milk production record {production_id} updated: {data["milk_quantity"]}L')
+                   f'Milk production record {production_id} updated: {data["milk_quantity"]}L',
+                   entity_type='cow', entity_id=original_data['cow_id'])
         
         conn.commit()
         cursor.close()
@@ -9375,6 +11303,7 @@ def edit_milk_production_record(production_id):
         return jsonify({'success': False, 'message': f'Failed to update production record: {str(e)}'})
 
 @app.route('/api/milk-production/<int:production_id>/delete', methods=['DELETE'])
+@invalidates('milk_production')
 def delete_milk_production_record(production_id):
     """Delete a milk production record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -9402,19 +11331,23 @@ def delete_milk_production_record(production_id):
             cursor.execute("""
                 SELECT COUNT(*) as count FROM milk_production 
                 WHERE cow_id = %s AND id != %s
-            """, (record[0], production_id))
+            """, (record['cow_id'], production_id))
             related_records = cursor.fetchone()
-            print(f"Found {related_records['count']} other production records for cow {record[0]}")
+            print(f"Found {related_records['count']} other production records for cow {record['cow_id']}")
         except Exception as debug_e:
             print(f"Debug query failed: {debug_e}")
         
-        # Delete the record
+        # Delete the record and update its daily rollups together
         print(f"Attempting to delete milk production record {production_id}")
-        cursor.execute("DELETE FROM milk_production WHERE id = %s", (production_id,))
-        
-        # Check if any rows were affected
-        rows_affected = cursor.rowcount
-        print(f"Delete query affected {rows_affected} rows")
+        with db_transaction():
+            cursor.execute("DELETE FROM milk_production WHERE id = %s", (production_id,))
+            
+            # Check if any rows were affected
+            rows_affected = cursor.rowcount
+            print(f"Delete query affected {rows_affected} rows")
+            
+            if rows_affected:
+                refresh_milk_production_rollup(cursor, record['cow_id'], record['production_date'])
         
         if rows_affected == 0:
             return jsonify({'success': False, 'message': 'No record was deleted. Record may not exist.'})
@@ -9422,7 +11355,8 @@ def delete_milk_production_record(production_id):
         # Log activity (with error handling)
         try:
             log_activity(session['employee_id'], 'MILK_PRODUCTION_DELETE', 
-                       f'Milk production record {production_id} deleted: {record[1]}L from cow {record[0]} on {record[2]}')
+                       f'Milk production record {production_id} deleted: {record["milk_quantity"]}L from cow {record["cow_id"]} on {record["production_date"]}',
+                       entity_type='cow', entity_id=record['cow_id'])
         except Exception as log_error:
             print(f"Warning: Failed to log activity: {log_error}")
             # Continue with the operation even if logging fails
@@ -9502,6 +11436,7 @@ def get_milk_production_audit(production_id):
             conn.close()
 
 @app.route('/api/milk-sales-usage/record', methods=['POST'])
+@invalidates('milk_sales_usage')
 def record_milk_sales_usage():
     """Record milk sales or usage data"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -9519,221 +11454,189 @@ def record_milk_sales_usage():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Insert sales/usage record
-        cursor.execute("""
-            INSERT INTO milk_sales_usage (
-                transaction_type, transaction_date, buyer, quantity_sold,
-                price_per_liter, total_amount, quantity_used, purpose_of_use, recorded_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            data['transaction_type'], data['transaction_date'], data.get('buyer'),
-            data.get('quantity_sold'), data.get('price_per_liter'), data.get('total_amount'),
-            data.get('quantity_used'), data.get('purpose_of_use'), session['employee_id']
-        ))
-        
-        transaction_id = cursor.lastrowid
-        
-        # Log activity
-        log_activity(session['employee_id'], 'MILK_TRANSACTION', 
-                   f'{data["transaction_type"].title()} recorded: {data.get("quantity_sold", data.get("quantity_used", 0))}L')
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'message': f'{data["transaction_type"].title()} recorded successfully',
-            'transaction_id': transaction_id
-        })
-        
-    except Exception as e:
-        print(f"Error recording milk transaction: {str(e)}")
-        return jsonify({'success': False, 'message': f'Failed to record transaction: {str(e)}'})
-
-@app.route('/api/milk-analytics/production', methods=['GET'])
-def get_milk_production_analytics():
-    """Get milk production analytics data"""
-    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get current month production data
-        cursor.execute("""
-            SELECT 
-                SUM(milk_quantity) as total_production,
-                AVG(milk_quantity) as daily_average,
-                MAX(milk_quantity) as peak_production,
-                COUNT(*) as production_days
-            FROM milk_production 
-            WHERE MONTH(production_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(production_date) = YEAR(CURRENT_DATE())
-        """)
-        current_month = cursor.fetchone()
-        
-        # Get last month production for growth calculation
-        cursor.execute("""
-            SELECT SUM(milk_quantity) as last_month_production
-            FROM milk_production 
-            WHERE MONTH(production_date) = MONTH(CURRENT_DATE() - INTERVAL 1 MONTH) 
-            AND YEAR(production_date) = YEAR(CURRENT_DATE() - INTERVAL 1 MONTH)
-        """)
-        last_month = cursor.fetchone()
-        
-        # Get 30-day trend data
-        cursor.execute("""
-            SELECT 
-                production_date,
-                SUM(milk_quantity) as daily_production
-            FROM milk_production 
-            WHERE production_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
-            GROUP BY production_date
-            ORDER BY production_date
-        """)
-        trend_data = cursor.fetchall()
-        
-        # Calculate growth rate
-        current_total = float(current_month['total_production'] or 0)
-        last_total = float(last_month['last_month_production'] or 0)
-        growth_rate = ((current_total - last_total) / last_total * 100) if last_total > 0 else 0
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'total_production': current_total,
-                'daily_average': float(current_month['daily_average'] or 0),
-                'peak_production': float(current_month['peak_production'] or 0),
-                'growth_rate': round(growth_rate, 1),
-                'trend_data': [{'date': str(record['production_date']), 'production': float(record['daily_production'])} for record in trend_data]
-            }
-        })
-        
-    except Exception as e:
-        print(f"Error getting milk production analytics: {str(e)}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/milk-analytics/usage', methods=['GET'])
-def get_milk_usage_analytics():
-    """Get milk usage analytics data"""
-    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get usage data by purpose for current month
-        cursor.execute("""
-            SELECT 
-                purpose_of_use,
-                SUM(quantity_used) as total_usage
-            FROM milk_sales_usage 
-            WHERE transaction_type = 'usage' 
-            AND MONTH(transaction_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(transaction_date) = YEAR(CURRENT_DATE())
-            GROUP BY purpose_of_use
-        """)
-        usage_data = cursor.fetchall()
-        
-        # Format usage data
-        usage_stats = {
-            'calf_feeding': 0,
-            'home_consumption': 0,
-            'processing': 0,
-            'wastage_spoiled': 0
-        }
-        
-        for record in usage_data:
-            if record['purpose_of_use']:
-                usage_stats[record['purpose_of_use']] = float(record['total_usage'] or 0)
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'data': usage_stats
-        })
-        
-    except Exception as e:
-        print(f"Error getting milk usage analytics: {str(e)}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/milk-analytics/quality', methods=['GET'])
-def get_milk_quality_analytics():
-    """Get milk quality analytics data"""
-    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
-        return jsonify({'error': 'Unauthorized'}), 401
-    
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get quality distribution for current month
-        cursor.execute("""
-            SELECT 
-                milk_quality_assessment,
-                COUNT(*) as count,
-                AVG(fat_percentage) as avg_fat,
-                AVG(protein_percentage) as avg_protein
-            FROM milk_production 
-            WHERE MONTH(production_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(production_date) = YEAR(CURRENT_DATE())
-            GROUP BY milk_quality_assessment
-        """)
-        quality_data = cursor.fetchall()
-        
-        # Calculate quality percentages
-        total_records = sum(record['count'] for record in quality_data)
-        quality_stats = {
-            'good_quality': 0,
-            'moderate_quality': 0,
-            'poor_quality': 0,
-            'avg_fat_content': 0,
-            'avg_protein_content': 0
-        }
-        
-        for record in quality_data:
-            percentage = (record['count'] / total_records * 100) if total_records > 0 else 0
-            quality_stats[record['milk_quality_assessment']] = round(percentage, 1)
-        
-        # Calculate average composition
-        cursor.execute("""
-            SELECT 
-                AVG(fat_percentage) as avg_fat,
-                AVG(protein_percentage) as avg_protein
-            FROM milk_production 
-            WHERE MONTH(production_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(production_date) = YEAR(CURRENT_DATE())
-            AND fat_percentage IS NOT NULL 
-            AND protein_percentage IS NOT NULL
-        """)
-        composition = cursor.fetchone()
+        # Insert sales/usage record and update its daily rollups together
+        with db_transaction():
+            cursor.execute("""
+                INSERT INTO milk_sales_usage (
+                    transaction_type, transaction_date, buyer, quantity_sold,
+                    price_per_liter, total_amount, quantity_used, purpose_of_use, recorded_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                data['transaction_type'], data['transaction_date'], data.get('buyer'),
+                data.get('quantity_sold'), data.get('price_per_liter'), data.get('total_amount'),
+                data.get('quantity_used'), data.get('purpose_of_use'), session['employee_id']
+            ))
+            
+            transaction_id = cursor.lastrowid
+            refresh_milk_sales_rollup(cursor, data['transaction_date'])
         
-        quality_stats['avg_fat_content'] = round(float(composition['avg_fat'] or 0), 1)
-        quality_stats['avg_protein_content'] = round(float(composition['avg_protein'] or 0), 1)
+        # Log activity
+        log_activity(session['employee_id'], 'MILK_TRANSACTION', 
+                   f'{data["transaction_type"].title()} recorded: {data.get("quantity_sold", data.get("quantity_used", 0))}L',
+                   entity_type='milk_transaction', entity_id=transaction_id)
         
+        conn.commit()
         cursor.close()
         conn.close()
         
         return jsonify({
             'success': True,
-            'data': quality_stats
+            'message': f'{data["transaction_type"].title()} recorded successfully',
+            'transaction_id': transaction_id
         })
         
     except Exception as e:
-        print(f"Error getting milk quality analytics: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        print(f"Error recording milk transaction: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to record transaction: {str(e)}'})
 
-@app.route('/api/milk-analytics/sales', methods=['GET'])
-def get_milk_sales_analytics():
-    """Get milk sales analytics data"""
+def build_milk_analytics(cursor):
+    """Production, usage, quality, sales and per-animal analytics for the current month.
+    
+    Everything is derived from the daily rollups over one shared window (the
+    previous month through the end of this one, which also covers the 30-day
+    trends) in three queries.
+    """
+    month_start, month_end = month_range()
+    last_month_start, last_month_end = month_range(1)
+    trend_start = datetime.now().date() - timedelta(days=30)
+    window_start = min(last_month_start, trend_start)
+    
+    cursor.execute("""
+        SELECT * FROM milk_daily_rollup
+        WHERE rollup_date >= %s AND rollup_date < %s
+        ORDER BY rollup_date
+    """, (window_start, month_end))
+    days = cursor.fetchall()
+    
+    cursor.execute("""
+        SELECT 
+            NULLIF(buyer, '') as buyer,
+            SUM(quantity_sold) as quantity,
+            SUM(revenue) as revenue
+        FROM milk_daily_buyer_rollup 
+        WHERE transaction_date >= %s AND transaction_date < %s
+        GROUP BY buyer
+        ORDER BY revenue DESC
+    """, (month_start, month_end))
+    buyers_data = cursor.fetchall()
+    
+    cursor.execute("""
+        SELECT 
+            c.id,
+            c.ear_tag,
+            c.name,
+            SUM(r.total_quantity) as total_production,
+            SUM(r.total_quantity) / SUM(r.record_count) as avg_daily_production,
+            SUM(r.record_count) as production_days,
+            SUM(r.fat_sum) / NULLIF(SUM(r.fat_count), 0) as avg_fat,
+            SUM(r.protein_sum) / NULLIF(SUM(r.protein_count), 0) as avg_protein
+        FROM milk_daily_cow_rollup r
+        JOIN cows c ON c.id = r.cow_id
+        WHERE c.status = 'active'
+        AND r.production_date >= %s AND r.production_date < %s
+        GROUP BY c.id, c.ear_tag, c.name
+        HAVING total_production > 0
+        ORDER BY total_production DESC
+    """, (month_start, month_end))
+    animals_data = cursor.fetchall()
+    
+    # Single pass over the daily rows
+    totals = {
+        'record_count': 0, 'total_quantity': 0.0, 'max_quantity': 0.0,
+        'composition_count': 0, 'composition_fat_sum': 0.0, 'composition_protein_sum': 0.0,
+        'good_quality_count': 0, 'moderate_quality_count': 0, 'poor_quality_count': 0,
+        'sales_count': 0, 'quantity_sold': 0.0, 'revenue': 0.0, 'price_sum': 0.0, 'price_count': 0
+    }
+    for purpose in MILK_USAGE_PURPOSES:
+        totals[f'{purpose}_used'] = 0.0
+    last_total = 0.0
+    production_trend = []
+    sales_trend = []
+    for day in days:
+        rollup_date = day['rollup_date']
+        if month_start <= rollup_date:
+            for key in totals:
+                if key == 'max_quantity':
+                    totals[key] = max(totals[key], float(day[key]))
+                elif isinstance(totals[key], float):
+                    totals[key] += float(day[key])
+                else:
+                    totals[key] += int(day[key])
+        elif last_month_start <= rollup_date < last_month_end:
+            last_total += float(day['total_quantity'])
+        if rollup_date >= trend_start:
+            if day['record_count']:
+                production_trend.append({'date': str(rollup_date), 'production': float(day['total_quantity'])})
+            if day['sales_count']:
+                sales_trend.append({'date': str(rollup_date), 'quantity': float(day['quantity_sold']), 'revenue': float(day['revenue'])})
+    
+    record_count = totals['record_count']
+    current_total = totals['total_quantity']
+    growth_rate = ((current_total - last_total) / last_total * 100) if last_total > 0 else 0
+    composition_count = totals['composition_count']
+    
+    quality = {}
+    for level in ['good_quality', 'moderate_quality', 'poor_quality']:
+        quality[level] = round(totals[f'{level}_count'] / record_count * 100, 1) if record_count > 0 else 0
+    quality['avg_fat_content'] = round(totals['composition_fat_sum'] / composition_count, 1) if composition_count else 0
+    quality['avg_protein_content'] = round(totals['composition_protein_sum'] / composition_count, 1) if composition_count else 0
+    
+    return {
+        'window': {'start': str(month_start), 'end': str(month_end - timedelta(days=1))},
+        'production': {
+            'total_production': current_total,
+            'daily_average': current_total / record_count if record_count else 0,
+            'peak_production': totals['max_quantity'],
+            'growth_rate': round(growth_rate, 1),
+            'trend_data': production_trend
+        },
+        'usage': {purpose: totals[f'{purpose}_used'] for purpose in MILK_USAGE_PURPOSES},
+        'quality': quality,
+        'sales': {
+            'total_sold': totals['quantity_sold'],
+            'total_revenue': totals['revenue'],
+            'avg_price': totals['price_sum'] / totals['price_count'] if totals['price_count'] else 0,
+            'sales_count': totals['sales_count'],
+            'buyers': [{'buyer': record['buyer'], 'quantity': float(record['quantity']), 'revenue': float(record['revenue'])} for record in buyers_data],
+            'trend_data': sales_trend
+        },
+        'animals': [{
+            'id': record['id'],
+            'ear_tag': record['ear_tag'],
+            'name': record['name'] or 'Unnamed',
+            'total_production': float(record['total_production'] or 0),
+            'avg_daily_production': float(record['avg_daily_production'] or 0),
+            'production_days': int(record['production_days'] or 0),
+            'avg_fat': float(record['avg_fat'] or 0),
+            'avg_protein': float(record['avg_protein'] or 0)
+        } for record in animals_data]
+    }
+
+# Tables the milk analytics are derived from (the rollups follow the first two)
+MILK_ANALYTICS_TABLES = ('milk_production', 'milk_sales_usage', 'cows')
+milk_analytics_cache = VersionedCache('milk_analytics', MILK_ANALYTICS_TABLES)
+
+def milk_analytics_etag(cursor):
+    """Validator for the milk analytics, known before anything is built.
+    
+    The analytics only change when a source table's change counter moves or
+    when the day rolls over (the window follows today's date).
+    """
+    versions = get_table_versions(cursor, *MILK_ANALYTICS_TABLES)
+    return hashlib.sha1(f"{datetime.now().date()}:{versions}".encode()).hexdigest()
+
+def get_milk_analytics(cursor):
+    """build_milk_analytics() shared by the bundle and the section endpoints"""
+    today = datetime.now().date()
+    built_on, analytics = milk_analytics_cache.get(cursor, lambda cursor: (today, build_milk_analytics(cursor)))
+    if built_on != today:
+        milk_analytics_cache.invalidate()
+        built_on, analytics = milk_analytics_cache.get(cursor, lambda cursor: (today, build_milk_analytics(cursor)))
+    return analytics
+
+@app.route('/api/milk-analytics/bundle', methods=['GET'])
+def get_milk_analytics_bundle():
+    """Get every milk analytics section in one response (supports If-None-Match)"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'error': 'Unauthorized'}), 401
     
@@ -9741,121 +11644,76 @@ def get_milk_sales_analytics():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get sales data for current month
-        cursor.execute("""
-            SELECT 
-                SUM(quantity_sold) as total_sold,
-                SUM(total_amount) as total_revenue,
-                AVG(price_per_liter) as avg_price,
-                COUNT(*) as sales_count
-            FROM milk_sales_usage 
-            WHERE transaction_type = 'sale' 
-            AND MONTH(transaction_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(transaction_date) = YEAR(CURRENT_DATE())
-        """)
-        sales_data = cursor.fetchone()
-        
-        # Get sales by buyer
-        cursor.execute("""
-            SELECT 
-                buyer,
-                SUM(quantity_sold) as quantity,
-                SUM(total_amount) as revenue
-            FROM milk_sales_usage 
-            WHERE transaction_type = 'sale' 
-            AND MONTH(transaction_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(transaction_date) = YEAR(CURRENT_DATE())
-            GROUP BY buyer
-            ORDER BY revenue DESC
-        """)
-        buyers_data = cursor.fetchall()
-        
-        # Get daily sales trend
-        cursor.execute("""
-            SELECT 
-                transaction_date,
-                SUM(quantity_sold) as daily_quantity,
-                SUM(total_amount) as daily_revenue
-            FROM milk_sales_usage 
-            WHERE transaction_type = 'sale' 
-            AND transaction_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
-            GROUP BY transaction_date
-            ORDER BY transaction_date
-        """)
-        trend_data = cursor.fetchall()
+        # Unchanged analytics are answered with 304 Not Modified before any
+        # rollup is read
+        etag = milk_analytics_etag(cursor)
+        not_modified = app.response_class(status=200)
+        not_modified.set_etag(etag)
+        not_modified.headers['Cache-Control'] = 'private, no-cache'
+        if not_modified.make_conditional(request).status_code == 304:
+            cursor.close()
+            conn.close()
+            return not_modified
         
+        analytics = get_milk_analytics(cursor)
         cursor.close()
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'total_sold': float(sales_data['total_sold'] or 0),
-                'total_revenue': float(sales_data['total_revenue'] or 0),
-                'avg_price': float(sales_data['avg_price'] or 0),
-                'sales_count': sales_data['sales_count'] or 0,
-                'buyers': [{'buyer': record['buyer'], 'quantity': float(record['quantity']), 'revenue': float(record['revenue'])} for record in buyers_data],
-                'trend_data': [{'date': str(record['transaction_date']), 'quantity': float(record['daily_quantity']), 'revenue': float(record['daily_revenue'])} for record in trend_data]
-            }
-        })
+        response = jsonify({'success': True, 'data': analytics})
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
-        print(f"Error getting milk sales analytics: {str(e)}")
+        print(f"Error getting milk analytics bundle: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/milk-analytics/animals', methods=['GET'])
-def get_animal_production_analytics():
-    """Get individual animal production analytics"""
+def milk_analytics_section(section):
+    """Serve one section of the milk analytics bundle"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Get production by individual animals for current month
-        cursor.execute("""
-            SELECT 
-                c.id,
-                c.ear_tag,
-                c.name,
-                SUM(mp.milk_quantity) as total_production,
-                AVG(mp.milk_quantity) as avg_daily_production,
-                COUNT(mp.id) as production_days,
-                AVG(mp.fat_percentage) as avg_fat,
-                AVG(mp.protein_percentage) as avg_protein
-            FROM cows c
-            LEFT JOIN milk_production mp ON c.id = mp.cow_id 
-            AND MONTH(mp.production_date) = MONTH(CURRENT_DATE()) 
-            AND YEAR(mp.production_date) = YEAR(CURRENT_DATE())
-            WHERE c.status = 'active'
-            GROUP BY c.id, c.ear_tag, c.name
-            HAVING total_production > 0
-            ORDER BY total_production DESC
-        """)
-        animals_data = cursor.fetchall()
-        
+        analytics = get_milk_analytics(cursor)
         cursor.close()
         conn.close()
         
         return jsonify({
             'success': True,
-            'data': [{
-                'id': record['id'],
-                'ear_tag': record['ear_tag'],
-                'name': record['name'] or 'Unnamed',
-                'total_production': float(record['total_production'] or 0),
-                'avg_daily_production': float(record['avg_daily_production'] or 0),
-                'production_days': record['production_days'] or 0,
-                'avg_fat': float(record['avg_fat'] or 0),
-                'avg_protein': float(record['avg_protein'] or 0)
-            } for record in animals_data]
+            'data': analytics[section]
         })
         
     except Exception as e:
-        print(f"Error getting animal production analytics: {str(e)}")
+        print(f"Error getting milk {section} analytics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/milk-analytics/production', methods=['GET'])
+def get_milk_production_analytics():
+    """Get milk production analytics data"""
+    return milk_analytics_section('production')
+
+@app.route('/api/milk-analytics/usage', methods=['GET'])
+def get_milk_usage_analytics():
+    """Get milk usage analytics data"""
+    return milk_analytics_section('usage')
+
+@app.route('/api/milk-analytics/quality', methods=['GET'])
+def get_milk_quality_analytics():
+    """Get milk quality analytics data"""
+    return milk_analytics_section('quality')
+
+@app.route('/api/milk-analytics/sales', methods=['GET'])
+def get_milk_sales_analytics():
+    """Get milk sales analytics data"""
+    return milk_analytics_section('sales')
+
+@app.route('/api/milk-analytics/animals', methods=['GET'])
+def get_animal_production_analytics():
+    """Get individual animal production analytics"""
+    return milk_analytics_section('animals')
+
 @app.route('/api/cow/<int:cow_id>/details', methods=['GET'])
 def get_cow_detailed_info(cow_id):
     """Get detailed information for a specific cow"""
@@ -10065,6 +11923,7 @@ def get_available_sires():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/cow-breeding/register', methods=['POST'])
+@invalidates('cow_breeding')
 def register_cow_breeding():
     """Register a new breeding record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10108,7 +11967,8 @@ def register_cow_breeding():
         
         # Log activity
         log_activity(session['employee_id'], 'COW_BREEDING', 
-                   f'Breeding registered: Dam {data["dam_id"]} x Sire {data["sire_id"]}')
+                   f'Breeding registered: Dam {data["dam_id"]} x Sire {data["sire_id"]}',
+                   entity_type='cow', entity_id=data['dam_id'])
         
         conn.commit()
         cursor.close()
@@ -10213,6 +12073,7 @@ def get_breeding_list():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/cow-breeding/cancel-conception', methods=['POST'])
+@invalidates('cow_breeding')
 def cancel_conception():
     """Cancel conception for a breeding record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10230,7 +12091,7 @@ def cancel_conception():
         
         # Check if breeding record exists and is within 30 days
         cursor.execute("""
-            SELECT breeding_date, pregnancy_status, conception_cancelled
+            SELECT breeding_date, pregnancy_status, conception_cancelled, dam_id
             FROM cow_breeding 
             WHERE id = %s
         """, (data['breeding_id'],))
@@ -10262,7 +12123,8 @@ def cancel_conception():
         
         # Log activity
         log_activity(session['employee_id'], 'COW_BREEDING_CANCEL', 
-                   f'Conception cancelled for breeding record {data["breeding_id"]}')
+                   f'Conception cancelled for breeding record {data["breeding_id"]}',
+                   entity_type='cow', entity_id=breeding['dam_id'])
         
         conn.commit()
         cursor.close()
@@ -10278,6 +12140,7 @@ def cancel_conception():
         return jsonify({'success': False, 'message': f'Failed to cancel conception: {str(e)}'})
 
 @app.route('/api/cow-breeding/end-lactation', methods=['POST'])
+@invalidates('cow_breeding')
 def end_lactation():
     """End lactation and change pregnancy status to available"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10315,7 +12178,8 @@ def end_lactation():
         
         # Log activity
         log_activity(session['employee_id'], 'LACTATION_ENDED', 
-                   f'Lactation ended for breeding ID {breeding_id}')
+                   f'Lactation ended for breeding ID {breeding_id}',
+                   entity_type='cow', entity_id=breeding['dam_id'])
         
         conn.commit()
         cursor.close()
@@ -10328,6 +12192,7 @@ def end_lactation():
         return jsonify({'success': False, 'message': f'Failed to end lactation: {str(e)}'})
 
 @app.route('/api/cow-breeding/calve', methods=['POST'])
+@invalidates('cow_breeding', 'calves')
 def register_calving():
     """Register calving and create calf record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10372,10 +12237,8 @@ def register_calving():
         lactation_start_date = calving_date
         lactation_end_date = calving_date + timedelta(days=305)
         
-        # Start transaction
-        cursor.execute("START TRANSACTION")
-        
-        try:
+        # Calf, calving details and the audit entry are written in one transaction
+        with db_transaction():
             # Create calf record
             cursor.execute("""
                 INSERT INTO calves (calf_id, name, breed, color_markings, gender, birth_date, dam_id, sire_id, recorded_by)
@@ -10406,24 +12269,19 @@ def register_calving():
             
             # Log activity
             log_activity(session['employee_id'], 'COW_CALVING', 
-                       f'Calving registered: {calf_id} born to {breeding["dam_ear_tag"]}')
-            
-            cursor.execute("COMMIT")
-            
-            return jsonify({
-                'success': True,
-                'message': 'Calving registered successfully',
-                'calf_id': calf_id,
-                'lactation_end_date': str(lactation_end_date)
-            })
-            
-        except Exception as e:
-            cursor.execute("ROLLBACK")
-            raise e
+                       f'Calving registered: {calf_id} born to {breeding["dam_ear_tag"]}',
+                       entity_type='cow', entity_id=breeding['dam_id'])
         
-        finally:
-            cursor.close()
-            conn.close()
+        refresh_search_entry('calf', calf_record_id)
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Calving registered successfully',
+            'calf_id': calf_id,
+            'lactation_end_date': str(lactation_end_date)
+        })
         
     except Exception as e:
         print(f"Error registering calving: {str(e)}")
@@ -10494,56 +12352,60 @@ def get_ready_to_calve():
         print(f"Error getting ready to calve cows: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-def update_pregnancy_status():
+@scheduled_job('cow_pregnancy_status', interval=3600, tables=('cow_breeding',))
+def update_pregnancy_status(cursor):
     """Background job to update pregnancy status from 'served' to 'conceived' after 30 days"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Update pregnancy status from 'served' to 'conceived' for records older than 30 days
-        cursor.execute("""
-            UPDATE cow_breeding 
-            SET pregnancy_status = 'conceived'
-            WHERE pregnancy_status = 'served' 
-            AND breeding_date <= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
-            AND conception_cancelled = FALSE
-        """)
-        
-        updated_count = cursor.rowcount
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        if updated_count > 0:
-            print(f"Updated {updated_count} pregnancy statuses from 'served' to 'conceived'")
-        
-    except Exception as e:
-        print(f"Error updating pregnancy status: {str(e)}")
-
-def update_lactation_status():
+    # Update pregnancy status from 'served' to 'conceived' for records older than 30 days
+    cursor.execute("""
+        UPDATE cow_breeding 
+        SET pregnancy_status = 'conceived'
+        WHERE pregnancy_status = 'served' 
+        AND breeding_date <= DATE_SUB(CURRENT_DATE(), INTERVAL 30 DAY)
+        AND conception_cancelled = FALSE
+    """)
+    
+    updated_count = cursor.rowcount
+    if updated_count > 0:
+        print(f"Updated {updated_count} pregnancy statuses from 'served' to 'conceived'")
+    return updated_count
+
+@scheduled_job('cow_lactation_status', interval=3600, tables=('cow_breeding',))
+def update_lactation_status(cursor):
     """Background job to update lactating cows back to available after 305 days"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Update pregnancy status from 'lactating' to 'available' for records past lactation period
-        cursor.execute("""
-            UPDATE cow_breeding 
-            SET pregnancy_status = 'available'
-            WHERE pregnancy_status = 'lactating' 
-            AND lactation_end_date <= CURRENT_DATE()
-        """)
-        
-        updated_count = cursor.rowcount
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        if updated_count > 0:
-            print(f"Updated {updated_count} cows from 'lactating' to 'available'")
-        
-    except Exception as e:
-        print(f"Error updating lactation status: {str(e)}")
+    # Update pregnancy status from 'lactating' to 'available' for records past lactation period
+    cursor.execute("""
+        UPDATE cow_breeding 
+        SET pregnancy_status = 'available'
+        WHERE pregnancy_status = 'lactating' 
+        AND lactation_end_date <= CURRENT_DATE()
+    """)
+    
+    updated_count = cursor.rowcount
+    if updated_count > 0:
+        print(f"Updated {updated_count} cows from 'lactating' to 'available'")
+    return updated_count
+
+@scheduled_job('litter_weaning', interval=3600, tables=('litters',))
+def update_litter_weaning_statuses(cursor):
+    """Background job to mark unweaned litters as weaned once all farrowing activities are done"""
+    cursor.execute("""
+        UPDATE litters l
+        JOIN (
+            SELECT farrowing_record_id,
+                   MAX(CASE WHEN activity_name = 'Weaning' THEN weaning_weight END) as weaning_weight,
+                   MAX(CASE WHEN activity_name = 'Weaning' THEN weaning_date END) as weaning_date
+            FROM farrowing_activities
+            GROUP BY farrowing_record_id
+            HAVING COUNT(*) = SUM(CASE WHEN completed = TRUE THEN 1 ELSE 0 END)
+        ) done ON done.farrowing_record_id = l.farrowing_record_id
+        SET l.status = 'weaned', l.weaning_date = done.weaning_date, 
+            l.weaning_weight = done.weaning_weight, l.updated_at = CURRENT_TIMESTAMP
+        WHERE l.status = 'unweaned'
+    """)
+    updated_count = cursor.rowcount
+    if updated_count > 0:
+        print(f"Updated {updated_count} litters to 'weaned'")
+    return updated_count
 
 @app.route('/api/farrowing/active-litters', methods=['GET'])
 def get_farrowing_active_litters():
@@ -10654,6 +12516,7 @@ def get_active_litters():
         return jsonify({'success': False, 'message': f'Failed to get active litters: {str(e)}'})
 
 @app.route('/api/litter/<litter_id>/wean', methods=['POST'])
+@invalidates('litters')
 def mark_litter_weaned(litter_id):
     """Mark a litter as weaned"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10704,7 +12567,8 @@ def mark_litter_weaned(litter_id):
         
         # Log activity
         log_activity(session['employee_id'], 'LITTER_WEANED', 
-                    f'Marked litter {litter_id} as weaned for sow {litter["sow_tag_id"]}')
+                    f'Marked litter {litter_id} as weaned for sow {litter["sow_tag_id"]}',
+                    entity_type='litter', entity_id=litter['id'])
         
         conn.commit()
         cursor.close()
@@ -10846,7 +12710,74 @@ def get_animal_weights(animal_id):
         print(f"Error getting animal weights: {str(e)}")
         return jsonify({'success': False, 'message': f'Failed to get weight records: {str(e)}'})
 
+def _upsert_latest_weights(cursor, where_sql, params):
+    """Copy the newest actual weight_records row of each animal/litter matching where_sql into latest_weight,
+    along with the newest one that has an expected weight (NULLs if none has)"""
+    cursor.execute(f"""
+        INSERT INTO latest_weight (
+            animal_id, litter_id, weight_record_id, weight, expected_weight, weighing_date,
+            expected_record_id, expected_record_weight, expected_record_expected_weight
+        )
+        SELECT animal_id, litter_id,
+               MAX(CASE WHEN rn = 1 THEN id END),
+               MAX(CASE WHEN rn = 1 THEN weight END),
+               MAX(CASE WHEN rn = 1 THEN expected_weight END),
+               MAX(CASE WHEN rn = 1 THEN weighing_date END),
+               MAX(CASE WHEN expected_rn = 1 THEN id END),
+               MAX(CASE WHEN expected_rn = 1 THEN weight END),
+               MAX(CASE WHEN expected_rn = 1 THEN expected_weight END)
+        FROM (
+            SELECT id, animal_id, litter_id, weight, expected_weight, weighing_date,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY animal_id, litter_id
+                       ORDER BY weighing_date DESC, weighing_time DESC, id DESC
+                   ) as rn,
+                   CASE WHEN expected_weight IS NOT NULL THEN ROW_NUMBER() OVER (
+                       PARTITION BY animal_id, litter_id, expected_weight IS NULL
+                       ORDER BY weighing_date DESC, weighing_time DESC, id DESC
+                   ) END as expected_rn
+            FROM weight_records
+            WHERE weight_type = 'actual' {where_sql}
+        ) w
+        WHERE w.rn = 1 OR w.expected_rn = 1
+        GROUP BY animal_id, litter_id
+        ON DUPLICATE KEY UPDATE
+            weight_record_id = VALUES(weight_record_id),
+            weight = VALUES(weight),
+            expected_weight = VALUES(expected_weight),
+            weighing_date = VALUES(weighing_date),
+            expected_record_id = VALUES(expected_record_id),
+            expected_record_weight = VALUES(expected_record_weight),
+            expected_record_expected_weight = VALUES(expected_record_expected_weight)
+    """, params)
+
+def refresh_latest_weight(cursor, animal_id=None, litter_id=None):
+    """Re-pick the latest weight of one animal or litter after its weight records changed"""
+    if animal_id is not None:
+        _upsert_latest_weights(cursor, "AND animal_id = %s", (animal_id,))
+    else:
+        _upsert_latest_weights(cursor, "AND litter_id = %s", (litter_id,))
+
+def rebuild_latest_weights(cursor):
+    """Rebuild latest_weight from every weight record"""
+    cursor.execute("DELETE FROM latest_weight")
+    _upsert_latest_weights(cursor, "", ())
+
+@app.cli.command('rebuild-latest-weights')
+def rebuild_latest_weights_command():
+    """Rebuild the latest weight per animal and litter from weight records."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    rebuild_latest_weights(cursor)
+    conn.commit()
+    cursor.execute("SELECT COUNT(*) as total FROM latest_weight")
+    total = cursor.fetchone()['total']
+    cursor.close()
+    conn.close()
+    print(f"✅ Latest weights rebuilt ({total} animals and litters)")
+
 @app.route('/api/animal/record-weight', methods=['POST'])
+@invalidates('weight_records')
 def record_animal_weight():
     """Record a new weight for an animal"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -10874,13 +12805,17 @@ def record_animal_weight():
         if not expected_weight:
             from datetime import datetime
             weighing_date_obj = datetime.strptime(weighing_date, '%Y-%m-%d').date()
-            expected_weight = calculate_expected_weight(animal_id=animal_id, weighing_date=weighing_date_obj)
+            animal_weights, _ = calculate_expected_weights(cursor, weighing_date_obj, animal_ids=[int(animal_id)])
+            expected_weight = animal_weights.get(int(animal_id))
         
-        # Insert single weight record with both actual and expected weights
-        cursor.execute("""
-            INSERT INTO weight_records (animal_id, weight, expected_weight, weight_type, weighing_date, weighing_time, notes, created_at, updated_at)
-            VALUES (%s, %s, %s, 'actual', %s, %s, %s, NOW(), NOW())
-        """, (animal_id, actual_weight, expected_weight, weighing_date, weighing_time, notes))
+        # Insert single weight record with both actual and expected weights,
+        # and move the animal's latest weight in the same transaction
+        with db_transaction():
+            cursor.execute("""
+                INSERT INTO weight_records (animal_id, weight, expected_weight, weight_type, weighing_date, weighing_time, notes, created_at, updated_at)
+                VALUES (%s, %s, %s, 'actual', %s, %s, %s, NOW(), NOW())
+            """, (animal_id, actual_weight, expected_weight, weighing_date, weighing_time, notes))
+            refresh_latest_weight(cursor, animal_id=animal_id)
         
         conn.commit()
         cursor.close()
@@ -10972,6 +12907,45 @@ def get_litter_details(litter_id):
         print(f"Error getting litter details: {str(e)}")
         return jsonify({'success': False, 'message': f'Failed to get litter details: {str(e)}'})
 
+@app.route('/api/litter/audit-trail/<int:litter_id>', methods=['GET'])
+def get_litter_audit_trail(litter_id):
+    """Get audit trail for a specific litter"""
+    if 'employee_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Get litter basic info
+        cursor.execute("""
+            SELECT l.id, l.litter_id, l.farrowing_date, l.sow_id, l.alive_piglets, l.status,
+                   p.tag_id as sow_tag_id
+            FROM litters l
+            LEFT JOIN pigs p ON l.sow_id = p.id
+            WHERE l.id = %s
+        """, (litter_id,))
+        litter = cursor.fetchone()
+        
+        if not litter:
+            return jsonify({'success': False, 'message': 'Litter not found'}), 404
+        
+        # Get activity log entries for this litter
+        audit_trail = get_entity_audit_trail(cursor, 'litter', litter_id)
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'litter': litter,
+            'audit_trail': audit_trail
+        })
+        
+    except Exception as e:
+        print(f"Error getting litter audit trail: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get audit trail: {str(e)}'})
+
 @app.route('/api/litter/<int:litter_id>/weights', methods=['GET'])
 def get_litter_weights(litter_id):
     """Get weight records for a specific litter"""
@@ -11030,6 +13004,7 @@ def get_litter_weights(litter_id):
         return jsonify({'success': False, 'message': f'Failed to get weight records: {str(e)}'})
 
 @app.route('/api/litter/record-weight', methods=['POST'])
+@invalidates('weight_records')
 def record_litter_weight():
     """Record a new weight for a litter"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -11057,13 +13032,17 @@ def record_litter_weight():
         if not expected_weight:
             from datetime import datetime
             weighing_date_obj = datetime.strptime(weighing_date, '%Y-%m-%d').date()
-            expected_weight = calculate_expected_weight(litter_id=litter_id, weighing_date=weighing_date_obj)
+            _, litter_weights = calculate_expected_weights(cursor, weighing_date_obj, litter_ids=[int(litter_id)])
+            expected_weight = litter_weights.get(int(litter_id))
         
-        # Insert single weight record with both actual and expected weights
-        cursor.execute("""
-            INSERT INTO weight_records (litter_id, weight, expected_weight, weight_type, weighing_date, weighing_time, notes, created_at, updated_at)
-            VALUES (%s, %s, %s, 'actual', %s, %s, %s, NOW(), NOW())
-        """, (litter_id, actual_weight, expected_weight, weighing_date, weighing_time, notes))
+        # Insert single weight record with both actual and expected weights,
+        # and move the litter's latest weight in the same transaction
+        with db_transaction():
+            cursor.execute("""
+                INSERT INTO weight_records (litter_id, weight, expected_weight, weight_type, weighing_date, weighing_time, notes, created_at, updated_at)
+                VALUES (%s, %s, %s, 'actual', %s, %s, %s, NOW(), NOW())
+            """, (litter_id, actual_weight, expected_weight, weighing_date, weighing_time, notes))
+            refresh_latest_weight(cursor, litter_id=litter_id)
         
         conn.commit()
         cursor.close()
@@ -11111,6 +13090,7 @@ def check_litter_id(litter_id):
         return jsonify({'exists': False, 'error': str(e)})
 
 @app.route('/api/litter/update/<int:litter_id>', methods=['PUT'])
+@invalidates('litters')
 def update_litter(litter_id):
     """Update litter details"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -11195,6 +13175,7 @@ def update_litter(litter_id):
         """, (litter_id, 'updated', activity_description))
         
         conn.commit()
+        refresh_search_entry('litter', litter_id)
         cursor.close()
         conn.close()
         
@@ -11339,7 +13320,8 @@ def check_and_trigger_recovery_period(farrowing_record_id):
                 
                 # Log the recovery period start
                 log_activity(session.get('employee_id', 1), 'RECOVERY_PERIOD_STARTED', 
-                           f'40-day recovery period started for farrowing {farrowing_record_id}, sow ready on {recovery_date}')
+                           f'40-day recovery period started for farrowing {farrowing_record_id}, sow ready on {recovery_date}',
+                           entity_type='farrowing', entity_id=farrowing_record_id)
                 
                 print(f"📅 Sow will be ready for next breeding on: {recovery_date}")
         
@@ -11400,7 +13382,8 @@ def check_and_update_litter_status(farrowing_record_id):
                 
                 # Log the activity
                 log_activity(session.get('employee_id', 1), 'LITTER_WEANED_AUTO', 
-                           f'Litter {litter["litter_id"]} automatically marked as weaned after all activities completed')
+                           f'Litter {litter["litter_id"]} automatically marked as weaned after all activities completed',
+                           entity_type='litter', entity_id=litter['id'])
         
         cursor.close()
         conn.close()
@@ -11440,6 +13423,124 @@ def get_weight_settings():
         print(f"Error fetching weight settings: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+class GrowthCurve:
+    """Expected pig weight by age, built from weight_categories.
+    
+    Overlapping categories go through flatten_age_ranges(). Each segment
+    carries its line, min_weight plus daily_gain per day since start_age,
+    so a lookup is a bisect and a multiply.
+    """
+    
+    def __init__(self, categories):
+        categories = sorted(categories, key=lambda c: (c['start_age'], c['id']))
+        self.segment_starts, owners = flatten_age_ranges(categories, 'start_age', 'end_age')
+        self.segments = [None if owner is None else (
+            owner['start_age'], float(owner['min_weight']), float(owner['daily_gain'])
+        ) for owner in owners]
+    
+    def expected_weight(self, age_days):
+        """Expected weight in kg at this age, or None outside every category"""
+        return self.expected_weights([age_days])[0]
+    
+    def expected_weights(self, ages):
+        """Expected weights for a sequence of ages in days, None where unknown.
+        
+        A numpy array of ages is evaluated in one vectorized step and gives
+        back a float array with NaN where the weight is unknown.
+        """
+        if np is not None and isinstance(ages, np.ndarray):
+            return self._expected_weights_array(ages)
+        starts = self.segment_starts
+        segments = self.segments
+        weights = []
+        for age_days in ages:
+            position = bisect_right(starts, age_days) - 1 if age_days is not None else -1
+            segment = segments[position] if position >= 0 else None
+            if segment is None:
+                weights.append(None)
+                continue
+            start_age, min_weight, daily_gain = segment
+            weights.append(round(min_weight + (age_days - start_age) * daily_gain, 2))
+        return weights
+
+    def _expected_weights_array(self, ages):
+        ages = np.asarray(ages, dtype=np.float64)
+        weights = np.full(ages.shape, np.nan)
+        if not self.segment_starts:
+            return weights
+        segments = [segment or (np.nan, np.nan, np.nan) for segment in self.segments]
+        start_ages, min_weights, daily_gains = (np.array(column, dtype=np.float64) for column in zip(*segments))
+        known = ~np.isnan(ages)
+        positions = np.full(ages.shape, -1)
+        positions[known] = np.searchsorted(np.array(self.segment_starts), ages[known], side='right') - 1
+        covered = positions >= 0
+        positions = positions[covered]
+        # Gaps carry NaN lines, so ages falling in them stay NaN
+        weights[covered] = np.round(
+            min_weights[positions] + (ages[covered] - start_ages[positions]) * daily_gains[positions], 2
+        )
+        return weights
+
+growth_curve_cache = VersionedCache('growth_curve', ('weight_categories',))
+
+def build_growth_curve(cursor):
+    """Load weight categories into a GrowthCurve"""
+    cursor.execute("""
+        SELECT id, start_age, end_age, category_name, min_weight, max_weight, daily_gain
+        FROM weight_categories
+    """)
+    return GrowthCurve(cursor.fetchall())
+
+def get_growth_curve(cursor):
+    """Shared GrowthCurve, rebuilt when weight categories change"""
+    return growth_curve_cache.get(cursor, build_growth_curve)
+
+def calculate_expected_weights(cursor, weighing_date, animal_ids=(), litter_ids=()):
+    """Expected weights of many pigs and litters on weighing_date.
+    
+    Birth and farrowing dates are read with one IN query per chunk and the
+    curve is evaluated over all ages at once. Returns two dicts keyed by
+    pig id and litter id; no date or an age of zero or less gives None.
+    """
+    results = []
+    curve = get_growth_curve(cursor)
+    for ids, sql in ((animal_ids, "SELECT id, birth_date AS born FROM pigs WHERE id IN ({})"),
+                     (litter_ids, "SELECT id, farrowing_date AS born FROM litters WHERE id IN ({})")):
+        ids = list(dict.fromkeys(ids))
+        born = {}
+        for chunk, placeholders in in_list_chunks(ids):
+            cursor.execute(sql.format(placeholders), chunk)
+            born.update((row['id'], row['born']) for row in cursor.fetchall())
+        ages = []
+        for record_id in ids:
+            age_days = (weighing_date - born[record_id]).days if born.get(record_id) else None
+            ages.append(age_days if age_days and age_days > 0 else None)
+        results.append(dict(zip(ids, curve.expected_weights(ages))))
+    return tuple(results)
+
+def fill_expected_weights(cursor, rows):
+    """Fill in expected_weight on weight rows that were recorded without one.
+    
+    Rows need animal_id, litter_id, weighing_date and expected_weight. A
+    weighing session puts a whole group on one date, so each date is a
+    single calculate_expected_weights() call. Returns rows.
+    """
+    by_date = {}
+    for row in rows:
+        if row['expected_weight'] is None and row['weighing_date']:
+            by_date.setdefault(row['weighing_date'], []).append(row)
+    for weighing_date, dated_rows in by_date.items():
+        animal_weights, litter_weights = calculate_expected_weights(
+            cursor, weighing_date,
+            animal_ids=[row['animal_id'] for row in dated_rows if row['animal_id']],
+            litter_ids=[row['litter_id'] for row in dated_rows if not row['animal_id'] and row['litter_id']])
+        for row in dated_rows:
+            if row['animal_id']:
+                row['expected_weight'] = animal_weights.get(row['animal_id'])
+            else:
+                row['expected_weight'] = litter_weights.get(row['litter_id'])
+    return rows
+
 @app.route('/api/weight/categories', methods=['GET'])
 def get_weight_categories():
     """Get all weight categories"""
@@ -11526,10 +13627,10 @@ def get_weight_comparison_data():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get weight records with actual vs expected comparison
+        # Get each animal's and litter's latest weight with actual vs expected comparison
         cursor.execute("""
             SELECT 
-                w.id,
+                w.weight_record_id as id,
                 w.animal_id,
                 w.litter_id,
                 w.weight as actual_weight,
@@ -11543,26 +13644,29 @@ def get_weight_comparison_data():
                     WHEN w.animal_id IS NOT NULL THEN 'animal'
                     WHEN w.litter_id IS NOT NULL THEN 'litter'
                     ELSE 'unknown'
-                END as record_type,
-                ROUND(((w.expected_weight - w.weight) / w.expected_weight * 100), 2) as weight_deficit_percentage,
-                CASE 
-                    WHEN w.weight >= w.expected_weight THEN 'meeting_target'
-                    WHEN w.weight >= (w.expected_weight * 0.9) THEN 'close_to_target'
-                    ELSE 'below_target'
-                END as performance_status
-            FROM weight_records w
+                END as record_type
+            FROM latest_weight w
             LEFT JOIN pigs p ON w.animal_id = p.id
             LEFT JOIN litters l ON w.litter_id = l.id
-            WHERE w.weight IS NOT NULL 
-            AND w.expected_weight IS NOT NULL
             ORDER BY w.weighing_date DESC
-            LIMIT 100
         """)
         
-        weight_records = cursor.fetchall()
+        # Records weighed without an expected weight are filled in from the growth curve
+        weight_records = [record for record in fill_expected_weights(cursor, cursor.fetchall())
+                          if record['expected_weight']][:100]
         
-        # Convert datetime objects to strings for JSON serialization
         for record in weight_records:
+            actual_weight = float(record['actual_weight'])
+            expected_weight = float(record['expected_weight'])
+            record['weight_deficit_percentage'] = round((expected_weight - actual_weight) / expected_weight * 100, 2)
+            if actual_weight >= expected_weight:
+                record['performance_status'] = 'meeting_target'
+            elif actual_weight >= expected_weight * 0.9:
+                record['performance_status'] = 'close_to_target'
+            else:
+                record['performance_status'] = 'below_target'
+            
+            # Convert datetime objects to strings for JSON serialization
             if record.get('weighing_date'):
                 record['weighing_date'] = str(record['weighing_date'])
         
@@ -11612,23 +13716,25 @@ def get_underweight_animals():
         cursor.execute("""
             SELECT p.id, p.tag_id, p.name, p.breed, p.gender, p.birth_date,
                    f.farm_name, DATEDIFF(CURDATE(), p.birth_date) as age_days,
-                   w.weight as actual_weight, w.expected_weight, w.weighing_date,
-                   ROUND(((w.expected_weight - w.weight) / w.expected_weight * 100), 2) as weight_deficit_percentage
+                   w.animal_id, w.litter_id,
+                   w.weight as actual_weight, w.expected_weight, w.weighing_date
             FROM pigs p
             LEFT JOIN farms f ON p.farm_id = f.id
-            LEFT JOIN (
-                SELECT animal_id, weight, expected_weight, weighing_date,
-                       ROW_NUMBER() OVER (PARTITION BY animal_id ORDER BY weighing_date DESC) as rn
-                FROM weight_records
-                WHERE weight_type = 'actual'
-            ) w ON p.id = w.animal_id AND w.rn = 1
-            WHERE w.weight IS NOT NULL 
-            AND w.expected_weight IS NOT NULL 
-            AND w.weight < w.expected_weight
-            ORDER BY weight_deficit_percentage DESC
+            JOIN latest_weight w ON p.id = w.animal_id
+            WHERE w.weight IS NOT NULL
         """)
         
-        underweight_animals = cursor.fetchall()
+        # Animals weighed without an expected weight are filled in from the growth curve
+        underweight_animals = []
+        for animal in fill_expected_weights(cursor, cursor.fetchall()):
+            if not animal['expected_weight']:
+                continue
+            actual_weight = float(animal['actual_weight'])
+            expected_weight = float(animal['expected_weight'])
+            if actual_weight < expected_weight:
+                animal['weight_deficit_percentage'] = round((expected_weight - actual_weight) / expected_weight * 100, 2)
+                underweight_animals.append(animal)
+        underweight_animals.sort(key=lambda animal: animal['weight_deficit_percentage'], reverse=True)
         
         # Convert datetime objects to strings for JSON serialization
         for animal in underweight_animals:
@@ -11667,34 +13773,19 @@ def get_farm_overview():
         cursor.execute("SELECT COUNT(*) as total_litters FROM litters")
         total_litters = cursor.fetchone()['total_litters']
         
-        # Get average weight from latest weight records
-        cursor.execute("""
-            SELECT AVG(w.weight) as avg_weight
-            FROM (
-                SELECT animal_id, weight,
-                       ROW_NUMBER() OVER (PARTITION BY animal_id ORDER BY weighing_date DESC) as rn
-                FROM weight_records
-                WHERE weight_type = 'actual'
-            ) w
-            WHERE w.rn = 1
-        """)
-        avg_weight_result = cursor.fetchone()
-        avg_weight = avg_weight_result['avg_weight'] if avg_weight_result['avg_weight'] else 0
-        
-        # Get performance status based on weight gain trends
+        # Average weight from each animal's latest weight; performance counts
+        # each animal's latest record that has an expected weight, which can be
+        # older than its latest weighing
         cursor.execute("""
             SELECT 
-                COUNT(CASE WHEN w.weight >= w.expected_weight THEN 1 END) as meeting_target,
-                COUNT(*) as total_with_expected
-            FROM (
-                SELECT animal_id, weight, expected_weight,
-                       ROW_NUMBER() OVER (PARTITION BY animal_id ORDER BY weighing_date DESC) as rn
-                FROM weight_records
-                WHERE weight_type = 'actual' AND expected_weight IS NOT NULL
-            ) w
-            WHERE w.rn = 1
+                AVG(weight) as avg_weight,
+                COUNT(CASE WHEN expected_record_weight >= expected_record_expected_weight THEN 1 END) as meeting_target,
+                COUNT(expected_record_id) as total_with_expected
+            FROM latest_weight
+            WHERE animal_id IS NOT NULL
         """)
         performance_result = cursor.fetchone()
+        avg_weight = performance_result['avg_weight'] if performance_result['avg_weight'] else 0
         
         performance_ratio = 0
         if performance_result['total_with_expected'] > 0:
@@ -11724,6 +13815,290 @@ def get_farm_overview():
         print(f"Error getting farm overview: {str(e)}")
         return jsonify({'success': False, 'message': f'Failed to get farm overview: {str(e)}'})
 
+# Herd growth analytics (numpy)
+HERD_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Cohort label of a subject (pig or litter) per dimension. Litters take farm
+# and breed from their sow; pigs have no litter, so that dimension only
+# covers litter weighings.
+HERD_COHORT_DIMENSIONS = {
+    'farm': lambda row: row['farm_name'],
+    'breed': lambda row: row['breed'] or None,
+    'litter': lambda row: row['litter_code'],
+    'birth_month': lambda row: row['born'].strftime('%Y-%m') if row['born'] else None,
+}
+
+class HerdGrowthFrame:
+    """Actual weighings as columnar numpy arrays for herd growth analytics.
+    
+    Each weighing belongs to a subject (a pig or a litter). Residuals against
+    the growth curve are computed per weighing, and average daily gain (first
+    to last weighing) per subject, in one vectorized pass when the frame is
+    built. Cohort summaries are computed on first use and kept on the frame,
+    so they are dropped together with it when weights change.
+    """
+    
+    def __init__(self, rows, curve):
+        subjects = {}
+        subject_index = []
+        for row in rows:
+            key = ('animal', row['animal_id']) if row['animal_id'] is not None else ('litter', row['litter_id'])
+            if key not in subjects:
+                subjects[key] = (len(subjects), row)
+            subject_index.append(subjects[key][0])
+        subject_rows = [row for _, row in subjects.values()]
+        self.subject_keys = list(subjects)
+        self.subject_names = [row['tag_id'] or row['litter_code'] for row in subject_rows]
+        self.cohort_labels = {
+            dimension: np.array([label(row) for row in subject_rows], dtype=object)
+            for dimension, label in HERD_COHORT_DIMENSIONS.items()
+        }
+        self.subject_index = np.array(subject_index, dtype=np.int64)
+        self.weights = np.array([float(row['weight']) for row in rows], dtype=np.float64)
+        self.days = np.array([row['weighing_date'].toordinal() for row in rows], dtype=np.int64)
+        born = np.array([row['born'].toordinal() if row['born'] else np.nan for row in rows], dtype=np.float64)
+        self.built_at = datetime.now()
+        self._summaries = {}
+        
+        # Same rule as calculate_expected_weights: no expectation without a positive age
+        ages = self.days - born
+        ages[~(ages > 0)] = np.nan
+        self.expected = curve.expected_weights(ages)
+        self.residuals = self.weights - self.expected
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.residual_pct = np.where(self.expected > 0, self.residuals / self.expected * 100, np.nan)
+        
+        subject_count = len(self.subject_keys)
+        self.adg = np.full(subject_count, np.nan)
+        self.latest_weight = np.full(subject_count, np.nan)
+        self.weighings = np.bincount(self.subject_index, minlength=subject_count)
+        if not subject_count:
+            self.mean_residual_pct = np.full(0, np.nan)
+            return
+        
+        # Sort by subject then date; each subject is then one contiguous run
+        order = np.lexsort((self.days, self.subject_index))
+        firsts = np.concatenate(([0], np.cumsum(self.weighings)[:-1]))
+        lasts = firsts + self.weighings - 1
+        first_rows, last_rows = order[firsts], order[lasts]
+        spans = self.days[last_rows] - self.days[first_rows]
+        gains = self.weights[last_rows] - self.weights[first_rows]
+        np.divide(gains, spans, out=self.adg, where=spans > 0)
+        self.latest_weight = self.weights[last_rows]
+        
+        known = ~np.isnan(self.residual_pct)
+        residual_totals = np.bincount(self.subject_index[known], weights=self.residual_pct[known], minlength=subject_count)
+        residual_counts = np.bincount(self.subject_index[known], minlength=subject_count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.mean_residual_pct = np.where(residual_counts > 0, residual_totals / residual_counts, np.nan)
+    
+    def cohort_groups(self, dimension):
+        """Cohort labels and, per cohort, its subject indexes and weighing indexes"""
+        labels = self.cohort_labels[dimension]
+        labelled = np.array([label is not None for label in labels], dtype=bool)
+        if not labelled.any():
+            return [], [], []
+        cohorts, inverse = np.unique(labels[labelled], return_inverse=True)
+        subject_cohort = np.full(len(labels), -1)
+        subject_cohort[labelled] = inverse
+        record_cohort = subject_cohort[self.subject_index]
+        
+        def split(cohort_of):
+            order = np.argsort(cohort_of, kind='stable')
+            counts = np.bincount(cohort_of[cohort_of >= 0], minlength=len(cohorts))
+            skipped = len(cohort_of) - counts.sum()
+            return np.split(order[skipped:], np.cumsum(counts)[:-1])
+        
+        return cohorts.tolist(), split(subject_cohort), split(record_cohort)
+    
+    def cohort_summary(self, dimension=None):
+        """Gain and residual percentiles per cohort of a dimension (None: whole herd)"""
+        summary = self._summaries.get(dimension)
+        if summary is None:
+            if dimension is None:
+                summary = [self._summarize(None, np.arange(len(self.subject_keys)), np.arange(len(self.weights)))]
+            else:
+                summary = [self._summarize(cohort, subjects, records)
+                           for cohort, subjects, records in zip(*self.cohort_groups(dimension))]
+            self._summaries[dimension] = summary
+        return summary
+    
+    def adg_percentile_ranks(self, dimension):
+        """Percentile rank (0-100) of each subject's daily gain within its cohort"""
+        key = ('ranks', dimension)
+        ranks = self._summaries.get(key)
+        if ranks is None:
+            ranks = np.full(len(self.subject_keys), np.nan)
+            for _, subjects, _ in zip(*self.cohort_groups(dimension)):
+                subjects = subjects[~np.isnan(self.adg[subjects])]
+                if len(subjects) == 1:
+                    ranks[subjects] = 100.0
+                elif len(subjects) > 1:
+                    ordinal = np.argsort(np.argsort(self.adg[subjects], kind='stable'), kind='stable')
+                    ranks[subjects] = ordinal / (len(subjects) - 1) * 100
+            self._summaries[key] = ranks
+        return ranks
+    
+    def _summarize(self, cohort, subjects, records):
+        return {
+            'cohort': cohort,
+            'subjects': int(len(subjects)),
+            'weighings': int(len(records)),
+            'avg_daily_gain': herd_distribution(self.adg[subjects]),
+            'residual_percentage': herd_distribution(self.residual_pct[records]),
+        }
+
+def herd_distribution(values):
+    """Count, mean and HERD_PERCENTILES of the non-NaN values, or None if empty"""
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return None
+    percentiles = np.percentile(values, HERD_PERCENTILES)
+    distribution = {'count': int(values.size), 'mean': round(float(values.mean()), 3)}
+    distribution.update({f'p{p}': round(float(value), 3) for p, value in zip(HERD_PERCENTILES, percentiles)})
+    return distribution
+
+def herd_value(value):
+    """numpy scalar as a rounded float for JSON, None for NaN"""
+    return None if np.isnan(value) else round(float(value), 3)
+
+herd_growth_cache = VersionedCache('herd_growth', ('weight_records', 'pigs', 'litters', 'weight_categories'))
+
+def build_herd_growth_frame(cursor):
+    """Load every actual weighing with its subject's cohort labels"""
+    cursor.execute("""
+        SELECT w.animal_id, w.litter_id, w.weight, w.weighing_date,
+               COALESCE(p.birth_date, l.farrowing_date) AS born,
+               f.farm_name, COALESCE(p.breed, s.breed) AS breed,
+               p.tag_id, l.litter_id AS litter_code
+        FROM weight_records w
+        LEFT JOIN pigs p ON w.animal_id = p.id
+        LEFT JOIN litters l ON w.litter_id = l.id
+        LEFT JOIN pigs s ON l.sow_id = s.id
+        LEFT JOIN farms f ON f.id = COALESCE(p.farm_id, s.farm_id)
+        WHERE w.weight_type = 'actual'
+    """)
+    return HerdGrowthFrame(cursor.fetchall(), get_growth_curve(cursor))
+
+def get_herd_growth_frame(cursor):
+    """Shared HerdGrowthFrame, rebuilt when weights, animals or categories change"""
+    return herd_growth_cache.get(cursor, build_herd_growth_frame)
+
+def herd_analytics_unavailable():
+    """Error response for herd analytics when numpy is missing, else None"""
+    if np is None:
+        return jsonify({'success': False, 'message': 'Herd analytics require numpy, which is not installed'}), 503
+    return None
+
+@app.route('/api/analytics/growth/summary', methods=['GET'])
+def get_herd_growth_summary():
+    """Herd-wide daily gain and growth-curve residual distribution"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    unavailable = herd_analytics_unavailable()
+    if unavailable:
+        return unavailable
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        frame = get_herd_growth_frame(cursor)
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'summary': frame.cohort_summary()[0],
+            'dimensions': list(HERD_COHORT_DIMENSIONS),
+            'percentiles': list(HERD_PERCENTILES),
+            'built_at': frame.built_at.strftime('%Y-%m-%d %H:%M:%S')
+        })
+        
+    except Exception as e:
+        print(f"Error getting herd growth summary: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get herd growth summary: {str(e)}'})
+
+@app.route('/api/analytics/growth/cohorts/<dimension>', methods=['GET'])
+def get_herd_growth_cohorts(dimension):
+    """Daily gain and residual percentiles per farm, breed, litter or birth month"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    if dimension not in HERD_COHORT_DIMENSIONS:
+        return jsonify({'success': False, 'message': f'Unknown cohort dimension: {dimension}'}), 404
+    unavailable = herd_analytics_unavailable()
+    if unavailable:
+        return unavailable
+    
+    try:
+        min_subjects = request.args.get('min_subjects', 1, type=int)
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        frame = get_herd_growth_frame(cursor)
+        cursor.close()
+        conn.close()
+        
+        cohorts = [cohort for cohort in frame.cohort_summary(dimension) if cohort['subjects'] >= min_subjects]
+        return jsonify({'success': True, 'dimension': dimension, 'cohorts': cohorts})
+        
+    except Exception as e:
+        print(f"Error getting herd growth cohorts: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get herd growth cohorts: {str(e)}'})
+
+@app.route('/api/analytics/growth/subjects', methods=['GET'])
+def get_herd_growth_subjects():
+    """Pigs and litters ranked by daily gain within their cohort"""
+    if 'employee_id' not in session or session.get('employee_role') != 'administrator':
+        return jsonify({'error': 'Unauthorized'}), 401
+    dimension = request.args.get('cohort', 'farm')
+    if dimension not in HERD_COHORT_DIMENSIONS:
+        return jsonify({'success': False, 'message': f'Unknown cohort dimension: {dimension}'}), 404
+    unavailable = herd_analytics_unavailable()
+    if unavailable:
+        return unavailable
+    
+    try:
+        value = request.args.get('value')
+        order = request.args.get('order', 'asc')
+        limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        frame = get_herd_growth_frame(cursor)
+        cursor.close()
+        conn.close()
+        
+        ranks = frame.adg_percentile_ranks(dimension)
+        labels = frame.cohort_labels[dimension]
+        selected = np.flatnonzero(~np.isnan(ranks))
+        if value is not None:
+            selected = selected[np.array([str(labels[i]) == value for i in selected], dtype=bool)]
+        # Slowest growers first by default, they are the ones to look at
+        selected = selected[np.argsort(ranks[selected], kind='stable')]
+        if order == 'desc':
+            selected = selected[::-1]
+        
+        subjects = []
+        for i in selected[:limit]:
+            record_type, record_id = frame.subject_keys[i]
+            subjects.append({
+                'record_type': record_type,
+                'id': record_id,
+                'name': frame.subject_names[i],
+                'cohort': labels[i],
+                'weighings': int(frame.weighings[i]),
+                'latest_weight': herd_value(frame.latest_weight[i]),
+                'avg_daily_gain': herd_value(frame.adg[i]),
+                'mean_residual_percentage': herd_value(frame.mean_residual_pct[i]),
+                'adg_percentile': herd_value(ranks[i]),
+            })
+        
+        return jsonify({'success': True, 'dimension': dimension, 'total': int(len(selected)), 'subjects': subjects})
+        
+    except Exception as e:
+        print(f"Error getting herd growth subjects: {str(e)}")
+        return jsonify({'success': False, 'message': f'Failed to get herd growth subjects: {str(e)}'})
+
 @app.route('/api/weight/settings', methods=['POST'])
 def save_weight_settings():
     """Save weight settings"""
@@ -11766,6 +14141,7 @@ def save_weight_settings():
 
 
 @app.route('/api/weight/categories', methods=['POST'])
+@invalidates('weight_categories')
 def save_weight_category():
     """Save a new weight category"""
     try:
@@ -11797,6 +14173,7 @@ def save_weight_category():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/weight/categories/<int:category_id>', methods=['PUT'])
+@invalidates('weight_categories')
 def update_weight_category(category_id):
     """Update a weight category"""
     try:
@@ -11831,6 +14208,7 @@ def update_weight_category(category_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/weight/categories/<int:category_id>', methods=['DELETE'])
+@invalidates('weight_categories')
 def delete_weight_category(category_id):
     """Delete a weight category"""
     try:
@@ -11951,6 +14329,7 @@ def get_slaughter_records():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/slaughter/record', methods=['POST'])
+@invalidates('pigs', 'litters')
 def create_slaughter_record():
     """Create a new slaughter record"""
     if 'employee_id' not in session or session.get('employee_role') != 'administrator':
@@ -12075,11 +14454,13 @@ def create_slaughter_record():
         # Log activity
         if data['pig_type'] == 'grown_pig':
             log_activity(session['employee_id'], 'SLAUGHTER_RECORD', 
-                       f'Slaughter record created: Pig {data.get("pig_id")} - Status changed to slaughtered - ${total_revenue} revenue')
+                       f'Slaughter record created: Pig {data.get("pig_id")} - Status changed to slaughtered - ${total_revenue} revenue',
+                       entity_type='pig', entity_id=data.get('pig_id'))
         else:
             pigs_count = int(data.get('pigs_count', 1))
             log_activity(session['employee_id'], 'SLAUGHTER_RECORD', 
-                       f'Slaughter record created: Litter {data.get("litter_id")} - {pigs_count} pigs slaughtered - ${total_revenue} revenue')
+                       f'Slaughter record created: Litter {data.get("litter_id")} - {pigs_count} pigs slaughtered - ${total_revenue} revenue',
+                       entity_type='litter', entity_id=data.get('litter_id'))
         
         conn.commit()
         
@@ -12179,7 +14560,8 @@ def edit_slaughter_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'SLAUGHTER_RECORD_EDIT', 
-                   f'Slaughter record {record_id} updated: {data["live_weight"]}kg live weight')
+                   f'Slaughter record {record_id} updated: {data["live_weight"]}kg live weight',
+                   entity_type='slaughter_record', entity_id=record_id)
         
         conn.commit()
         cursor.close()
@@ -12251,7 +14633,8 @@ def delete_slaughter_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'SLAUGHTER_RECORD_DELETE', 
-                   f'Slaughter record {record_id} deleted: {record[0]}kg to {record[1]} on {record[2]}')
+                   f'Slaughter record {record_id} deleted: {record[0]}kg to {record[1]} on {record[2]}',
+                   entity_type='slaughter_record', entity_id=record_id)
         
         conn.commit()
         print(f"Slaughter record {record_id} deleted successfully")
@@ -12359,6 +14742,7 @@ def get_slaughter_statistics():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/death/record', methods=['POST'])
+@invalidates('pigs', 'litters')
 def create_death_record():
     """Create a death record"""
     if 'employee_id' not in session:
@@ -12481,11 +14865,13 @@ def create_death_record():
         # Log activity
         if data['pig_type'] == 'grown_pig':
             log_activity(session['employee_id'], 'DEATH_RECORD', 
-                       f'Death record created: Pig {data.get("pig_id")} - Status changed to dead - Cause: {data["cause_of_death"]}')
+                       f'Death record created: Pig {data.get("pig_id")} - Status changed to dead - Cause: {data["cause_of_death"]}',
+                       entity_type='pig', entity_id=data.get('pig_id'))
         else:
             pigs_count = int(data.get('pigs_count', 1))
             log_activity(session['employee_id'], 'DEATH_RECORD', 
-                       f'Death record created: Litter {data.get("litter_id")} - {pigs_count} pigs marked as dead - Cause: {data["cause_of_death"]}')
+                       f'Death record created: Litter {data.get("litter_id")} - {pigs_count} pigs marked as dead - Cause: {data["cause_of_death"]}',
+                       entity_type='litter', entity_id=data.get('litter_id'))
         
         conn.commit()
         
@@ -12576,7 +14962,8 @@ def edit_death_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'DEATH_RECORD_EDIT', 
-                   f'Death record {record_id} updated: {data["weight_at_death"]}kg weight')
+                   f'Death record {record_id} updated: {data["weight_at_death"]}kg weight',
+                   entity_type='death_record', entity_id=record_id)
         
         conn.commit()
         cursor.close()
@@ -12681,7 +15068,8 @@ def delete_death_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'DEATH_RECORD_DELETE', 
-                   f'Death record {record_id} deleted: {record[0]}kg - {record[1]} on {record[2]}')
+                   f'Death record {record_id} deleted: {record[0]}kg - {record[1]} on {record[2]}',
+                   entity_type='death_record', entity_id=record_id)
         
         conn.commit()
         print(f"Death record {record_id} deleted successfully")
@@ -12914,6 +15302,7 @@ def get_litter_death_details(litter_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/sale/record', methods=['POST'])
+@invalidates('pigs', 'litters')
 def create_sale_record():
     """Create a sale record"""
     if 'employee_id' not in session:
@@ -13013,11 +15402,13 @@ def create_sale_record():
         # Log activity
         if data['pig_type'] == 'grown_pig':
             log_activity(session['employee_id'], 'SALE_RECORD', 
-                       f'Sale record created: Pig {data.get("pig_id")} - Status changed to sold - Revenue: ${data["total_revenue"]}')
+                       f'Sale record created: Pig {data.get("pig_id")} - Status changed to sold - Revenue: ${data["total_revenue"]}',
+                       entity_type='pig', entity_id=data.get('pig_id'))
         else:
             pigs_count = int(data.get('pigs_count', 1))
             log_activity(session['employee_id'], 'SALE_RECORD', 
-                       f'Sale record created: Litter {data.get("litter_id")} - {pigs_count} pigs sold - Revenue: ${data["total_revenue"]}')
+                       f'Sale record created: Litter {data.get("litter_id")} - {pigs_count} pigs sold - Revenue: ${data["total_revenue"]}',
+                       entity_type='litter', entity_id=data.get('litter_id'))
         
         conn.commit()
         
@@ -13110,7 +15501,8 @@ def edit_sale_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'SALE_RECORD_EDIT', 
-                   f'Sale record {record_id} updated: ${data["total_revenue"]} revenue')
+                   f'Sale record {record_id} updated: ${data["total_revenue"]} revenue',
+                   entity_type='sale_record', entity_id=record_id)
         
         conn.commit()
         cursor.close()
@@ -13156,7 +15548,8 @@ def delete_sale_record(record_id):
         
         # Log activity
         log_activity(session['employee_id'], 'SALE_RECORD_DELETE', 
-                   f'Sale record {record_id} deleted: ${record[0]} to {record[1]} on {record[2]}')
+                   f'Sale record {record_id} deleted: ${record[0]} to {record[1]} on {record[2]}',
+                   entity_type='sale_record', entity_id=record_id)
         
         conn.commit()
         return jsonify({
@@ -13436,7 +15829,8 @@ def add_vaccination_schedule():
         # Log activity
         log_activity(session['employee_id'], 'CREATE', 
                     f'Added vaccination schedule for day {data["day_number"]}', 
-                    'vaccination_schedule', cursor.lastrowid)
+                    'vaccination_schedule', cursor.lastrowid,
+                    entity_type='vaccination_schedule', entity_id=cursor.lastrowid)
         
         cursor.close()
         conn.close()
@@ -13505,7 +15899,8 @@ def update_vaccination_schedule(schedule_id):
         # Log activity
         log_activity(session['employee_id'], 'UPDATE', 
                     f'Updated vaccination schedule for day {data.get("day_number")}', 
-                    'vaccination_schedule', schedule_id)
+                    'vaccination_schedule', schedule_id,
+                    entity_type='vaccination_schedule', entity_id=schedule_id)
         
         cursor.close()
         conn.close()
@@ -13541,7 +15936,8 @@ def delete_vaccination_schedule(schedule_id):
         # Log activity
         log_activity(session['employee_id'], 'DELETE', 
                     f'Deleted vaccination schedule for day {entry["day_number"]}', 
-                    'vaccination_schedule', schedule_id)
+                    'vaccination_schedule', schedule_id,
+                    entity_type='vaccination_schedule', entity_id=schedule_id)
         
         cursor.close()
         conn.close()
@@ -13607,7 +16003,9 @@ def mark_vaccination_completed():
             'Marked vaccination as completed',
             f'Marked vaccination as completed for {data["animal_type"]} ID {data["animal_id"]}',
             'vaccination_records', 
-            cursor.lastrowid
+            cursor.lastrowid,
+            entity_type='litter' if data['animal_type'] == 'litter' else 'pig',
+            entity_id=data['animal_id']
         )
         
         cursor.close()
@@ -13661,7 +16059,7 @@ def get_vaccination_records(animal_id, animal_type):
 def api_logout():
     if 'employee_id' in session:
         # Log logout activity
-        log_activity(session['employee_id'], 'LOGOUT', f'Employee {session["employee_name"]} logged out')
+        log_activity(session['employee_id'], 'LOGOUT', f'Employee {session["employee_name"]} logged out', entity_type='employee', entity_id=session['employee_id'])
         session.clear()
     return {'success': True, 'redirect': url_for('landing')}
 
@@ -13841,7 +16239,7 @@ def admin_farm_chicken_weight_check():
                 breed_name,
                 gender,
                 hatch_date,
-                age_days,
+                DATEDIFF(CURDATE(), hatch_date) AS age_days,
                 source,
                 coop_number,
                 quantity,
@@ -13849,41 +16247,12 @@ def admin_farm_chicken_weight_check():
                 registration_date
             FROM chickens 
             WHERE current_status = 'active'
-            ORDER BY chicken_type, age_days
+            ORDER BY chicken_type, hatch_date DESC
         """)
         chickens = cursor.fetchall()
         
-        # Get all weight standards
-        cursor.execute("""
-            SELECT 
-                id,
-                category,
-                age_days,
-                expected_weight,
-                description,
-                created_at
-            FROM chicken_weight_standards 
-            ORDER BY category, age_days
-        """)
-        weight_standards = cursor.fetchall()
-        
-        # Create weight tracking table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chicken_weight_tracking (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                chicken_id VARCHAR(50) NOT NULL,
-                weight_standard_id INT NOT NULL,
-                actual_weight DECIMAL(6,3) NOT NULL,
-                expected_weight DECIMAL(6,3) NOT NULL,
-                weight_percentage DECIMAL(5,2) NOT NULL,
-                weight_category ENUM('healthy', 'underweight', 'overweight') NOT NULL,
-                checked_by INT NOT NULL,
-                checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_chicken_id (chicken_id),
-                INDEX idx_weight_standard_id (weight_standard_id),
-                INDEX idx_checked_at (checked_at)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
+        # Shared weight standard index (rebuilt only when standards change)
+        stage_index = get_chicken_stage_index(cursor)
         
         # Get existing weight tracking records
         cursor.execute("""
@@ -13910,19 +16279,18 @@ def admin_farm_chicken_weight_check():
         chickens_with_standards = []
         for chicken in chickens:
             chicken_standards = []
-            for standard in weight_standards:
-                if standard['category'] == chicken['chicken_type'] and chicken['age_days'] >= standard['age_days']:
-                    # Check if this weight check has already been completed
-                    key = f"{chicken['chicken_id']}_{standard['id']}"
-                    tracking_record = tracking_map.get(key)
-                    
-                    # Only include incomplete weight checks
-                    if tracking_record is None:
-                        chicken_standards.append({
-                            'standard': standard,
-                            'completed': False,
-                            'tracking_record': None
-                        })
+            for standard in stage_index.standards_due(chicken['chicken_type'], chicken['age_days']):
+                # Check if this weight check has already been completed
+                key = f"{chicken['chicken_id']}_{standard['id']}"
+                tracking_record = tracking_map.get(key)
+                
+                # Only include incomplete weight checks
+                if tracking_record is None:
+                    chicken_standards.append({
+                        'standard': standard,
+                        'completed': False,
+                        'tracking_record': None
+                    })
             
             if chicken_standards:  # Only include chickens that have incomplete weight standards
                 chickens_with_standards.append({
@@ -14005,18 +16373,281 @@ def submit_chicken_weight():
             'message': f'Error recording weight: {str(e)}'
         })
 
+# Response compression settings
+COMPRESSION_CONFIG = {
+    'enabled': os.environ.get('COMPRESSION_ENABLED', '1') == '1',
+    'min_size': int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)),  # Smaller bodies are not worth the CPU
+    'gzip_level': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+    'brotli_quality': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5)),  # 4-6 keep CPU close to gzip -6
+    'content_types': ('text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+                      'application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+}
+
+class CompressionMiddleware:
+    """WSGI middleware that brotli- or gzip-encodes text responses.
+    
+    Only allow-listed content types are touched, so images and other
+    already-compressed files pass through. Bodies with a Content-Length
+    below min_size are left alone. Streamed bodies (no Content-Length) are
+    compressed chunk by chunk and flushed after each one, so the client
+    still sees data as it is produced.
+    """
+    
+    def __init__(self, wsgi_app, config):
+        self.wsgi_app = wsgi_app
+        self.config = config
+        self.stats = {'compressed': 0, 'skipped': 0, 'bytes_in': 0, 'bytes_out': 0}
+    
+    def choose_encoding(self, accept_encoding):
+        """'br', 'gzip' or None for an Accept-Encoding header"""
+        accepted = {}
+        for part in accept_encoding.lower().split(','):
+            coding, _, params = part.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[coding.strip()] = quality
+        if brotli is not None and accepted.get('br', 0) > 0:
+            return 'br'
+        if accepted.get('gzip', 0) > 0:
+            return 'gzip'
+        return None
+    
+    def negotiated(self, environ, status, headers):
+        """Whether the representation depends on Accept-Encoding.
+        
+        True for allow-listed bodies even when this response is not encoded
+        (HEAD, 304, a client without gzip), so caches keep the variants apart.
+        A 304 carries no Content-Type, so it is guessed from the path.
+        """
+        header_map = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in header_map or 'no-transform' in header_map.get('cache-control', ''):
+            return False
+        content_type = header_map.get('content-type', '')
+        if not content_type and status.startswith('304'):
+            content_type = mimetypes.guess_type(environ.get('PATH_INFO', ''))[0] or ''
+        if content_type.split(';', 1)[0].strip().lower() not in self.config['content_types']:
+            return False
+        length = header_map.get('content-length')
+        return length is None or int(length) >= self.config['min_size']
+    
+    def compressible(self, environ, status, headers):
+        """Whether a response with this status line and headers may be encoded"""
+        if environ.get('REQUEST_METHOD') == 'HEAD' or int(status.split(' ', 1)[0]) in (204, 206, 304):
+            return False
+        return self.negotiated(environ, status, headers)
+    
+    def compressor(self, encoding):
+        """(compress(chunk), flush(), finish()) callables for an encoding"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.config['brotli_quality'])
+            return compressor.process, compressor.flush, compressor.finish
+        compressor = zlib.compressobj(self.config['gzip_level'], zlib.DEFLATED, 31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    
+    def __call__(self, environ, start_response):
+        if not self.config['enabled']:
+            return self.wsgi_app(environ, start_response)
+        encoding = self.choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        response = {}
+        
+        def capture_start_response(status, headers, exc_info=None):
+            response.update(status=status, headers=headers, exc_info=exc_info)
+            return lambda data: response.setdefault('written', []).append(data)
+        
+        body = self.wsgi_app(environ, capture_start_response)
+        chunks = iter(body)
+        first = []
+        if 'status' not in response:
+            # Generators may only call start_response on their first chunk
+            first = [chunk for chunk in [next(chunks, None)] if chunk is not None]
+        first = response.pop('written', []) + first
+        status, headers = response['status'], list(response['headers'])
+        
+        if self.negotiated(environ, status, headers):
+            vary = [value for name, value in headers if name.lower() == 'vary']
+            if not any('accept-encoding' in value.lower() for value in vary):
+                headers.append(('Vary', 'Accept-Encoding'))
+        if encoding is None or not self.compressible(environ, status, headers):
+            self.stats['skipped'] += 1
+            start_response(status, headers, response['exc_info'])
+            return self._chain(first, chunks, body)
+        
+        streamed = not any(name.lower() == 'content-length' for name, _ in headers)
+        headers = [(name, value) for name, value in headers if name.lower() != 'content-length']
+        # The encoded bytes differ, so a strong validator must become weak
+        headers = [(name, 'W/' + value if name.lower() == 'etag' and not value.startswith('W/') else value)
+                   for name, value in headers]
+        headers.append(('Content-Encoding', encoding))
+        self.stats['compressed'] += 1
+        start_response(status, headers, response['exc_info'])
+        return self._compress(encoding, streamed, first, chunks, body)
+    
+    def _chain(self, first, chunks, body):
+        try:
+            yield from first
+            yield from chunks
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+    
+    def _compress(self, encoding, streamed, first, chunks, body):
+        compress, flush, finish = self.compressor(encoding)
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in self._chain(first, chunks, body):
+                if not chunk:
+                    continue
+                bytes_in += len(chunk)
+                data = compress(chunk)
+                if streamed:
+                    data += flush()
+                if data:
+                    bytes_out += len(data)
+                    yield data
+            data = finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            self.stats['bytes_in'] += bytes_in
+            self.stats['bytes_out'] += bytes_out
+    
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 3) if stats['bytes_in'] else None
+        stats['brotli_available'] = brotli is not None
+        return stats
+
+compression_middleware = CompressionMiddleware(app.wsgi_app, COMPRESSION_CONFIG)
+app.wsgi_app = compression_middleware
+
+# Heaviest rendered pages and list APIs, for benchmark-compression
+COMPRESSION_BENCHMARK_PATHS = (
+    '/admin/farm/pig-management',
+    '/admin/farm/breeding-management',
+    '/admin/farm/chicken-settings',
+    '/admin/farm/slaughter',
+    '/api/pig/list',
+    '/api/slaughter/records'
+)
+
+@app.cli.command('benchmark-compression')
+@click.option('--path', 'paths', multiple=True, help='Path to fetch (repeatable); defaults to the heaviest pages.')
+@click.option('--template', 'templates', multiple=True, help='Also measure a template source file, e.g. admin_farm_pig_management.html.')
+@click.option('--employee-id', default=1, help='Administrator the requests are made as.')
+@click.option('--repeat', default=20, help='Compressions timed per body.')
+def benchmark_compression_command(paths, templates, employee_id, repeat):
+    """Report bytes on the wire and CPU per response for gzip and brotli."""
+    bodies = []
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess.update({'employee_id': employee_id, 'employee_role': 'administrator',
+                     'employee_name': 'Benchmark', 'employee_status': 'active'})
+    for path in paths or COMPRESSION_BENCHMARK_PATHS:
+        # No Accept-Encoding, so the middleware hands back the identity body
+        response = client.get(path)
+        if response.status_code != 200:
+            print(f"{path}: HTTP {response.status_code}, skipped")
+            continue
+        bodies.append((path, response.get_data()))
+    for name in templates:
+        with open(os.path.join(app.root_path, 'templates', name), 'rb') as f:
+            bodies.append((f"template {name}", f.read()))
+    
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    print(f"{'response':<45} {'identity':>10} " + ' '.join(f"{e:>10} {e + ' ms':>8}" for e in encodings))
+    for label, data in bodies:
+        row = f"{label:<45} {len(data):>10} "
+        for encoding in encodings:
+            compress, _, finish = compression_middleware.compressor(encoding)
+            size = len(compress(data) + finish())
+            started = time.process_time()
+            for _ in range(repeat):
+                compress, _, finish = compression_middleware.compressor(encoding)
+                compress(data) + finish()
+            cpu_ms = (time.process_time() - started) * 1000 / repeat
+            row += f"{size:>10} {cpu_ms:>8.2f} "
+        print(row)
+    if brotli is None:
+        print("brotli is not installed; only gzip was measured")
+
+def warm_templates():
+    """Load every template so the first request of a new worker does not compile one.
+    
+    With the bytecode cache this is mostly unmarshalling code another
+    process already compiled; without it every template is compiled here.
+    """
+    started = time.perf_counter()
+    names = [name for name in app.jinja_env.list_templates() if name.endswith('.html')]
+    for name in names:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            print(f"Error warming template {name}: {str(e)}")
+    print(f"Templates warmed: {len(names)} in {int((time.perf_counter() - started) * 1000)} ms")
+
+if TEMPLATE_CONFIG['warmup']:
+    warm_templates()
+
+# Pages rendered in measure-cold-start; the largest templates, none needs MySQL
+COLD_START_PATHS = (
+    '/admin/farm/pig-management',
+    '/admin/farm/breeding-management',
+    '/admin/farm/chicken-settings',
+    '/admin/farm/slaughter'
+)
+
+COLD_START_PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, os.environ['COLD_START_ROOT'])
+import app as farm
+booted = time.perf_counter()
+client = farm.app.test_client()
+with client.session_transaction() as sess:
+    sess.update({'employee_id': 1, 'employee_role': 'administrator', 'employee_name': 'Benchmark', 'employee_status': 'active'})
+timings = {}
+for path in json.loads(os.environ['COLD_START_PATHS']):
+    request_started = time.perf_counter()
+    status = client.get(path).status_code
+    timings[path] = [status, round((time.perf_counter() - request_started) * 1000, 1)]
+print('COLD_START ' + json.dumps({'boot_ms': round((booted - started) * 1000, 1), 'requests': timings}))
+"""
+
+@app.cli.command('measure-cold-start')
+@click.option('--path', 'paths', multiple=True, help='Page to request first (repeatable); defaults to the largest templates.')
+def measure_cold_start_command(paths):
+    """Time boot and first requests of fresh processes, as after a Passenger recycle."""
+    paths = list(paths or COLD_START_PATHS)
+    cache_dir = tempfile.mkdtemp(prefix='jinja-cold-start-')
+    scenarios = [
+        ('no bytecode cache, no warm-up', {'JINJA_BYTECODE_CACHE': '0', 'TEMPLATE_WARMUP': '0'}),
+        ('bytecode cache (empty), warm-up', {'JINJA_BYTECODE_CACHE': '1', 'TEMPLATE_WARMUP': '1'}),
+        ('bytecode cache (filled), no warm-up', {'JINJA_BYTECODE_CACHE': '1', 'TEMPLATE_WARMUP': '0'}),
+        ('bytecode cache (filled), warm-up', {'JINJA_BYTECODE_CACHE': '1', 'TEMPLATE_WARMUP': '1'}),
+    ]
+    for label, settings in scenarios:
+        env = dict(os.environ, SCHEDULER_ENABLED='0', JINJA_BYTECODE_CACHE_DIR=cache_dir,
+                   COLD_START_ROOT=app.root_path, COLD_START_PATHS=json.dumps(paths), **settings)
+        output = subprocess.run([sys.executable, '-c', COLD_START_PROBE], env=env, cwd=app.root_path,
+                                capture_output=True, text=True).stdout
+        line = next((l for l in output.splitlines() if l.startswith('COLD_START ')), None)
+        if line is None:
+            print(f"{label}: probe failed")
+            continue
+        result = json.loads(line[len('COLD_START '):])
+        first_path = paths[0]
+        total = sum(ms for _, ms in result['requests'].values())
+        print(f"{label:<38} boot {result['boot_ms']:>7} ms   first request ({first_path}) "
+              f"{result['requests'][first_path][1]:>6} ms   all {len(paths)} pages {total:>7.1f} ms")
+
 if __name__ == '__main__':
     print("Starting Pig Farm Management System...")
     print("Checking database and tables...")
     
-    # Update pregnancy statuses on startup
-    print("Updating pregnancy statuses...")
-    update_pregnancy_status()
-    
-    # Update lactation statuses on startup
-    print("Updating lactation statuses...")
-    update_lactation_status()
-    
     # Create database and tables on startup
     if create_database_and_tables():
         print("Database setup completed. Starting Flask application...")